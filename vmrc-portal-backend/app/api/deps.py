@@ -1,21 +1,18 @@
 # File: app/api/deps.py
 
-from collections.abc import Generator
+from collections.abc import AsyncIterator
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import SessionLocal
 
 
-def get_db() -> Generator[Session, None, None]:
+async def get_db() -> AsyncIterator[AsyncSession]:
     """
-    FastAPI dependency that provides a SQLAlchemy session.
+    FastAPI dependency that provides an async SQLAlchemy session.
 
     Usage in route functions:
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
     """
-    db = SessionLocal()
-    try:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -1,18 +1,17 @@
 # app/api/v1/routes_aoi.py
 
-from pathlib import Path
+from functools import lru_cache
+from typing import Tuple
 import json
 
-from fastapi import APIRouter, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, HTTPException, Request, status, UploadFile, File
 
-import fiona
-from shapely.geometry import shape, mapping
-from shapely.ops import unary_union
+from shapely.geometry import mapping
 
-router = APIRouter()
+from app.core.static_json import serialize_static_json, static_json_response
+from app.gis.clip import get_global_aoi_geometry
 
-# AOI shapefile path
-AOI_SHP_PATH = Path(r"D:\VMRC_Project\Data_Analysis!!\AOI_diss\AOI_diss.shp")
+router = APIRouter()
 
 # Simple in-memory cache so we don't keep re-reading the shapefile
 _global_aoi_geojson = None
@@ -26,26 +25,8 @@ def load_global_aoi_geojson() -> dict:
     if _global_aoi_geojson is not None:
         return _global_aoi_geojson
 
-    if not AOI_SHP_PATH.exists():
-        raise FileNotFoundError(f"AOI shapefile not found at: {AOI_SHP_PATH}")
-
-    geometries = []
-
-    with fiona.open(AOI_SHP_PATH, "r") as src:
-        for feat in src:
-            geom = shape(feat["geometry"])
-            geometries.append(geom)
-
-    if not geometries:
-        raise ValueError("AOI shapefile is empty – no geometries found.")
-
-    if len(geometries) == 1:
-        union_geom = geometries[0]
-    else:
-        union_geom = unary_union(geometries)
-
-    if union_geom.is_empty:
-        raise ValueError("AOI geometry is empty after union().")
+    # Shared cached loader: bulk read + single union_all (see app.gis.clip)
+    union_geom = get_global_aoi_geometry()
 
     feature = {
         "type": "Feature",
@@ -60,16 +41,25 @@ def load_global_aoi_geojson() -> dict:
     return _global_aoi_geojson
 
 
+@lru_cache
+def _global_aoi_payload() -> Tuple[bytes, str]:
+    """
+    Serialized AOI GeoJSON + ETag (built once; failures are not cached).
+    """
+    return serialize_static_json(load_global_aoi_geojson())
+
+
 # ---------- ENDPOINTS ----------
 
 @router.get("/", summary="Get global AOI as GeoJSON")
-def get_global_aoi():
+def get_global_aoi(request: Request):
     """
     Return the global VMRC AOI as GeoJSON FeatureCollection
     for the frontend map.
     """
     try:
-        return load_global_aoi_geojson()
+        body, etag = _global_aoi_payload()
+        return static_json_response(request, body, etag)
     except FileNotFoundError as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
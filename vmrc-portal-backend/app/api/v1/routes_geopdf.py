@@ -8,6 +8,7 @@ import shutil
 from pathlib import Path
 from typing import Optional, Dict, Any
 from datetime import datetime
+from functools import lru_cache
 import uuid
 import json
 import re
@@ -42,8 +43,12 @@ GEOPDF_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 MAX_UPLOAD_SIZE = 200 * 1024 * 1024
 
 
+@lru_cache(maxsize=None)
 def check_gdal_available() -> bool:
-    """Check if GDAL is available on the system."""
+    """
+    Check if GDAL is available on the system. Runs on first use rather than at
+    import (it spawns gdal_translate); the result is cached.
+    """
     try:
         result = subprocess.run(
             ["gdal_translate", "--version"],
@@ -51,20 +56,17 @@ def check_gdal_available() -> bool:
             text=True,
             timeout=5
         )
-        return result.returncode == 0
+        available = result.returncode == 0
     except (FileNotFoundError, subprocess.TimeoutExpired):
-        return False
-        
-
+        available = False
 
-# Check GDAL on module load
-HAS_GDAL = check_gdal_available()
-if not HAS_GDAL:
-    print("WARNING: GDAL not found. GeoPDF export will not work.")
-    print("WARNING: Install GDAL: https://gdal.org/download.html")
-    print("WARNING: On Windows: Use OSGeo4W or conda install -c conda-forge gdal")
-    print("WARNING: On Linux: sudo apt-get install gdal-bin")
-    print("WARNING: On macOS: brew install gdal")
+    if not available:
+        print("WARNING: GDAL not found. GeoPDF export will not work.")
+        print("WARNING: Install GDAL: https://gdal.org/download.html")
+        print("WARNING: On Windows: Use OSGeo4W or conda install -c conda-forge gdal")
+        print("WARNING: On Linux: sudo apt-get install gdal-bin")
+        print("WARNING: On macOS: brew install gdal")
+    return available
 
 
 class GeoPDFExportRequest(BaseModel):
@@ -103,7 +105,7 @@ def extract_geopdf_bounds(pdf_path: Path) -> Optional[Dict[str, float]]:
         Dict with keys: west, south, east, north (in WGS84/EPSG:4326)
         or None if extraction fails
     """
-    if not HAS_GDAL:
+    if not check_gdal_available():
         return None
     
     try:
@@ -195,7 +197,7 @@ def generate_geopdf_preview(pdf_path: Path, dataset_id: str) -> Optional[str]:
     Returns:
         Preview URL path (relative to static) or None if generation fails
     """
-    if not HAS_GDAL:
+    if not check_gdal_available():
         return None
     
     try:
@@ -246,7 +248,7 @@ async def export_geopdf(req: GeoPDFExportRequest):
     
     Uses GDAL's gdal_translate to create a true GeoPDF with georeferencing.
     """
-    if not HAS_GDAL:
+    if not check_gdal_available():
         raise HTTPException(
             status_code=503,
             detail="GDAL is not available. GeoPDF export requires GDAL to be installed. "
@@ -518,7 +520,7 @@ async def upload_geopdf(
     preview_url = None
     preview_bounds = None
     
-    if HAS_GDAL:
+    if check_gdal_available():
         print(f"[GEOPDF] Generating preview and extracting bounds for {dataset_id}...")
         
         # Generate preview PNG
@@ -627,7 +629,7 @@ async def get_dataset_preview(dataset_id: str):
         return JSONResponse({"preview_url": None, "message": "Preview not available for this dataset type"})
     
     # Try to generate preview from PDF using GDAL if available
-    if HAS_GDAL:
+    if check_gdal_available():
         file_path = Path("static") / dataset.get("file_path", "")
         if file_path.exists():
             preview_dir = GEOPDF_UPLOAD_DIR / "previews"
@@ -20,10 +20,7 @@ from app.services.raster_service import resolve_raster_path
 from app.services.geopdf_service import (
     export_geopdf,
     import_geopdf_to_overlay,
-    cleanup_old_uploads,
-    HAS_GDAL,
-    HAS_GDAL_CLI,
-    HAS_GDAL_PYTHON,
+    check_gdal_python,
     MAX_UPLOAD_SIZE,
     GEOPDF_STORAGE_DIR
 )
@@ -31,9 +28,6 @@ from app.api.v1.routes_raster_export import normalize_for_export
 
 router = APIRouter(tags=["geopdf"])
 
-# Run cleanup on module load
-cleanup_old_uploads()
-
 
 @router.get("/geopdf/status")
 async def get_geopdf_status():
@@ -116,21 +110,14 @@ async def export_geopdf_endpoint(req: GeoPDFExportRequest):
         File download: application/pdf
         Filename: vmrc_<raster_id>_<timestamp>.pdf
     """
-    if not HAS_GDAL:
-        if not HAS_GDAL_CLI:
-            raise HTTPException(
-                status_code=500,
-                detail="GDAL command-line tools are not available. GeoPDF export requires GDAL to be installed. "
-                       "See installation instructions: https://gdal.org/download.html"
-            )
-        else:
-            raise HTTPException(
-                status_code=500,
-                detail="GDAL Python bindings are not available. Install with: "
-                       "OSGeo4W: Install 'gdal-python' package, or "
-                       "Conda: conda install -c conda-forge gdal, or "
-                       "Pip: pip install gdal (must match system GDAL version)"
-            )
+    if not check_gdal_python():
+        raise HTTPException(
+            status_code=500,
+            detail="GDAL Python bindings are not available. GeoPDF export requires GDAL. Install with: "
+                   "OSGeo4W: Install 'gdal-python' package, or "
+                   "Conda: conda install -c conda-forge gdal, or "
+                   "Pip: pip install gdal (must match system GDAL version)"
+        )
     
     try:
         # Resolve raster path
@@ -193,21 +180,14 @@ async def import_geopdf_endpoint(file: UploadFile = File(...)):
       "crs": "EPSG:4326"
     }
     """
-    if not HAS_GDAL:
-        if not HAS_GDAL_CLI:
-            raise HTTPException(
-                status_code=503,
-                detail="GDAL command-line tools are not available. GeoPDF import requires GDAL to be installed. "
-                       "See installation instructions: https://gdal.org/download.html"
-            )
-        else:
-            raise HTTPException(
-                status_code=503,
-                detail="GDAL Python bindings are not available. Install with: "
-                       "OSGeo4W: Install 'gdal-python' package, or "
-                       "Conda: conda install -c conda-forge gdal, or "
-                       "Pip: pip install gdal (must match system GDAL version)"
-            )
+    if not check_gdal_python():
+        raise HTTPException(
+            status_code=503,
+            detail="GDAL Python bindings are not available. GeoPDF import requires GDAL. Install with: "
+                   "OSGeo4W: Install 'gdal-python' package, or "
+                   "Conda: conda install -c conda-forge gdal, or "
+                   "Pip: pip install gdal (must match system GDAL version)"
+        )
     
     # Validate file type
     if not file.content_type or "pdf" not in file.content_type.lower():
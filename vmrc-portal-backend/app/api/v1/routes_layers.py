@@ -6,13 +6,10 @@ Layer metadata endpoints for uploaded GeoPDFs and processed layers.
 from fastapi import APIRouter, HTTPException
 from pathlib import Path
 
-from app.services.layer_metadata import load_metadata, cleanup_old_uploads
+from app.services.layer_metadata import load_metadata
 
 router = APIRouter(tags=["layers"])
 
-# Run cleanup on module load
-cleanup_old_uploads()
-
 
 @router.get("/layers/{layer_id}/metadata")
 async def get_layer_metadata(layer_id: str):
@@ -1,7 +1,7 @@
 # File: app/api/v1/routes_project.py
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db
 from app.schemas.project import ProjectCreate, ProjectRead
@@ -14,7 +14,7 @@ router = APIRouter()
     response_model=list[ProjectRead],
     summary="List projects (placeholder)",
 )
-def list_projects(db: Session = Depends(get_db)):
+async def list_projects(db: AsyncSession = Depends(get_db)):
     """
     Placeholder implementation returning an empty list.
 
@@ -30,9 +30,9 @@ def list_projects(db: Session = Depends(get_db)):
     status_code=status.HTTP_201_CREATED,
     summary="Create project (placeholder)",
 )
-def create_project(
+async def create_project(
     payload: ProjectCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Placeholder for creating a project.
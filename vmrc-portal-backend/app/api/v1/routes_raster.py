@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import Optional
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
+from app.core.responses import FastJSONResponse
 from app.services.raster_service import clip_raster_for_layer, resolve_raster_path, OVERLAY_DIR
 
 router = APIRouter(tags=["rasters"])
@@ -126,11 +127,12 @@ async def get_raster_value(layer_id: int, lat: float, lon: float):
 @router.post("/clip")
 async def clip_raster(req: ClipRequest):
     try:
-        return clip_raster_for_layer(
+        # Returned as a Response so the pixel ndarray skips jsonable_encoder
+        return FastJSONResponse(clip_raster_for_layer(
             raster_layer_id=req.raster_layer_id,
             user_clip_geojson=req.user_clip_geojson,
             zoom=req.zoom  # Pass zoom for display overlay resampling
-        )
+        ))
     except FileNotFoundError as e:
         error_msg = str(e)
         print(f"\n[ERROR] FileNotFoundError: {error_msg}")
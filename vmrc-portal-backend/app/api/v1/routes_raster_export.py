@@ -1,14 +1,16 @@
 # app/api/v1/routes_raster_export.py
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import Response
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 from app.services.raster_service import clip_raster_for_layer, resolve_raster_path
 from pathlib import Path
 import rasterio
 from rasterio.mask import mask
-from rasterio.warp import transform_geom
 from rasterio.windows import from_bounds, Window
 from rasterio.features import geometry_mask
+from rasterio.crs import CRS
+from pyproj import Transformer
+import shapely
 from shapely.geometry import shape, mapping, Polygon, MultiPolygon
 from shapely.validation import make_valid
 from shapely.ops import unary_union
@@ -17,14 +19,21 @@ import csv
 import json
 import uuid
 import re
+import string
 from datetime import datetime
 from typing import List, Optional, Dict, Any
-import base64
 from io import BytesIO
+from PIL import Image as PILImage
 import xml.etree.ElementTree as ET
 import os
 import zipfile
 import shutil
+import importlib.util
+import logging
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
 
 # Try to import requests for image fetching
 try:
@@ -32,10 +41,20 @@ try:
     HAS_REQUESTS = True
 except ImportError:
     HAS_REQUESTS = False
-    print("WARNING: requests not installed. Preview image embedding in PDF may not work.")
+    logger.warning("requests not installed. Preview image embedding in PDF may not work.")
 
-# PDF generation imports
-try:
+# PDF generation imports (deferred: reportlab is only imported on first PDF build)
+HAS_REPORTLAB = importlib.util.find_spec("reportlab") is not None
+if not HAS_REPORTLAB:
+    logger.warning("reportlab not installed. PDF export will not work. Install with: pip install reportlab")
+
+
+@lru_cache(maxsize=None)
+def _lazy_reportlab() -> None:
+    """Import reportlab once and bind the names used by the PDF builders at module scope."""
+    global letter, A4, landscape, getSampleStyleSheet, ParagraphStyle, inch
+    global SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, PageBreak, KeepTogether
+    global colors, canvas
     from reportlab.lib.pagesizes import letter, A4, landscape
     from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.lib.units import inch
@@ -44,13 +63,142 @@ try:
     from reportlab.pdfgen import canvas
     # Note: ImageReader is only for canvas.drawImage(), not for Platypus Image flowable
     # For Platypus Image, use BytesIO directly
-    HAS_REPORTLAB = True
+
+# ------------------------------------------------------------
+# Shared static table styles: built once per process (after reportlab is loaded)
+# instead of re-creating identical TableStyle objects for every PDF.
+# ------------------------------------------------------------
+
+@lru_cache(maxsize=None)
+def _info_table_style() -> "TableStyle":
+    """Label/value info rows (bold labels, compact padding)."""
+    return TableStyle([
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+        ('TOPPADDING', (0, 0), (-1, -1), 4),
+    ])
+
+
+@lru_cache(maxsize=None)
+def _framed_image_style() -> "TableStyle":
+    """Centered map image framed by a light gray border."""
+    return TableStyle([
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#d1d5db')),
+        ('BACKGROUND', (0, 0), (-1, -1), colors.white),
+    ])
+
+
+@lru_cache(maxsize=None)
+def _threshold_table_style() -> "TableStyle":
+    """Area-by-threshold table: dark header, banded rows, right-aligned numbers."""
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2f3a4a')),  # Header background: #2f3a4a
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),  # Header text: white, bold
+        ('BACKGROUND', (0, 1), (0, -1), colors.HexColor('#f9fafb')),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.HexColor('#111827')),  # Data rows only (not header)
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),  # Numbers right-aligned
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),  # Header font weight 700 (bold)
+        ('FONTSIZE', (0, 0), (-1, 0), 12),  # Header font size
+        ('FONTSIZE', (0, 1), (-1, -1), 10),  # Data rows keep original size
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),  # Header padding: 8px vertical
+        ('TOPPADDING', (0, 0), (-1, 0), 8),
+        ('LEFTPADDING', (0, 0), (-1, 0), 10),  # Header padding: 10px horizontal
+        ('RIGHTPADDING', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 6),  # Data row padding
+        ('TOPPADDING', (0, 1), (-1, -1), 6),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e5e7eb')),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9fafb')]),
+    ])
+
+
+@lru_cache(maxsize=None)
+def _range_table_style() -> "TableStyle":
+    """Most-common-value-range table: dark header, right-aligned numbers."""
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2f3a4a')),  # Header background: #2f3a4a
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),  # Header text: white, bold
+        ('BACKGROUND', (0, 1), (0, -1), colors.HexColor('#f9fafb')),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.HexColor('#111827')),  # Data rows only (not header)
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),  # Header font weight 700 (bold)
+        ('FONTSIZE', (0, 0), (-1, 0), 12),  # Header font size
+        ('FONTSIZE', (0, 1), (-1, -1), 10),  # Data rows keep original size
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),  # Header padding: 8px vertical
+        ('TOPPADDING', (0, 0), (-1, 0), 8),
+        ('LEFTPADDING', (0, 0), (-1, 0), 10),  # Header padding: 10px horizontal
+        ('RIGHTPADDING', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 6),  # Data row padding
+        ('TOPPADDING', (0, 1), (-1, -1), 6),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e5e7eb')),
+    ])
+
+
+@lru_cache(maxsize=None)
+def _kv_table_style() -> "TableStyle":
+    """Multi-AOI label/value tables (raster name, statistics)."""
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f9fafb')),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#111827')),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ('TOPPADDING', (0, 0), (-1, -1), 6),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e5e7eb')),
+    ])
+
+
+@lru_cache(maxsize=None)
+def _image_grid_style() -> "TableStyle":
+    """Multi-AOI preview image cell with a light gray border."""
+    return TableStyle([
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#d1d5db')),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ])
+
+# Cloud-Optimized GeoTIFF conversion (optional)
+try:
+    from rio_cogeo.cogeo import cog_translate
+    from rio_cogeo.profiles import cog_profiles
+    HAS_RIO_COGEO = True
+except ImportError:
+    HAS_RIO_COGEO = False
+
+# Fast JSON serialization (optional)
+try:
+    import orjson
+    HAS_ORJSON = True
 except ImportError:
-    HAS_REPORTLAB = False
-    print("WARNING: reportlab not installed. PDF export will not work. Install with: pip install reportlab")
+    HAS_ORJSON = False
 
 router = APIRouter(tags=["export"])
 
+def dumps_report_json_bytes(obj: Any, indent: bool = True) -> bytes:
+    """Serialize report metadata as UTF-8 JSON bytes (orjson when available; handles numpy scalars).
+
+    Indented by default; ``indent=False`` produces compact output without whitespace.
+    """
+    if HAS_ORJSON:
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, indent=2).encode("utf-8")
+    return json.dumps(obj, separators=(',', ':')).encode("utf-8")
+
+
+def dumps_report_json(obj: Any, indent: bool = True) -> str:
+    """Serialize report metadata as a JSON string (see dumps_report_json_bytes)."""
+    return dumps_report_json_bytes(obj, indent=indent).decode("utf-8")
+
+
 class ExportRequest(BaseModel):
     raster_layer_id: int
     user_clip_geojson: dict
@@ -61,6 +209,37 @@ class ExportRequest(BaseModel):
     aoi_name: Optional[str] = None  # Optional: AOI name for PDF title (e.g., "Uploaded AOI" or filename)
     overlay_urls: Optional[List[Dict[str, Any]]] = None  # Optional: array of {overlay_url, aoi_name, user_clip_geojson} for multi-AOI PDF
 
+    # Normalized AOI, parsed once per request and shared by every export format
+    _export_feature: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+    _geom: Any = PrivateAttr(default=None)
+    _normalize_error: Optional[str] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        try:
+            feature = normalize_for_export(self.user_clip_geojson)
+            if not feature.get("geometry"):
+                raise ValueError("Normalized feature has no geometry")
+            geom = shape(feature["geometry"])
+            if not geom.is_valid:
+                geom = make_valid(geom)
+        except Exception as e:
+            # Surface the error from the format branches that need the geometry
+            self._normalize_error = str(e)
+            return
+        self._export_feature = feature
+        self._geom = geom
+
+    def get_export_feature(self) -> Dict[str, Any]:
+        """Return the normalized AOI Feature, raising ValueError if it could not be parsed."""
+        if self._export_feature is None:
+            raise ValueError(self._normalize_error or "GeoJSON could not be normalized")
+        return self._export_feature
+
+    def get_export_geom(self):
+        """Return the (valid) shapely geometry of the normalized AOI in EPSG:4326."""
+        self.get_export_feature()
+        return self._geom
+
 
 class PDFExportRequest(BaseModel):
     """Request model for dedicated PDF export endpoint."""
@@ -73,14 +252,29 @@ class PDFExportRequest(BaseModel):
     stats: Optional[Dict[str, Any]] = None  # Optional: pre-computed stats (if overlay_url is provided)
 
 
+_UNSAFE_FILENAME_RE = re.compile(r'[^\w\-_\.]')
+_UNDERSCORE_RUN_RE = re.compile(r'_+')
+
+# ASCII translation table: everything except letters, digits, '-', '_' and '.' becomes '_'
+_SAFE_FILENAME_CHARS = set(string.ascii_letters + string.digits + "-_.")
+_SAFE_FILENAME_TABLE = str.maketrans({
+    chr(c): "_" for c in range(128) if chr(c) not in _SAFE_FILENAME_CHARS
+})
+
+
 def sanitize_filename(name: str) -> str:
     """Remove dangerous characters from filename."""
     if not name:
         return ""
     # Replace spaces and slashes with underscores, remove other dangerous chars
-    name = re.sub(r'[^\w\-_\.]', '_', name)
+    if name.isascii():
+        name = name.translate(_SAFE_FILENAME_TABLE)
+    else:
+        # Non-ASCII names keep Unicode word characters (same as \w)
+        name = _UNSAFE_FILENAME_RE.sub('_', name)
     # Remove consecutive underscores
-    name = re.sub(r'_+', '_', name)
+    if "__" in name:
+        name = _UNDERSCORE_RUN_RE.sub('_', name)
     return name.strip('_')
 
 
@@ -160,14 +354,14 @@ def get_raster_base_filename(raster_layer_id: int) -> str:
         raster_filename = Path(raster_path).name
         # Strip extension (e.g., "HSL2.5_DF_50_D_l.tif" -> "HSL2.5_DF_50_D_l")
         base_name = Path(raster_filename).stem
-        print(f"[EXPORT FILENAME] Raster path: {raster_path}")
-        print(f"[EXPORT FILENAME] Raster filename: {raster_filename}")
-        print(f"[EXPORT FILENAME] Base name (no extension): {base_name}")
+        logger.debug("[EXPORT FILENAME] Raster path: %s", raster_path)
+        logger.debug("[EXPORT FILENAME] Raster filename: %s", raster_filename)
+        logger.debug("[EXPORT FILENAME] Base name (no extension): %s", base_name)
         # Sanitize for Windows (remove spaces, slashes, colons) but preserve structure
         sanitized = sanitize_filename(base_name)
         return sanitized
     except Exception as e:
-        print(f"[EXPORT FILENAME] Warning: Could not get raster filename: {e}")
+        logger.warning("[EXPORT FILENAME] Could not get raster filename: %s", e)
         return generate_default_filename()
 
 
@@ -201,14 +395,11 @@ def build_export_filename(context: Optional[Dict[str, Any]], extension: str = ""
     hsl_class = context.get("hslClass")
     
     # Debug: Log all input values
-    print(f"[EXPORT FILENAME] Input filters:")
-    print(f"  mapType: {map_type}")
-    print(f"  species: {species}")
-    print(f"  condition: {condition}")
-    print(f"  hslCondition: {hsl_condition}")
-    print(f"  month: {month}")
-    print(f"  coverPercent: {cover_percent}")
-    print(f"  hslClass: {hsl_class}")
+    logger.debug(
+        "[EXPORT FILENAME] Input filters: mapType=%s species=%s condition=%s "
+        "hslCondition=%s month=%s coverPercent=%s hslClass=%s",
+        map_type, species, condition, hsl_condition, month, cover_percent, hsl_class,
+    )
     
     filename_parts = []
     
@@ -297,14 +488,13 @@ def build_export_filename(context: Optional[Dict[str, Any]], extension: str = ""
         base_name = generate_default_filename()
     
     # Debug: Log computed parts
-    print(f"[EXPORT FILENAME] Computed parts:")
-    print(f"  mapTypeCode: {map_type_code}")
-    print(f"  speciesCode: {species_code}")
-    print(f"  conditionCode: {condition_code}")
-    print(f"  cover: Cover{cover_percent if cover_percent else 'N/A'}")
-    print(f"  classPart: {class_part if class_part else '(omitted - species is WH)' if species_code == 'WH' else '(omitted - no class)'}")
-    print(f"  monthPart: {month_part if month_part else '(omitted - mapType is HSL)' if map_type == 'HSL' else '(omitted - no month)'}")
-    print(f"[EXPORT FILENAME] Final base name: {base_name}")
+    logger.debug(
+        "[EXPORT FILENAME] Computed parts: mapTypeCode=%s speciesCode=%s conditionCode=%s "
+        "cover=%s classPart=%s monthPart=%s",
+        map_type_code, species_code, condition_code,
+        cover_percent or "N/A", class_part or "(omitted)", month_part or "(omitted)",
+    )
+    logger.debug("[EXPORT FILENAME] Final base name: %s", base_name)
     
     # Sanitize and add extension
     sanitized = sanitize_filename(base_name)
@@ -404,6 +594,45 @@ def get_histogram_bin_ranges() -> List[str]:
             "50–60", "60–70", "70–80", "80–90", "90–100"]
 
 
+def _compute_histogram_bins(valid_pixels: np.ndarray) -> np.ndarray:
+    """
+    Count pixels into the ten 0–100 histogram bins (values clamped to [0, 100]).
+    
+    Bin i covers [10*i, 10*(i+1)); 100 falls into the last bin.
+    """
+    if valid_pixels is None or len(valid_pixels) == 0:
+        return np.zeros(10, dtype=int)
+    clamped = np.clip(valid_pixels, 0, 100)
+    idx = np.minimum(clamped.astype(np.int64) // 10, 9)  # handles == 100
+    return np.bincount(idx, minlength=10).astype(int)
+
+
+REPORT_PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def _compute_stats_extras(valid_pixels: np.ndarray) -> Dict[str, Any]:
+    """
+    Compute median and report percentiles with a single np.partition call.
+    
+    Percentiles use the lower-index convention (index floor(p/100 * (n-1))) and the
+    median matches np.median, so values are unchanged from the previous sort-based code.
+    
+    Returns:
+        {"median": float | None, "percentiles": {"p10": ..., "p90": ...}}
+    """
+    n = len(valid_pixels) if valid_pixels is not None else 0
+    if n == 0:
+        return {"median": None, "percentiles": {}}
+    pct_idx = {p: int((p / 100) * (n - 1)) for p in REPORT_PERCENTILES}
+    mid_lo, mid_hi = (n - 1) // 2, n // 2
+    kth = sorted(set(pct_idx.values()) | {mid_lo, mid_hi})
+    part = np.partition(np.asarray(valid_pixels), kth)
+    return {
+        "median": float((part[mid_lo] + part[mid_hi]) / 2),
+        "percentiles": {f"p{p}": float(part[i]) for p, i in pct_idx.items()},
+    }
+
+
 def compute_expanded_stats(stats: Dict[str, Any], histogram: Optional[Dict[str, Any]] = None, valid_pixels: Optional[np.ndarray] = None) -> Dict[str, Any]:
     """
     Compute expanded statistics matching the UI cards:
@@ -469,11 +698,7 @@ def compute_expanded_stats(stats: Dict[str, Any], histogram: Optional[Dict[str,
         low_percent = (low_count / total_pixels * 100) if total_pixels > 0 else 0
         
         # Most common range: find which bin has most pixels
-        bin_counts = np.zeros(10, dtype=int)
-        for v in valid_pixels:
-            clamped = max(0, min(100, v))
-            idx = 9 if clamped == 100 else max(0, min(9, int(np.floor(clamped / 10))))
-            bin_counts[idx] += 1
+        bin_counts = _compute_histogram_bins(valid_pixels)
         
         dominant_bin_idx = int(np.argmax(bin_counts))
         bin_ranges = get_histogram_bin_ranges()
@@ -524,9 +749,8 @@ def render_clipped_preview_png(raster_layer_id: int, user_clip_geojson: dict) ->
     Raises:
         ValueError: If PNG generation fails
     """
-    from app.services.raster_service import clip_raster_for_layer
     
-    print(f"[PNG PREVIEW] Generating clipped raster preview for layer {raster_layer_id}...")
+    logger.debug("[PNG PREVIEW] Generating clipped raster preview for layer %s...", raster_layer_id)
     
     try:
         # Use clip_raster_for_layer to get the same PNG as the UI
@@ -551,24 +775,27 @@ def render_clipped_preview_png(raster_layer_id: int, user_clip_geojson: dict) ->
         with open(overlay_path, "rb") as f:
             png_bytes = f.read()
         
-        print(f"[PNG PREVIEW] ✓ Generated PNG preview ({len(png_bytes)} bytes)")
+        logger.debug("[PNG PREVIEW] ✓ Generated PNG preview (%s bytes)", len(png_bytes))
         return png_bytes
         
     except Exception as e:
         error_msg = f"Failed to generate PNG preview: {str(e)}"
-        print(f"[PNG PREVIEW] ERROR: {error_msg}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("[PNG PREVIEW] %s", error_msg)
         raise ValueError(error_msg)
 
 
-def build_arcgis_metadata(context: Optional[Dict[str, Any]], raster_name: str) -> Dict[str, str]:
+def build_arcgis_metadata(
+    context: Optional[Dict[str, Any]],
+    raster_name: str,
+    export_timestamp: Optional[str] = None,
+) -> Dict[str, str]:
     """
     Build ArcGIS-readable metadata tags from context and raster information.
     
     Args:
         context: Filter selections from the UI
         raster_name: Name of the raster file
+        export_timestamp: ISO timestamp of the export (shared with the other outputs)
         
     Returns:
         Dictionary of GDAL metadata tags for ArcGIS
@@ -642,7 +869,7 @@ def build_arcgis_metadata(context: Optional[Dict[str, Any]], raster_name: str) -
     # Use limitations
     use_limitations = "For research and visualization purposes only."
     
-    return {
+    metadata = {
         "TITLE": title,
         "SUMMARY": summary,
         "DESCRIPTION": description,
@@ -650,6 +877,9 @@ def build_arcgis_metadata(context: Optional[Dict[str, Any]], raster_name: str) -
         "CREDITS": credits,
         "USE_LIMITATIONS": use_limitations,
     }
+    if export_timestamp:
+        metadata["CREATED"] = export_timestamp
+    return metadata
 
 
 def write_arcgis_metadata(tif_path: Path, metadata: Dict[str, str]) -> None:
@@ -669,7 +899,7 @@ def write_arcgis_metadata(tif_path: Path, metadata: Dict[str, str]) -> None:
         metadata: Dictionary of metadata tags to write
     """
     try:
-        print(f"[EXPORT] Writing ArcGIS metadata to {tif_path}...")
+        logger.debug("[EXPORT] Writing ArcGIS metadata to %s...", tif_path)
         # Open in "r+" mode to update existing file
         with rasterio.open(str(tif_path), "r+") as dst:
             all_tags = {}
@@ -681,14 +911,14 @@ def write_arcgis_metadata(tif_path: Path, metadata: Dict[str, str]) -> None:
                 if len(title) > 200:
                     title = title[:200] + "..."
                 all_tags["TIFFTAG_DOCUMENTNAME"] = title
-                print(f"[EXPORT] Writing TITLE as TIFFTAG_DOCUMENTNAME: {title[:50]}...")
+                logger.debug("[EXPORT] Writing TITLE as TIFFTAG_DOCUMENTNAME: %s...", title[:50])
             
             if "DESCRIPTION" in metadata:
                 desc = str(metadata["DESCRIPTION"])
                 if len(desc) > 65000:
                     desc = desc[:65000] + "..."
                 all_tags["TIFFTAG_IMAGEDESCRIPTION"] = desc
-                print(f"[EXPORT] Writing DESCRIPTION as TIFFTAG_IMAGEDESCRIPTION: {len(desc)} chars")
+                logger.debug("[EXPORT] Writing DESCRIPTION as TIFFTAG_IMAGEDESCRIPTION: %s chars", len(desc))
             
             # 2. Write all metadata to GDAL domain (for other tools and as fallback)
             for key, value in metadata.items():
@@ -700,16 +930,14 @@ def write_arcgis_metadata(tif_path: Path, metadata: Dict[str, str]) -> None:
             # Update all tags
             dst.update_tags(**all_tags)
             
-            print(f"[EXPORT] Written metadata tags: {list(metadata.keys())}")
-            print(f"[EXPORT] Total tags written: {len(all_tags)}")
-            print(f"[EXPORT] Note: In ArcGIS, you may need to click 'Copy data source's metadata to this layer'")
-            print(f"[EXPORT]      button in the Metadata tab to populate the fields.")
+            logger.debug("[EXPORT] Written metadata tags: %s", list(metadata.keys()))
+            logger.debug("[EXPORT] Total tags written: %s", len(all_tags))
+            logger.debug("[EXPORT] Note: In ArcGIS, you may need to click 'Copy data source's metadata to this layer'")
+            logger.debug("[EXPORT]      button in the Metadata tab to populate the fields.")
             
-        print(f"[EXPORT] ✓ ArcGIS metadata written successfully")
+        logger.info("[EXPORT] ✓ ArcGIS metadata written successfully")
     except Exception as e:
-        print(f"[EXPORT] Warning: Failed to write ArcGIS metadata: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.warning("[EXPORT] Failed to write ArcGIS metadata: %s", e, exc_info=True)
         # Don't fail the export if metadata writing fails
 
 
@@ -730,11 +958,12 @@ def write_arcgis_tif_xml(tif_path: Path, metadata: Dict[str, str]) -> Optional[s
         Path to the created XML file as string, or None if creation failed
     """
     try:
-        # Log input path
-        print(f"[EXPORT] ===== ArcGIS XML Metadata Creation =====")
-        print(f"[EXPORT] Input tif_path: {tif_path}")
-        print(f"[EXPORT] tif_path type: {type(tif_path)}")
-        print(f"[EXPORT] tif_path absolute: {tif_path.resolve()}")
+        # Log input path (resolve() stats the filesystem, so only when debugging)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[EXPORT] ===== ArcGIS XML Metadata Creation =====")
+            logger.debug("[EXPORT] Input tif_path: %s", tif_path)
+            logger.debug("[EXPORT] tif_path type: %s", type(tif_path))
+            logger.debug("[EXPORT] tif_path absolute: %s", tif_path.resolve())
         
         # Ensure we create <name>.tif.xml (not <name>.tif.aux.xml)
         # If tif_path is "path/to/55.tif", xml_path should be "path/to/55.tif.xml"
@@ -743,10 +972,11 @@ def write_arcgis_tif_xml(tif_path: Path, metadata: Dict[str, str]) -> Optional[s
         xml_path_str = tif_path_str + ".xml"
         xml_path = Path(xml_path_str)
         
-        print(f"[EXPORT] Computed xml_path: {xml_path}")
-        print(f"[EXPORT] xml_path absolute: {xml_path.resolve()}")
-        print(f"[EXPORT] xml_path parent: {xml_path.parent}")
-        print(f"[EXPORT] xml_path name: {xml_path.name}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[EXPORT] Computed xml_path: %s", xml_path)
+            logger.debug("[EXPORT] xml_path absolute: %s", xml_path.resolve())
+            logger.debug("[EXPORT] xml_path parent: %s", xml_path.parent)
+            logger.debug("[EXPORT] xml_path name: %s", xml_path.name)
         
         # Verify we're not creating double extensions
         if xml_path.name.endswith(".xml.xml"):
@@ -754,9 +984,9 @@ def write_arcgis_tif_xml(tif_path: Path, metadata: Dict[str, str]) -> Optional[s
         
         # Verify we're creating .tif.xml (not just .xml)
         if not xml_path.name.endswith(".tif.xml"):
-            print(f"[EXPORT] WARNING: XML filename does not end with .tif.xml: {xml_path.name}")
+            logger.warning("[EXPORT] XML filename does not end with .tif.xml: %s", xml_path.name)
         
-        print(f"[EXPORT] Writing ArcGIS XML metadata to {xml_path}...")
+        logger.debug("[EXPORT] Writing ArcGIS XML metadata to %s...", xml_path)
         
         # Create root element with ArcGIS ESRI metadata namespace
         # ArcGIS reads this specific structure for metadata import
@@ -805,56 +1035,107 @@ def write_arcgis_tif_xml(tif_path: Path, metadata: Dict[str, str]) -> Optional[s
             use_limit = ET.SubElement(consts, "useLimit")
             use_limit.text = str(metadata["USE_LIMITATIONS"]).strip()
         
-        # Create XML tree and write to file
-        tree = ET.ElementTree(root)
-        
         # Format with indentation for readability (Python 3.9+)
         try:
-            ET.indent(tree, space="  ")
+            ET.indent(root, space="  ")
         except AttributeError:
             # ET.indent not available in Python < 3.9, skip indentation
             pass
         
-        # Write to file with UTF-8 encoding and proper XML declaration
-        print(f"[EXPORT] Writing XML file to disk...")
-        tree.write(
-            xml_path,
-            encoding="utf-8",
-            xml_declaration=True,
-            method="xml"
-        )
-        
-        # Verify file was created
-        xml_path_abs = xml_path.resolve()
-        file_exists = os.path.exists(xml_path_abs)
-        file_size = os.path.getsize(xml_path_abs) if file_exists else 0
-        
-        print(f"[EXPORT] ===== Verification =====")
-        print(f"[EXPORT] XML file path (absolute): {xml_path_abs}")
-        print(f"[EXPORT] os.path.exists(xml_path): {file_exists}")
-        print(f"[EXPORT] File size: {file_size} bytes")
-        print(f"[EXPORT] File naming: {tif_path.name} -> {xml_path.name}")
+        # Serialize once (UTF-8 with XML declaration) and write in a single call
+        logger.debug("[EXPORT] Writing XML file to disk...")
+        xml_bytes = ET.tostring(root, encoding="utf-8", xml_declaration=True, method="xml")
+        xml_path.write_bytes(xml_bytes)
         
-        if not file_exists:
-            raise FileNotFoundError(f"XML file was not created: {xml_path_abs}")
+        # Verify file was created (extra stat calls, so only when debugging)
+        if logger.isEnabledFor(logging.DEBUG):
+            xml_path_abs = xml_path.resolve()
+            file_exists = os.path.exists(xml_path_abs)
+            file_size = os.path.getsize(xml_path_abs) if file_exists else 0
+            
+            logger.debug("[EXPORT] ===== Verification =====")
+            logger.debug("[EXPORT] XML file path (absolute): %s", xml_path_abs)
+            logger.debug("[EXPORT] os.path.exists(xml_path): %s", file_exists)
+            logger.debug("[EXPORT] File size: %s bytes", file_size)
+            logger.debug("[EXPORT] File naming: %s -> %s", tif_path.name, xml_path.name)
+            
+            if not file_exists:
+                raise FileNotFoundError(f"XML file was not created: {xml_path_abs}")
         
-        if file_size == 0:
-            raise ValueError(f"XML file is empty: {xml_path_abs}")
+        if not xml_bytes:
+            raise ValueError(f"XML file is empty: {xml_path}")
         
-        print(f"[EXPORT] ✓ ArcGIS XML metadata written successfully: {xml_path}")
-        print(f"[EXPORT] =================================")
+        logger.info("[EXPORT] ✓ ArcGIS XML metadata written successfully: %s", xml_path)
+        logger.debug("[EXPORT] =================================")
         
         return str(xml_path)
         
     except Exception as e:
-        print(f"[EXPORT] ERROR: Failed to write ArcGIS XML metadata: {e}")
-        import traceback
-        traceback.print_exc()
-        print(f"[EXPORT] =================================")
+        logger.exception("[EXPORT] Failed to write ArcGIS XML metadata: %s", e)
+        logger.debug("[EXPORT] =================================")
         # Don't fail the export if XML metadata writing fails
         return None
 
 
+WGS84 = CRS.from_epsg(4326)
+
+
+@lru_cache(maxsize=64)
+def _get_transformer(src_crs_str: str, dst_crs_str: str) -> Transformer:
+    """Build (once per CRS pair) a thread-safe pyproj Transformer with lon/lat axis order."""
+    return Transformer.from_crs(src_crs_str, dst_crs_str, always_xy=True)
+
+
+def _clip_and_extract(src, geom_raster_crs, bounds: tuple):
+    """
+    Read the pixel-aligned window covering ``bounds`` once and mask it to the AOI polygon.
+    
+    The window is snapped to the source grid and clamped to the raster extent, so the
+    output is a true clip of source pixels (no resampling, no warping).
+    
+    Args:
+        src: Open rasterio dataset
+        geom_raster_crs: AOI geometry (shapely geometry or GeoJSON dict) already in the raster CRS
+        bounds: (minx, miny, maxx, maxy) of the AOI in the raster CRS
+    
+    Returns:
+        (clipped, out_transform, window) where ``clipped`` is a MaskedArray of shape
+        (bands, rows, cols) masked outside the polygon and on source nodata.
+        Valid values for stats are available via ``clipped[0].compressed()``.
+    """
+    logger.debug("[EXPORT] Computing pixel-aligned window...")
+    win = from_bounds(bounds[0], bounds[1], bounds[2], bounds[3], src.transform)
+    
+    # Round window to pixel boundaries (align to source grid)
+    win = win.round_offsets().round_lengths()
+    logger.debug("[EXPORT] Pixel-aligned window: %s", win)
+    
+    # Clamp window offsets and sizes to source dimensions
+    row_off = max(0, int(win.row_off))
+    col_off = max(0, int(win.col_off))
+    row_end = min(src.height, row_off + int(win.height))
+    col_end = min(src.width, col_off + int(win.width))
+    win = Window(col_off=col_off, row_off=row_off, width=col_end - col_off, height=row_end - row_off)
+    logger.debug("[EXPORT] Clamped window: row_off=%s, col_off=%s, height=%s, width=%s", row_off, col_off, win.height, win.width)
+    
+    windowed_data = src.read(window=win)
+    out_transform = src.window_transform(win)
+    logger.debug("[EXPORT] Windowed data shape: %s, transform: %s", windowed_data.shape, out_transform)
+    
+    # True for pixels OUTSIDE the geometry; all_touched includes any pixel touched by the boundary
+    outside = geometry_mask(
+        [geom_raster_crs],
+        out_shape=(win.height, win.width),
+        transform=out_transform,
+        invert=False,
+        all_touched=True
+    )
+    mask_array = np.broadcast_to(outside, windowed_data.shape)
+    if src.nodata is not None:
+        mask_array = mask_array | (windowed_data == src.nodata)
+    return np.ma.masked_array(windowed_data, mask=mask_array), out_transform, win
+
+
 def create_tif_zip(tif_path: Path, zip_path: Path) -> bool:
     """
     Create a ZIP file containing the GeoTIFF and its associated metadata files.
@@ -872,60 +1153,97 @@ def create_tif_zip(tif_path: Path, zip_path: Path) -> bool:
         True if zip was created successfully, False otherwise
     """
     try:
-        print(f"[EXPORT] Creating ZIP archive: {zip_path}")
+        logger.debug("[EXPORT] Creating ZIP archive: %s", zip_path)
         
         with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
             # Add the main .tif file
             if tif_path.exists():
                 zipf.write(tif_path, tif_path.name)
-                print(f"[EXPORT] Added to ZIP: {tif_path.name}")
+                logger.debug("[EXPORT] Added to ZIP: %s", tif_path.name)
             else:
-                print(f"[EXPORT] WARNING: TIF file not found: {tif_path}")
+                logger.warning("[EXPORT] TIF file not found: %s", tif_path)
                 return False
             
             # Add .tif.xml metadata file (ArcGIS sidecar)
             xml_path = Path(str(tif_path) + ".xml")
             if xml_path.exists():
                 zipf.write(xml_path, xml_path.name)
-                print(f"[EXPORT] Added to ZIP: {xml_path.name}")
+                logger.debug("[EXPORT] Added to ZIP: %s", xml_path.name)
             else:
-                print(f"[EXPORT] Note: XML metadata file not found: {xml_path}")
+                logger.debug("[EXPORT] Note: XML metadata file not found: %s", xml_path)
             
             # Add .aux.xml file if it exists (GDAL auxiliary file)
             aux_xml_path = Path(str(tif_path) + ".aux.xml")
             if aux_xml_path.exists():
                 zipf.write(aux_xml_path, aux_xml_path.name)
-                print(f"[EXPORT] Added to ZIP: {aux_xml_path.name}")
+                logger.debug("[EXPORT] Added to ZIP: %s", aux_xml_path.name)
         
         # Verify zip was created
         if zip_path.exists() and zip_path.stat().st_size > 0:
             zip_size = zip_path.stat().st_size
-            print(f"[EXPORT] ✓ ZIP archive created successfully: {zip_path.name} ({zip_size:,} bytes)")
+            logger.info("[EXPORT] ✓ ZIP archive created successfully: %s (%d bytes)", zip_path.name, zip_size)
             return True
         else:
-            print(f"[EXPORT] ERROR: ZIP file was not created or is empty")
+            logger.error("[EXPORT] ZIP file was not created or is empty")
             return False
             
     except Exception as e:
-        print(f"[EXPORT] ERROR: Failed to create ZIP archive: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("[EXPORT] Failed to create ZIP archive: %s", e)
         return False
 
 
-def fetch_image_as_base64(image_url: str, base_url: str = "http://127.0.0.1:8000") -> Optional[str]:
+# Longest side of the PDF preview image: ~200 dpi at the 6.5 inch preview width
+PREVIEW_MAX_PX = 1300
+
+
+def load_preview_image(source) -> BytesIO:
     """
-    Fetch an image from URL and convert to base64 data URL.
+    Decode an overlay PNG with Pillow and downsample it to the PDF preview size.
+    
+    reportlab otherwise embeds and rescales the full-resolution overlay itself. The
+    result stays PNG (the overlay's alpha channel keeps outside-AOI pixels transparent)
+    and uses nearest-neighbor resampling to keep pixel edges crisp like the map overlay.
+    
+    Args:
+        source: File path or binary file-like object containing the image
+        
+    Returns:
+        BytesIO with the (possibly downsampled) PNG, positioned at the start
+    """
+    
+    with PILImage.open(source) as im:
+        im.thumbnail((PREVIEW_MAX_PX, PREVIEW_MAX_PX), PILImage.NEAREST)
+        buf = BytesIO()
+        im.save(buf, "PNG")
+    buf.seek(0)
+    return buf
+
+
+@lru_cache(maxsize=None)
+def _http_session() -> "requests.Session":
+    """Shared keep-alive HTTP session (connection pool reused across exports)."""
+    from requests.adapters import HTTPAdapter
+    
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def fetch_image_bytes(image_url: str, base_url: str = "http://127.0.0.1:8000") -> Optional[bytes]:
+    """
+    Fetch an image from URL using the pooled HTTP session.
     
     Args:
         image_url: Relative or absolute URL to the image
         base_url: Base URL to prepend if image_url is relative
         
     Returns:
-        Base64 data URL string (e.g., "data:image/png;base64,...") or None if failed
+        Raw image bytes, or None if failed
     """
     if not HAS_REQUESTS:
-        print(f"[EXPORT] Warning: requests library not available, cannot fetch image from URL")
+        logger.warning("[EXPORT] requests library not available, cannot fetch image from URL")
         return None
     
     try:
@@ -937,25 +1255,13 @@ def fetch_image_as_base64(image_url: str, base_url: str = "http://127.0.0.1:8000
         else:
             full_url = image_url
         
-        print(f"[EXPORT] Fetching image from: {full_url}")
+        logger.debug("[EXPORT] Fetching image from: %s", full_url)
         
-        # Fetch the image
-        response = requests.get(full_url, timeout=10)
+        response = _http_session().get(full_url, timeout=10)
         response.raise_for_status()
-        
-        # Determine content type
-        content_type = response.headers.get("Content-Type", "image/png")
-        if not content_type.startswith("image/"):
-            content_type = "image/png"
-        
-        # Convert to base64
-        image_data = base64.b64encode(response.content).decode("utf-8")
-        data_url = f"data:{content_type};base64,{image_data}"
-        
-        print(f"[EXPORT] Successfully converted image to base64 (size: {len(image_data)} chars)")
-        return data_url
+        return response.content
     except Exception as e:
-        print(f"[EXPORT] Warning: Failed to fetch image as base64: {e}")
+        logger.warning("[EXPORT] Failed to fetch image: %s", e)
         return None
 
 
@@ -993,6 +1299,7 @@ def build_pdf_report_landscape(
     """
     if not HAS_REPORTLAB:
         raise ValueError("reportlab not installed")
+    _lazy_reportlab()
     
     # Create in-memory PDF buffer
     pdf_buffer = BytesIO()
@@ -1003,21 +1310,21 @@ def build_pdf_report_landscape(
     # Header callbacks - apply header on every page
     def on_first_page_landscape(canvas, doc):
         """Add header on first page."""
-        print("[PDF LANDSCAPE] 🔵 on_first_page callback triggered")
+        logger.debug("[PDF LANDSCAPE] 🔵 on_first_page callback triggered")
         draw_pdf_header(canvas, doc, landscape_size)
-        print("[PDF LANDSCAPE] 🔵 on_first_page callback complete")
+        logger.debug("[PDF LANDSCAPE] 🔵 on_first_page callback complete")
     
     def on_later_pages_landscape(canvas, doc):
         """Add header on subsequent pages."""
-        print("[PDF LANDSCAPE] 🔵 on_later_pages callback triggered")
+        logger.debug("[PDF LANDSCAPE] 🔵 on_later_pages callback triggered")
         draw_pdf_header(canvas, doc, landscape_size)
-        print("[PDF LANDSCAPE] 🔵 on_later_pages callback complete")
+        logger.debug("[PDF LANDSCAPE] 🔵 on_later_pages callback complete")
     
     # Calculate top margin: HEADER_H (60pt) + 20pt padding = 80pt
     # This ensures body content starts BELOW the header and cannot cover it
     HEADER_H = 60  # Header height in points
     header_margin = (HEADER_H + 20) / 72.0 * inch  # Convert points to inches (72pt = 1 inch)
-    print(f"[PDF LANDSCAPE] Header margin: {header_margin} inches ({HEADER_H + 20} points)")
+    logger.debug("[PDF LANDSCAPE] Header margin: %s inches (%s points)", header_margin, HEADER_H + 20)
     
     doc = SimpleDocTemplate(
         pdf_buffer,
@@ -1047,13 +1354,7 @@ def build_pdf_report_landscape(
     
     if info_data:
         info_table = Table(info_data, colWidths=[1.5*inch, 4*inch])
-        info_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-            ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ]))
+        info_table.setStyle(_info_table_style())
         story.append(info_table)
     
     story.append(Spacer(1, 0.2*inch))
@@ -1068,16 +1369,9 @@ def build_pdf_report_landscape(
     try:
         # For Platypus Image, use BytesIO directly (not ImageReader)
         # First, get image dimensions using PIL
-        try:
-            from PIL import Image as PILImage
-            pil_img = PILImage.open(BytesIO(png_bytes))
+        with PILImage.open(BytesIO(png_bytes)) as pil_img:
             img_width_px, img_height_px = pil_img.size
-            aspect_ratio = img_height_px / img_width_px if img_width_px > 0 else 1.0
-        except ImportError:
-            # Fallback: assume square if PIL not available
-            print("[PDF] Warning: PIL not available, using default aspect ratio")
-            img_width_px, img_height_px = 800, 800
-            aspect_ratio = 1.0
+        aspect_ratio = img_height_px / img_width_px if img_width_px > 0 else 1.0
         
         # Fit to available width in landscape (about 4.5 inches for left column)
         max_img_width = 4.5 * inch
@@ -1095,12 +1389,7 @@ def build_pdf_report_landscape(
         
         # Map section with border
         map_table = Table([[img]], colWidths=[max_img_width])
-        map_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#d1d5db')),
-            ('BACKGROUND', (0, 0), (-1, -1), colors.white),
-        ]))
+        map_table.setStyle(_framed_image_style())
         
         map_section = [
             Paragraph("<b>Raster Map</b>", styles['Heading3']),
@@ -1108,11 +1397,9 @@ def build_pdf_report_landscape(
             map_table,
         ]
         
-        print(f"[PDF] ✓ Embedded raster map ({img_width_px}x{img_height_px} px)")
+        logger.debug("[PDF] ✓ Embedded raster map (%sx%s px)", img_width_px, img_height_px)
     except Exception as img_err:
-        print(f"[PDF] Warning: Failed to embed image: {img_err}")
-        import traceback
-        traceback.print_exc()
+        logger.warning("[PDF] Failed to embed image: %s", img_err, exc_info=True)
         map_section = [
             Paragraph("<b>Raster Map</b>", styles['Heading3']),
             Paragraph("Map image unavailable", styles['Normal']),
@@ -1197,7 +1484,6 @@ def build_pdf_report_landscape(
     ]
     
     # Create two-column layout
-    from reportlab.platypus import KeepTogether
     left_col = KeepTogether(map_section)
     right_col = KeepTogether(stats_section)
     
@@ -1216,8 +1502,7 @@ def build_pdf_report_landscape(
     # ============================================================
     footer_data = []
     if raster_crs:
-        crs_str = str(raster_crs) if hasattr(raster_crs, '__str__') else str(raster_crs)
-        footer_data.append(["Projection:", crs_str])
+        footer_data.append(["Projection:", str(raster_crs)])
     footer_data.append(["Data Source:", "VMRC Portal"])
     footer_data.append(["Generated:", datetime.now().strftime('%Y-%m-%d %H:%M:%S')])
     
@@ -1234,15 +1519,15 @@ def build_pdf_report_landscape(
         story.append(footer_table)
     
     # Build PDF
-    print("[PDF LANDSCAPE] 🔵 About to call doc.build(story) - header callbacks will execute during build")
+    logger.debug("[PDF LANDSCAPE] 🔵 About to call doc.build(story) - header callbacks will execute during build")
     doc.build(story)
-    print("[PDF LANDSCAPE] 🔵 doc.build(story) complete")
+    logger.debug("[PDF LANDSCAPE] 🔵 doc.build(story) complete")
     
     # Get PDF bytes
     pdf_bytes = pdf_buffer.getvalue()
     pdf_buffer.close()
     
-    print(f"[PDF] ✓ Generated landscape PDF report ({len(pdf_bytes)} bytes)")
+    logger.debug("[PDF] ✓ Generated landscape PDF report (%s bytes)", len(pdf_bytes))
     return pdf_bytes
 
 
@@ -1259,7 +1544,7 @@ def draw_pdf_header(canvas, doc, pagesize):
         doc: Document object (not used but required for callback signature)
         pagesize: Tuple of (width, height) in points
     """
-    print("[PDF] 🔵 CALLING draw_pdf_header - START")
+    logger.debug("[PDF] 🔵 CALLING draw_pdf_header - START")
     canvas.saveState()
     
     page_width, page_height = pagesize
@@ -1272,7 +1557,7 @@ def draw_pdf_header(canvas, doc, pagesize):
     # RGB(245, 245, 245) = light gray
     canvas.setFillColorRGB(0.96, 0.96, 0.96)  # RGB(245,245,245) normalized to 0-1
     canvas.rect(0, page_height - HEADER_H, page_width, HEADER_H, fill=1, stroke=0)
-    print(f"[PDF] ✓ Drew header background rectangle: x=0, y={page_height - HEADER_H}, w={page_width}, h={HEADER_H}")
+    logger.debug("[PDF] ✓ Drew header background rectangle: x=0, y=%s, w=%s, h=%s", page_height - HEADER_H, page_width, HEADER_H)
     
     # Title: "VMRC Mortality Calculation" centered
     # Position: 35 points from top = page_height - 35
@@ -1283,7 +1568,7 @@ def draw_pdf_header(canvas, doc, pagesize):
     title_y = page_height - 35  # 35 points from top
     title_x = (page_width - title_width) / 2  # Centered
     canvas.drawString(title_x, title_y, title_text)
-    print(f"[PDF] ✓ Drew title: '{title_text}' at x={title_x:.1f}, y={title_y}")
+    logger.debug("[PDF] ✓ Drew title: '%s' at x=%.1f, y=%s", title_text, title_x, title_y)
     
     # Logos: 40px tall, keep aspect ratio
     logo_height = 40
@@ -1316,11 +1601,11 @@ def draw_pdf_header(canvas, doc, pagesize):
             logo_width = logo_height * (img_width / img_height_orig) if img_height_orig > 0 else logo_height
             logo_y = page_height - logo_height - 10  # 10px from top
             canvas.drawImage(osu_img, logo_margin, logo_y, width=logo_width, height=logo_height, preserveAspectRatio=True)
-            print(f"[PDF] ✓ Loaded OSU logo from: {osu_logo_path}")
+            logger.debug("[PDF] ✓ Loaded OSU logo from: %s", osu_logo_path)
         except Exception as e:
-            print(f"[PDF] Warning: Could not load OSU logo: {e}")
+            logger.warning("[PDF] Could not load OSU logo: %s", e)
     else:
-        print(f"[PDF] Info: OSU logo not found (checked {len(osu_logo_paths)} paths)")
+        logger.debug("[PDF] Info: OSU logo not found (checked %s paths)", len(osu_logo_paths))
     
     # VMRC logo on RIGHT (vmrc.png in /public folder)
     vmrc_logo_paths = [
@@ -1350,21 +1635,21 @@ def draw_pdf_header(canvas, doc, pagesize):
             logo_y = page_height - logo_height - 10  # 10px from top
             logo_x = page_width - logo_width - logo_margin
             canvas.drawImage(vmrc_img, logo_x, logo_y, width=logo_width, height=logo_height, preserveAspectRatio=True)
-            print(f"[PDF] ✓ Loaded VMRC logo from: {vmrc_logo_path}")
+            logger.debug("[PDF] ✓ Loaded VMRC logo from: %s", vmrc_logo_path)
         except Exception as e:
-            print(f"[PDF] Warning: Could not load VMRC logo: {e}")
+            logger.warning("[PDF] Could not load VMRC logo: %s", e)
     else:
-        print(f"[PDF] Info: VMRC logo not found (checked {len(vmrc_logo_paths)} paths)")
+        logger.debug("[PDF] Info: VMRC logo not found (checked %s paths)", len(vmrc_logo_paths))
     
     # Divider line at y = page_height - HEADER_H (bottom of header)
     divider_y = page_height - HEADER_H
     canvas.setStrokeColorRGB(0.82, 0.82, 0.82)  # RGB(180,180,180) = light gray
     canvas.setLineWidth(1)
     canvas.line(0, divider_y, page_width, divider_y)
-    print(f"[PDF] ✓ Drew divider line at y={divider_y} (from x=0 to x={page_width})")
+    logger.debug("[PDF] ✓ Drew divider line at y=%s (from x=0 to x=%s)", divider_y, page_width)
     
     canvas.restoreState()
-    print("[PDF] 🔵 draw_pdf_header - COMPLETE")
+    logger.debug("[PDF] 🔵 draw_pdf_header - COMPLETE")
 
 
 def build_pdf_report(
@@ -1399,6 +1684,7 @@ def build_pdf_report(
     """
     if not HAS_REPORTLAB:
         raise ValueError("reportlab not installed")
+    _lazy_reportlab()
     
     # Create in-memory PDF buffer
     pdf_buffer = BytesIO()
@@ -1409,21 +1695,21 @@ def build_pdf_report(
     # Header callbacks - apply header on every page
     def on_first_page(canvas, doc):
         """Add header on first page."""
-        print("[PDF] 🔵 on_first_page callback triggered")
+        logger.debug("[PDF] 🔵 on_first_page callback triggered")
         draw_pdf_header(canvas, doc, landscape_size)
-        print("[PDF] 🔵 on_first_page callback complete")
+        logger.debug("[PDF] 🔵 on_first_page callback complete")
     
     def on_later_pages(canvas, doc):
         """Add header on subsequent pages."""
-        print("[PDF] 🔵 on_later_pages callback triggered")
+        logger.debug("[PDF] 🔵 on_later_pages callback triggered")
         draw_pdf_header(canvas, doc, landscape_size)
-        print("[PDF] 🔵 on_later_pages callback complete")
+        logger.debug("[PDF] 🔵 on_later_pages callback complete")
     
     # Calculate top margin: HEADER_H (60pt) + 20pt padding = 80pt
     # This ensures body content starts BELOW the header and cannot cover it
     HEADER_H = 60  # Header height in points
     header_margin = (HEADER_H + 20) / 72.0 * inch  # Convert points to inches (72pt = 1 inch)
-    print(f"[PDF] Header margin: {header_margin} inches ({HEADER_H + 20} points)")
+    logger.debug("[PDF] Header margin: %s inches (%s points)", header_margin, HEADER_H + 20)
     
     doc = SimpleDocTemplate(
         pdf_buffer,
@@ -1485,16 +1771,15 @@ def build_pdf_report(
     # Left: OSU logo (or empty space)
     if osu_logo_path:
         try:
-            from PIL import Image as PILImage
             osu_img_pil = PILImage.open(osu_logo_path)
             osu_img_width, osu_img_height = osu_img_pil.size
             logo_height_pt = 40  # 40px height (strict requirement)
             logo_width_pt = logo_height_pt * (osu_img_width / osu_img_height) if osu_img_height > 0 else logo_height_pt
             osu_img = Image(str(osu_logo_path), width=logo_width_pt, height=logo_height_pt)
             header_cells.append(osu_img)
-            print(f"[PDF] ✓ Adding OSU logo to header from: {osu_logo_path}")
+            logger.debug("[PDF] ✓ Adding OSU logo to header from: %s", osu_logo_path)
         except Exception as e:
-            print(f"[PDF] Warning: Could not load OSU logo for header: {e}")
+            logger.warning("[PDF] Could not load OSU logo for header: %s", e)
             header_cells.append(Paragraph("", styles['Normal']))  # Empty cell
     else:
         header_cells.append(Paragraph("", styles['Normal']))  # Empty cell if logo not found
@@ -1515,16 +1800,15 @@ def build_pdf_report(
     # Right: VMRC logo (or empty space)
     if vmrc_logo_path:
         try:
-            from PIL import Image as PILImage
             vmrc_img_pil = PILImage.open(vmrc_logo_path)
             vmrc_img_width, vmrc_img_height = vmrc_img_pil.size
             logo_height_pt = 40  # 40px height (strict requirement)
             logo_width_pt = logo_height_pt * (vmrc_img_width / vmrc_img_height) if vmrc_img_height > 0 else logo_height_pt
             vmrc_img = Image(str(vmrc_logo_path), width=logo_width_pt, height=logo_height_pt)
             header_cells.append(vmrc_img)
-            print(f"[PDF] ✓ Adding VMRC logo to header from: {vmrc_logo_path}")
+            logger.debug("[PDF] ✓ Adding VMRC logo to header from: %s", vmrc_logo_path)
         except Exception as e:
-            print(f"[PDF] Warning: Could not load VMRC logo for header: {e}")
+            logger.warning("[PDF] Could not load VMRC logo for header: %s", e)
             header_cells.append(Paragraph("", styles['Normal']))  # Empty cell
     else:
         header_cells.append(Paragraph("", styles['Normal']))  # Empty cell if logo not found
@@ -1565,13 +1849,7 @@ def build_pdf_report(
     
     if info_data:
         info_table = Table(info_data, colWidths=[1.5*inch, 8*inch])
-        info_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-            ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ]))
+        info_table.setStyle(_info_table_style())
         story.append(info_table)
     
     story.append(Spacer(1, 0.2*inch))
@@ -1586,16 +1864,9 @@ def build_pdf_report(
     if png_bytes:
         try:
             # Get image dimensions using PIL to calculate aspect ratio
-            try:
-                from PIL import Image as PILImage
-                pil_img = PILImage.open(BytesIO(png_bytes))
+            with PILImage.open(BytesIO(png_bytes)) as pil_img:
                 img_width_px, img_height_px = pil_img.size
-                aspect_ratio = img_height_px / img_width_px if img_width_px > 0 else 1.0
-            except ImportError:
-                # Fallback: assume square if PIL not available
-                print("[PDF] Warning: PIL not available, using default aspect ratio")
-                img_width_px, img_height_px = 800, 800
-                aspect_ratio = 1.0
+            aspect_ratio = img_height_px / img_width_px if img_width_px > 0 else 1.0
             
             # Fit to landscape page width (9.5 inches max, with margins)
             max_width = 9.5 * inch
@@ -1614,19 +1885,12 @@ def build_pdf_report(
             
             # Wrap in table for centering and border
             img_table = Table([[img]], colWidths=[max_width])
-            img_table.setStyle(TableStyle([
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#d1d5db')),  # Light gray border
-                ('BACKGROUND', (0, 0), (-1, -1), colors.white),
-            ]))
+            img_table.setStyle(_framed_image_style())
             
             story.append(img_table)
-            print(f"[PDF] ✓ Embedded raster preview image ({img_width_px}x{img_height_px} px, {img_width:.2f}x{img_height:.2f} inches)")
+            logger.debug("[PDF] ✓ Embedded raster preview image (%sx%s px, %.2fx%.2f inches)", img_width_px, img_height_px, img_width, img_height)
         except Exception as img_err:
-            print(f"[PDF] ERROR: Failed to embed image: {img_err}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("[PDF] Failed to embed image: %s", img_err)
             story.append(Paragraph(f"Preview image unavailable: {str(img_err)}", styles['Normal']))
     else:
         story.append(Paragraph("Preview image unavailable (PNG generation failed)", styles['Normal']))
@@ -1753,25 +2017,7 @@ def build_pdf_report(
         ]
         
         threshold_table = Table(threshold_data, colWidths=[2.5*inch, 1.5*inch, 1.5*inch])
-        threshold_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2f3a4a')),  # Header background: #2f3a4a
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),  # Header text: white, bold
-            ('BACKGROUND', (0, 1), (0, -1), colors.HexColor('#f9fafb')),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.HexColor('#111827')),  # Data rows only (not header)
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),  # Numbers right-aligned
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),  # Header font weight 700 (bold)
-            ('FONTSIZE', (0, 0), (-1, 0), 12),  # Header font size
-            ('FONTSIZE', (0, 1), (-1, -1), 10),  # Data rows keep original size
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),  # Header padding: 8px vertical
-            ('TOPPADDING', (0, 0), (-1, 0), 8),
-            ('LEFTPADDING', (0, 0), (-1, 0), 10),  # Header padding: 10px horizontal
-            ('RIGHTPADDING', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 6),  # Data row padding
-            ('TOPPADDING', (0, 1), (-1, -1), 6),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e5e7eb')),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9fafb')]),
-        ]))
+        threshold_table.setStyle(_threshold_table_style())
         threshold_section.append(threshold_table)
         
         story.append(KeepTogether(threshold_section))
@@ -1793,38 +2039,21 @@ def build_pdf_report(
         ]
         
         range_table = Table(range_data, colWidths=[2*inch, 2*inch, 2*inch])
-        range_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2f3a4a')),  # Header background: #2f3a4a
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),  # Header text: white, bold
-            ('BACKGROUND', (0, 1), (0, -1), colors.HexColor('#f9fafb')),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.HexColor('#111827')),  # Data rows only (not header)
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),  # Header font weight 700 (bold)
-            ('FONTSIZE', (0, 0), (-1, 0), 12),  # Header font size
-            ('FONTSIZE', (0, 1), (-1, -1), 10),  # Data rows keep original size
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),  # Header padding: 8px vertical
-            ('TOPPADDING', (0, 0), (-1, 0), 8),
-            ('LEFTPADDING', (0, 0), (-1, 0), 10),  # Header padding: 10px horizontal
-            ('RIGHTPADDING', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 6),  # Data row padding
-            ('TOPPADDING', (0, 1), (-1, -1), 6),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e5e7eb')),
-        ]))
+        range_table.setStyle(_range_table_style())
         range_section.append(range_table)
         
         story.append(KeepTogether(range_section))
     
     # Build PDF
-    print("[PDF] 🔵 About to call doc.build(story) - header callbacks will execute during build")
+    logger.debug("[PDF] 🔵 About to call doc.build(story) - header callbacks will execute during build")
     doc.build(story)
-    print("[PDF] 🔵 doc.build(story) complete")
+    logger.debug("[PDF] 🔵 doc.build(story) complete")
     
     # Get PDF bytes
     pdf_bytes = pdf_buffer.getvalue()
     pdf_buffer.close()
     
-    print(f"[PDF] ✓ Generated PDF report ({len(pdf_bytes)} bytes)")
+    logger.debug("[PDF] ✓ Generated PDF report (%s bytes)", len(pdf_bytes))
     return pdf_bytes
 
 
@@ -1874,33 +2103,27 @@ def normalize_for_export(geojson: dict) -> dict:
             return polygon_features[0]
         
         # Multiple features: union them into one
-        print(f"[normalize_for_export] Found {len(polygon_features)} polygon features, unioning...")
+        logger.debug("[normalize_for_export] Found %s polygon features, unioning...", len(polygon_features))
         try:
-            # Convert to shapely geometries
-            shapely_geoms = []
-            for feat in polygon_features:
-                geom_dict = feat.get("geometry")
-                if geom_dict:
-                    geom = shape(geom_dict)
-                    if geom.is_valid:
-                        shapely_geoms.append(geom)
-                    else:
-                        print(f"[normalize_for_export] Invalid geometry, attempting to fix...")
-                        shapely_geoms.append(make_valid(geom))
+            # Convert to shapely geometries, then validate/fix in one vectorized pass
+            shapely_geoms = np.array([shape(feat["geometry"]) for feat in polygon_features], dtype=object)
+            invalid = ~shapely.is_valid(shapely_geoms)
+            if invalid.any():
+                logger.debug("[normalize_for_export] %d invalid geometries, attempting to fix...", int(invalid.sum()))
+                shapely_geoms[invalid] = shapely.make_valid(shapely_geoms[invalid])
             
-            if not shapely_geoms:
+            if shapely_geoms.size == 0:
                 raise ValueError("No valid polygon geometries found after validation")
             
-            # Union all geometries
+            # Union all geometries (a lone geometry is already valid after the pass above)
             if len(shapely_geoms) == 1:
                 unioned_geom = shapely_geoms[0]
             else:
                 unioned_geom = unary_union(shapely_geoms)
-            
-            # Ensure valid
-            if not unioned_geom.is_valid:
-                print(f"[normalize_for_export] Unioned geometry invalid, attempting to fix...")
-                unioned_geom = make_valid(unioned_geom)
+                # Ensure valid
+                if not unioned_geom.is_valid:
+                    logger.debug("[normalize_for_export] Unioned geometry invalid, attempting to fix...")
+                    unioned_geom = make_valid(unioned_geom)
             
             # Convert back to GeoJSON Feature
             return {
@@ -1945,46 +2168,42 @@ def build_report_metadata(
     bounds: Dict[str, float],
     pixel_values: List[float],
     export_id: str,
+    export_timestamp: Optional[str] = None,
+    stats_extras: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """Build comprehensive report metadata for embedding in exports."""
     
     # Calculate histogram bins
-    valid_pixels = np.array([v for v in pixel_values if np.isfinite(v)]) if pixel_values else np.array([])
-    bin_counts = np.zeros(10, dtype=int)
-    if len(valid_pixels) > 0:
-        for v in valid_pixels:
-            clamped = max(0, min(100, v))
-            idx = 9 if clamped == 100 else max(0, min(9, int(np.floor(clamped / 10))))
-            bin_counts[idx] += 1
-    
-    total_count = bin_counts.sum() or 1
+    pixel_array = np.asarray(pixel_values if pixel_values is not None else [], dtype=np.float64)
+    valid_pixels = pixel_array[np.isfinite(pixel_array)]
+    bin_counts = _compute_histogram_bins(valid_pixels)
+    
+    # Every valid pixel lands in exactly one (clamped) bin, so the total is the pixel count
+    total_count = int(valid_pixels.size) or 1
+    bin_percentages = (bin_counts / total_count) * 100.0
     histogram = {
         "bins": [
             {
                 "range": range_label,
                 "count": int(count),
-                "percentage": float((count / total_count) * 100) if total_count > 0 else 0.0
+                "percentage": float(percentage)
             }
-            for range_label, count in zip(
+            for range_label, count, percentage in zip(
                 get_histogram_bin_ranges(),
-                bin_counts
+                bin_counts,
+                bin_percentages
             )
         ]
     }
     
-    # Calculate percentiles
-    percentiles = {}
-    if len(valid_pixels) > 0:
-        sorted_pixels = np.sort(valid_pixels)
-        for p in [10, 25, 50, 75, 90]:
-            idx = max(0, min(len(sorted_pixels) - 1, int((p / 100) * (len(sorted_pixels) - 1))))
-            percentiles[f"p{p}"] = float(sorted_pixels[idx])
-    
-    # Calculate median
-    median = float(np.median(valid_pixels)) if len(valid_pixels) > 0 else None
+    # Calculate median and percentiles (reuse caller's values when provided)
+    if stats_extras is None:
+        stats_extras = _compute_stats_extras(valid_pixels)
+    percentiles = stats_extras["percentiles"]
+    median = stats_extras["median"]
     
     report = {
-        "export_date": datetime.now().isoformat(),
+        "export_date": export_timestamp or datetime.now().isoformat(),
         "export_id": export_id,
         "software": "VMRC Portal",
         "raster": {
@@ -2012,6 +2231,7 @@ def export_multi_aoi_pdf(req: ExportRequest):
     """
     if not HAS_REPORTLAB:
         raise HTTPException(status_code=400, detail="reportlab not installed. Install with: pip install reportlab")
+    _lazy_reportlab()
     
     if not req.overlay_urls or len(req.overlay_urls) == 0:
         raise HTTPException(status_code=400, detail="overlay_urls must be provided for multi-AOI export")
@@ -2038,23 +2258,25 @@ def export_multi_aoi_pdf(req: ExportRequest):
     # Header callbacks - apply header on every page
     def on_first_page_multi(canvas, doc):
         """Add header on first page."""
-        print("[PDF MULTI-AOI] 🔵 on_first_page callback triggered")
+        logger.debug("[PDF MULTI-AOI] 🔵 on_first_page callback triggered")
         draw_pdf_header(canvas, doc, letter_size)
-        print("[PDF MULTI-AOI] 🔵 on_first_page callback complete")
+        logger.debug("[PDF MULTI-AOI] 🔵 on_first_page callback complete")
     
     def on_later_pages_multi(canvas, doc):
         """Add header on subsequent pages."""
-        print("[PDF MULTI-AOI] 🔵 on_later_pages callback triggered")
+        logger.debug("[PDF MULTI-AOI] 🔵 on_later_pages callback triggered")
         draw_pdf_header(canvas, doc, letter_size)
-        print("[PDF MULTI-AOI] 🔵 on_later_pages callback complete")
+        logger.debug("[PDF MULTI-AOI] 🔵 on_later_pages callback complete")
     
     # Calculate top margin: HEADER_H (60pt) + 20pt padding = 80pt
     HEADER_H = 60  # Header height in points
     header_margin = (HEADER_H + 20) / 72.0 * inch  # Convert points to inches (72pt = 1 inch)
-    print(f"[PDF MULTI-AOI] Header margin: {header_margin} inches ({HEADER_H + 20} points)")
+    logger.debug("[PDF MULTI-AOI] Header margin: %s inches (%s points)", header_margin, HEADER_H + 20)
     
+    # Render into memory and write the file once (reportlab otherwise emits many small writes)
+    pdf_buffer = BytesIO()
     doc = SimpleDocTemplate(
-        str(pdf_path),
+        pdf_buffer,
         pagesize=letter_size,
         topMargin=header_margin,  # CRITICAL: Content starts BELOW header (HEADER_H + 20pt)
         bottomMargin=0.5*inch,
@@ -2071,7 +2293,7 @@ def export_multi_aoi_pdf(req: ExportRequest):
         raster_path = resolve_raster_path(req.raster_layer_id)
         raster_name = Path(raster_path).name
     except Exception as e:
-        print(f"Warning: Could not resolve raster path: {e}")
+        logger.warning("Could not resolve raster path: %s", e)
         raster_name = "unknown.tif"
     
     # Build dataset title from context
@@ -2129,16 +2351,7 @@ def export_multi_aoi_pdf(req: ExportRequest):
         story.append(Paragraph("<b>Raster Information</b>", styles['Heading2']))
         raster_table_data = [["Raster Name:", raster_name]]
         raster_table = Table(raster_table_data, colWidths=[2*inch, 4.5*inch])
-        raster_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f9fafb')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#111827')),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e5e7eb')),
-        ]))
+        raster_table.setStyle(_kv_table_style())
         story.append(raster_table)
         story.append(Spacer(1, 0.3*inch))
         
@@ -2153,16 +2366,7 @@ def export_multi_aoi_pdf(req: ExportRequest):
                 ["Std Dev:", f"{aoi_stats.get('std', 0):.2f}"],
             ]
             stats_table = Table(stats_data, colWidths=[2*inch, 4.5*inch])
-            stats_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f9fafb')),
-                ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#111827')),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                ('TOPPADDING', (0, 0), (-1, -1), 6),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e5e7eb')),
-            ]))
+            stats_table.setStyle(_kv_table_style())
             story.append(stats_table)
             story.append(Spacer(1, 0.3*inch))
         
@@ -2176,42 +2380,37 @@ def export_multi_aoi_pdf(req: ExportRequest):
                 overlay_path = Path("static/overlays") / overlay_filename
                 
                 if overlay_path.exists():
-                    print(f"[EXPORT] Using local overlay file: {overlay_path}")
+                    logger.debug("[EXPORT] Using local overlay file: %s", overlay_path)
                     try:
-                        img = Image(str(overlay_path), width=6.5*inch, height=6.5*inch, kind='proportional')
+                        img = Image(load_preview_image(overlay_path), width=6.5*inch, height=6.5*inch, kind='proportional')
                         img_table = Table([[img]], colWidths=[6.5*inch])
-                        img_table.setStyle(TableStyle([
-                            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#d1d5db')),
-                            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                        ]))
+                        img_table.setStyle(_image_grid_style())
                         story.append(img_table)
-                        print(f"[EXPORT] ✓ Preview image embedded for AOI: {aoi_name}")
+                        logger.debug("[EXPORT] ✓ Preview image embedded for AOI: %s", aoi_name)
                     except Exception as local_err:
-                        print(f"[EXPORT] Warning: Failed to load local image: {local_err}")
+                        logger.warning("[EXPORT] Failed to load local image: %s", local_err)
                         story.append(Paragraph("Preview unavailable", styles['Normal']))
                 else:
-                    data_url = fetch_image_as_base64(overlay_url)
-                    if data_url:
-                        img = Image(data_url, width=6.5*inch, height=6.5*inch, kind='proportional')
+                    image_bytes = fetch_image_bytes(overlay_url)
+                    if image_bytes:
+                        img = Image(load_preview_image(BytesIO(image_bytes)), width=6.5*inch, height=6.5*inch, kind='proportional')
                         img_table = Table([[img]], colWidths=[6.5*inch])
-                        img_table.setStyle(TableStyle([
-                            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#d1d5db')),
-                            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                        ]))
+                        img_table.setStyle(_image_grid_style())
                         story.append(img_table)
-                        print(f"[EXPORT] ✓ Preview image embedded from URL for AOI: {aoi_name}")
+                        logger.debug("[EXPORT] ✓ Preview image embedded from URL for AOI: %s", aoi_name)
                     else:
                         story.append(Paragraph("Preview unavailable", styles['Normal']))
             else:
                 story.append(Paragraph("Preview unavailable", styles['Normal']))
         except Exception as img_err:
-            print(f"[EXPORT] Warning: Could not embed preview image for AOI {aoi_name}: {img_err}")
+            logger.warning("[EXPORT] Could not embed preview image for AOI %s: %s", aoi_name, img_err)
             story.append(Paragraph("Preview unavailable", styles['Normal']))
     
     # Build PDF
-    print(f"[EXPORT] Building multi-AOI PDF document...")
+    logger.debug("[EXPORT] Building multi-AOI PDF document...")
     doc.build(story)
-    print(f"[EXPORT] ✓ Multi-AOI PDF exported successfully: {pdf_path}")
+    pdf_path.write_bytes(pdf_buffer.getvalue())
+    logger.info("[EXPORT] ✓ Multi-AOI PDF exported successfully: %s", pdf_path)
     
     return {
         "status": "success",
@@ -2247,7 +2446,7 @@ def export_raster(req: ExportRequest):
     clip_result = None
     if req.overlay_url:
         # Use existing PNG overlay - get stats from context if available
-        print(f"[EXPORT] Using provided overlay_url: {req.overlay_url}")
+        logger.debug("[EXPORT] Using provided overlay_url: %s", req.overlay_url)
         # Get stats, histogram, and bounds from context if provided (frontend should pass stats from createdRasters)
         stats_from_context = {}
         histogram_from_context = None
@@ -2270,8 +2469,8 @@ def export_raster(req: ExportRequest):
             "bounds": bounds_from_context,
             "pixels": pixel_values_from_context,
         }
-        print(f"[EXPORT] Using stats from context: {stats_from_context}")
-        print(f"[EXPORT] Using histogram from context: {histogram_from_context is not None}")
+        logger.debug("[EXPORT] Using stats from context: %s", stats_from_context)
+        logger.debug("[EXPORT] Using histogram from context: %s", histogram_from_context is not None)
     else:
         # Perform clip (same as map overlay process)
         try:
@@ -2280,12 +2479,13 @@ def export_raster(req: ExportRequest):
                 user_clip_geojson=req.user_clip_geojson,
             )
         except Exception as e:
-            import traceback
-            traceback.print_exc()
+            logger.exception("[EXPORT] Clip failed")
             raise HTTPException(status_code=400, detail=f"Clip failed: {str(e)}")
 
     # Prepare output directory
     export_id = uuid.uuid4().hex[:8]
+    # Single timestamp shared by every output of this export
+    export_timestamp = datetime.now().isoformat()
     # Build base filename from context filters (with HSL/WH rules)
     if req.filename:
         base_filename = sanitize_filename(req.filename)
@@ -2307,19 +2507,26 @@ def export_raster(req: ExportRequest):
         raster_path = resolve_raster_path(req.raster_layer_id)
         raster_name = Path(raster_path).name
     except Exception as e:
-        print(f"Warning: Could not resolve raster path: {e}")
+        logger.warning("Could not resolve raster path: %s", e)
         raster_path = None
         raster_name = "unknown.tif"
     
     # Get stats and pixel values from clip result
     stats = clip_result.get("stats", {})
-    pixel_values = clip_result.get("pixels", []) or clip_result.get("values", [])
+    pixel_values = clip_result.get("pixels")
+    if pixel_values is None or len(pixel_values) == 0:
+        pixel_values = clip_result.get("values", [])
     bounds = clip_result.get("bounds", {})
     
     # Convert pixel values to numpy array for processing
-    # clip_result.pixels should already be valid pixels (nodata filtered)
-    pixel_array = np.array(pixel_values) if pixel_values else np.array([])
-    valid_pixels = pixel_array[np.isfinite(pixel_array)] if len(pixel_array) > 0 else np.array([])
+    # clip_result.pixels should already be valid pixels (nodata filtered).
+    # np.asarray is a no-op when the producer already returned a float ndarray.
+    pixel_array = np.asarray(pixel_values if pixel_values is not None else [], dtype=np.float64)
+    valid_pixels = pixel_array[np.isfinite(pixel_array)]
+    # Histogram bin counts, computed once and shared by the CSV and PDF outputs
+    valid_bin_counts = _compute_histogram_bins(valid_pixels)
+    # Median/percentiles, computed once and shared by the report, CSV and PDF outputs
+    stats_extras = _compute_stats_extras(valid_pixels)
     
     # Build report metadata for embedding
     report_metadata = build_report_metadata(
@@ -2328,14 +2535,16 @@ def export_raster(req: ExportRequest):
         context=req.context,
         stats=stats,
         bounds=bounds,
-        pixel_values=pixel_values,
+        pixel_values=valid_pixels,
         export_id=export_id,
+        export_timestamp=export_timestamp,
+        stats_extras=stats_extras,
     )
 
     # --------------------------------
     # EXPORT PNG (with metadata embedding)
     # --------------------------------
-    if "png" in req.formats:
+    def _export_png() -> None:
         try:
             # Use the overlay URL from clip result
             overlay_url = clip_result.get("overlay_url")
@@ -2358,7 +2567,7 @@ def export_raster(req: ExportRequest):
                     pnginfo = PngImagePlugin.PngInfo()
                     
                     # Add report as JSON in text chunk
-                    report_json = json.dumps(report_metadata, indent=2)
+                    report_json = dumps_report_json(report_metadata)
                     pnginfo.add_text("VMRC_Report", report_json)
                     
                     # Add individual fields as text chunks for easy reading
@@ -2368,7 +2577,7 @@ def export_raster(req: ExportRequest):
                     pnginfo.add_text("VMRC_MapType", str(context.get("mapType", "")))
                     pnginfo.add_text("VMRC_Species", str(context.get("species", "")))
                     pnginfo.add_text("VMRC_ExportID", export_id)
-                    pnginfo.add_text("VMRC_CreatedAt", datetime.now().isoformat())
+                    pnginfo.add_text("VMRC_CreatedAt", export_timestamp)
                     
                     # Save with metadata
                     img.save(png_path, "PNG", pnginfo=pnginfo)
@@ -2380,110 +2589,67 @@ def export_raster(req: ExportRequest):
             else:
                 errors["png"] = "PNG overlay not available"
         except Exception as e:
-            import traceback
-            traceback.print_exc()
+            logger.exception("[EXPORT] PNG export failed")
             errors["png"] = str(e)
 
     # --------------------------------
     # EXPORT GeoTIFF
     # --------------------------------
-    if "tif" in req.formats:
+    def _export_tif() -> None:
         try:
-            print(f"[EXPORT] Generating GeoTIFF export...")
+            logger.debug("[EXPORT] Generating GeoTIFF export...")
             if not raster_path:
                 errors["tif"] = "Raster path not available"
-                print(f"[EXPORT] GeoTIFF error: Raster path not available")
+                logger.debug("[EXPORT] GeoTIFF error: Raster path not available")
             else:
                 tif_name = f"{base_filename}.tif"
                 tif_path = out_dir / tif_name
-                print(f"[EXPORT] GeoTIFF output path: {tif_path}")
+                logger.debug("[EXPORT] GeoTIFF output path: %s", tif_path)
 
-                # Normalize GeoJSON to single Feature before parsing geometry
+                # Geometry was normalized (and made valid) once when the request was parsed
                 try:
-                    export_feature = normalize_for_export(req.user_clip_geojson)
-                    geom_dict = export_feature.get("geometry")
-                    if not geom_dict:
-                        raise ValueError("Normalized feature has no geometry")
-                    user_geom_4326 = shape(geom_dict)
-                except Exception as norm_err:
-                    print(f"[EXPORT] GeoTIFF: Failed to normalize GeoJSON: {norm_err}")
+                    user_geom_4326 = req.get_export_geom()
+                except ValueError as norm_err:
+                    logger.debug("[EXPORT] GeoTIFF: Failed to normalize GeoJSON: %s", norm_err)
                     raise ValueError(f"Cannot parse geometry from GeoJSON: {norm_err}")
                 
-                # Ensure geometry is valid
-                if not user_geom_4326.is_valid:
-                    print(f"[EXPORT] Geometry invalid, attempting to fix...")
-                    user_geom_4326 = make_valid(user_geom_4326)
-                
-                print(f"[EXPORT] Opening raster: {raster_path}")
-                with rasterio.open(raster_path) as src:
+                logger.debug("[EXPORT] Opening raster: %s", raster_path)
+                # One GDAL environment for the whole read/write/retag sequence: a large block
+                # cache avoids re-reading compressed blocks, and skipping the free-space check
+                # saves a statfs per open.
+                with rasterio.Env(
+                    GDAL_CACHEMAX=1024,
+                    GDAL_NUM_THREADS="ALL_CPUS",
+                    GDAL_TIFF_INTERNAL_MASK="YES",
+                    CHECK_DISK_FREE_SPACE="NO",
+                ), rasterio.open(raster_path) as src:
                     # Log source raster properties
-                    print(f"[EXPORT] ========== SOURCE RASTER PROPERTIES ==========")
-                    print(f"[EXPORT] Source CRS: {src.crs}")
-                    print(f"[EXPORT] Source transform: {src.transform}")
-                    print(f"[EXPORT] Source width: {src.width}, height: {src.height}")
-                    print(f"[EXPORT] Source dtype: {src.dtypes[0]}")
-                    print(f"[EXPORT] Source nodata: {src.nodata}")
-                    print(f"[EXPORT] Source bounds: {src.bounds}")
-                    print(f"[EXPORT] ==============================================")
+                    logger.debug("[EXPORT] ========== SOURCE RASTER PROPERTIES ==========")
+                    logger.debug("[EXPORT] Source CRS: %s", src.crs)
+                    logger.debug("[EXPORT] Source transform: %s", src.transform)
+                    logger.debug("[EXPORT] Source width: %s, height: %s", src.width, src.height)
+                    logger.debug("[EXPORT] Source dtype: %s", src.dtypes[0])
+                    logger.debug("[EXPORT] Source nodata: %s", src.nodata)
+                    logger.debug("[EXPORT] Source bounds: %s", src.bounds)
+                    logger.debug("[EXPORT] ==============================================")
                     
                     raster_crs = src.crs
                     
-                    # Reproject geometry to raster CRS
-                    print(f"[EXPORT] Reprojecting geometry from EPSG:4326 to {raster_crs}")
-                    aoi_geom_src = mapping(user_geom_4326)  # Convert shapely to GeoJSON dict
-                    aoi_geom_raster_crs = transform_geom(
-                        "EPSG:4326",
-                        raster_crs.to_string() if hasattr(raster_crs, 'to_string') else str(raster_crs),
-                        aoi_geom_src,
-                        precision=6
-                    )
-                    
-                    # Convert back to shapely for bounds calculation
-                    aoi_geom_shapely = shape(aoi_geom_raster_crs)
+                    # Reproject geometry to raster CRS: all vertices in one vectorized pyproj call.
+                    # CRS objects compare directly, so a WGS84 raster skips the transform entirely.
+                    if raster_crs and raster_crs != WGS84:
+                        logger.debug("[EXPORT] Reprojecting geometry from EPSG:4326 to %s", raster_crs)
+                        transformer = _get_transformer("EPSG:4326", raster_crs.to_string())
+                        aoi_geom_shapely = shapely.transform(
+                            user_geom_4326,
+                            lambda xy: np.column_stack(transformer.transform(xy[:, 0], xy[:, 1]))
+                        )
+                    else:
+                        aoi_geom_shapely = user_geom_4326
                     
                     # Get bounds of reprojected geometry
                     aoi_bounds = aoi_geom_shapely.bounds  # (minx, miny, maxx, maxy)
-                    print(f"[EXPORT] AOI bounds in raster CRS: {aoi_bounds}")
-                    
-                    # ============================================================
-                    # COMPUTE PIXEL-ALIGNED WINDOW
-                    # ============================================================
-                    # This ensures the output aligns with the source grid
-                    # No resampling, no warping - just a true clip of source pixels
-                    print(f"[EXPORT] Computing pixel-aligned window...")
-                    win = from_bounds(
-                        aoi_bounds[0],  # minx (west)
-                        aoi_bounds[1],  # miny (south)
-                        aoi_bounds[2],  # maxx (east)
-                        aoi_bounds[3],  # maxy (north)
-                        src.transform
-                    )
-                    
-                    # Round window to pixel boundaries (align to source grid)
-                    win = win.round_offsets().round_lengths()
-                    print(f"[EXPORT] Pixel-aligned window: {win}")
-                    print(f"[EXPORT] Window row_off: {win.row_off}, col_off: {win.col_off}")
-                    print(f"[EXPORT] Window height: {win.height}, width: {win.width}")
-                    
-                    # Ensure window is within source bounds
-                    # Clamp window offsets and sizes to source dimensions
-                    row_off = max(0, int(win.row_off))
-                    col_off = max(0, int(win.col_off))
-                    row_end = min(src.height, row_off + int(win.height))
-                    col_end = min(src.width, col_off + int(win.width))
-                    
-                    # Recreate window with clamped bounds
-                    win = Window(col_off=col_off, row_off=row_off, width=col_end - col_off, height=row_end - row_off)
-                    print(f"[EXPORT] Clamped window: row_off={row_off}, col_off={col_off}, height={win.height}, width={win.width}")
-                    
-                    # Read raw band data from window (no resampling, no warping)
-                    print(f"[EXPORT] Reading raw data from window...")
-                    windowed_data = src.read(window=win)
-                    print(f"[EXPORT] Windowed data shape: {windowed_data.shape}")
-                    
-                    # Get transform for the window (aligned to source grid)
-                    out_transform = src.window_transform(win)
-                    print(f"[EXPORT] Output transform: {out_transform}")
+                    logger.debug("[EXPORT] AOI bounds in raster CRS: %s", aoi_bounds)
                     
                     # Determine nodata value: use source nodata if available
                     nodata_value = src.nodata
@@ -2498,58 +2664,56 @@ def export_raster(req: ExportRequest):
                                 nodata_value = -9999
                         else:
                             nodata_value = -9999
-                        print(f"[EXPORT] Source has no nodata, using {nodata_value} as nodata value")
+                        logger.debug("[EXPORT] Source has no nodata, using %s as nodata value", nodata_value)
                     
-                    # Create mask for the windowed data
-                    # geometry_mask with invert=False returns True for pixels OUTSIDE the geometry
-                    # We want to mask (set to nodata) pixels outside the geometry
-                    print(f"[EXPORT] Creating geometry mask for windowed data...")
-                    mask_array = geometry_mask(
-                        [aoi_geom_raster_crs],
-                        out_shape=(win.height, win.width),
-                        transform=out_transform,
-                        invert=False,  # False = True for pixels OUTSIDE geometry (should be masked)
-                        all_touched=True  # Include any pixel touched by boundary
-                    )
-                    
-                    # Apply mask: set pixels outside geometry to nodata
-                    # mask_array is True for pixels OUTSIDE the geometry
-                    for band_idx in range(windowed_data.shape[0]):
-                        windowed_data[band_idx][mask_array] = nodata_value
-                    
-                    print(f"[EXPORT] Mask applied. Final data shape: {windowed_data.shape}")
+                    # Single pixel-aligned read + polygon mask (no resampling, no warping)
+                    clipped, out_transform, win = _clip_and_extract(src, aoi_geom_shapely, aoi_bounds)
+                    windowed_data = clipped.filled(nodata_value)
+                    logger.debug("[EXPORT] Mask applied. Final data shape: %s", windowed_data.shape)
                     
                     # ============================================================
                     # BUILD OUTPUT METADATA (preserve source properties)
                     # ============================================================
                     meta = src.profile.copy()  # Start with source profile
+                    # ZSTD + predictor: faster to write/read and smaller than LZW on continuous data.
+                    # Horizontal differencing (2) for integers, floating-point predictor (3) for floats.
+                    predictor = 3 if np.issubdtype(src.dtypes[0], np.floating) else 2
                     meta.update({
                         "height": win.height,
                         "width": win.width,
                         "transform": out_transform,
                         "driver": "GTiff",
-                        "compress": "lzw",
+                        "compress": "zstd",
+                        "zstd_level": 1,
+                        "predictor": predictor,
+                        "tiled": True,
+                        "blockxsize": 512,
+                        "blockysize": 512,
+                        "bigtiff": "IF_SAFER",
+                        "num_threads": "ALL_CPUS",  # parallel per-tile compression
                         "nodata": nodata_value,
                     })
                     
                     # Log output properties for comparison
-                    print(f"[EXPORT] ========== OUTPUT RASTER PROPERTIES ==========")
-                    print(f"[EXPORT] Output CRS: {meta['crs']}")
-                    print(f"[EXPORT] Output transform: {meta['transform']}")
-                    print(f"[EXPORT] Output width: {meta['width']}, height: {meta['height']}")
-                    print(f"[EXPORT] Output dtype: {meta['dtype']}")
-                    print(f"[EXPORT] Output nodata: {meta['nodata']}")
-                    print(f"[EXPORT] ==============================================")
+                    logger.debug("[EXPORT] ========== OUTPUT RASTER PROPERTIES ==========")
+                    logger.debug("[EXPORT] Output CRS: %s", meta['crs'])
+                    logger.debug("[EXPORT] Output transform: %s", meta['transform'])
+                    logger.debug("[EXPORT] Output width: %s, height: %s", meta['width'], meta['height'])
+                    logger.debug("[EXPORT] Output dtype: %s", meta['dtype'])
+                    logger.debug("[EXPORT] Output nodata: %s", meta['nodata'])
+                    logger.debug("[EXPORT] ==============================================")
                     
                     # Build tags for metadata embedding
                     tags = {}
                     
                     # ImageDescription: compact JSON report
-                    report_json_compact = json.dumps(report_metadata, separators=(',', ':'))
-                    # Truncate if too long (TIFF tag has size limit)
+                    report_json_compact = dumps_report_json_bytes(report_metadata, indent=False)
+                    # Truncate if too long (TIFF tag has size limit). The cap is on encoded bytes;
+                    # errors="ignore" drops a multibyte character split by the cut.
                     if len(report_json_compact) > 65000:
-                        report_json_compact = report_json_compact[:65000] + "..."
-                    tags["TIFFTAG_IMAGEDESCRIPTION"] = report_json_compact
+                        tags["TIFFTAG_IMAGEDESCRIPTION"] = report_json_compact[:65000].decode("utf-8", errors="ignore") + "..."
+                    else:
+                        tags["TIFFTAG_IMAGEDESCRIPTION"] = report_json_compact.decode("utf-8")
                     
                     # Custom VMRC tags
                     context = req.context or {}
@@ -2562,10 +2726,10 @@ def export_raster(req: ExportRequest):
                     tags["vmrc:month"] = str(context.get("month", ""))
                     tags["vmrc:stress_level"] = str(context.get("stressLevel", ""))
                     tags["vmrc:export_id"] = export_id
-                    tags["vmrc:created_at"] = datetime.now().isoformat()
+                    tags["vmrc:created_at"] = export_timestamp
                     tags["vmrc:software"] = "VMRC Portal"
                     
-                    print(f"[EXPORT] Writing GeoTIFF to {tif_path}...")
+                    logger.debug("[EXPORT] Writing GeoTIFF to %s...", tif_path)
                     with rasterio.open(tif_path, "w", **meta) as dst:
                         dst.write(windowed_data)
                         # Write tags
@@ -2573,15 +2737,42 @@ def export_raster(req: ExportRequest):
                     
                     # Write ArcGIS-readable metadata after file is created
                     context = req.context or {}
-                    arcgis_metadata = build_arcgis_metadata(context, raster_name)
+                    arcgis_metadata = build_arcgis_metadata(context, raster_name, export_timestamp)
                     
                     # Write embedded TIFF tags
                     write_arcgis_metadata(tif_path, arcgis_metadata)
                     
+                    # Rewrite as a Cloud-Optimized GeoTIFF with internal overviews. Done after the
+                    # r+ retag so the COG layout is not broken by a later in-place update.
+                    if HAS_RIO_COGEO:
+                        cog_path = tif_path.with_suffix(".cog.tif")
+                        # The stock zstd profile has no predictor/level; keep the ones the
+                        # plain GeoTIFF was written with, and compress tiles on all cores.
+                        # Copied: the registry's profile object is shared across requests.
+                        cog_profile = dict(cog_profiles.get("zstd"))
+                        cog_profile.update(predictor=predictor, zstd_level=1)
+                        try:
+                            cog_translate(
+                                str(tif_path),
+                                str(cog_path),
+                                cog_profile,
+                                nodata=nodata_value,
+                                overview_level=5,
+                                overview_resampling="average",
+                                in_memory=True,
+                                config={"GDAL_NUM_THREADS": "ALL_CPUS"},
+                                quiet=True,
+                            )
+                            cog_path.replace(tif_path)
+                            logger.debug("[EXPORT] GeoTIFF converted to COG with internal overviews")
+                        except Exception as cog_err:
+                            logger.warning("[EXPORT] COG conversion failed, keeping plain GeoTIFF: %s", cog_err)
+                            cog_path.unlink(missing_ok=True)
+                    
                     # Write sidecar XML file for ArcGIS (<name>.tif.xml)
                     xml_path_result = write_arcgis_tif_xml(tif_path, arcgis_metadata)
                     
-                    print(f"[EXPORT] ✓ GeoTIFF exported successfully: {tif_path}")
+                    logger.info("[EXPORT] ✓ GeoTIFF exported successfully: %s", tif_path)
                     
                     # Create ZIP file containing .tif and .tif.xml (and any .aux.xml)
                     zip_name = f"{base_filename}.zip"
@@ -2590,11 +2781,11 @@ def export_raster(req: ExportRequest):
                     if create_tif_zip(tif_path, zip_path):
                         # Return ZIP file instead of individual .tif file
                         output_files["tif"] = f"/static/exports/{export_id}/{zip_name}"
-                        print(f"[EXPORT] ✓ ZIP archive created: {zip_name}")
+                        logger.debug("[EXPORT] ✓ ZIP archive created: %s", zip_name)
                     else:
                         # Fallback: return individual .tif file if ZIP creation failed
                         output_files["tif"] = f"/static/exports/{export_id}/{tif_name}"
-                        print(f"[EXPORT] WARNING: ZIP creation failed, returning individual .tif file")
+                        logger.warning("[EXPORT] ZIP creation failed, returning individual .tif file")
                     
                     # Include XML metadata path in response for debugging (even though it's in the ZIP)
                     if xml_path_result:
@@ -2604,117 +2795,101 @@ def export_raster(req: ExportRequest):
                             # Get just the filename (e.g., "55.tif.xml")
                             xml_filename = xml_path_obj.name
                             output_files["tif_xml"] = f"/static/exports/{export_id}/{xml_filename}"
-                            print(f"[EXPORT] XML metadata path in response: {output_files['tif_xml']}")
+                            logger.debug("[EXPORT] XML metadata path in response: %s", output_files['tif_xml'])
                         except Exception as rel_err:
-                            print(f"[EXPORT] Warning: Could not compute relative XML path: {rel_err}")
+                            logger.warning("[EXPORT] Could not compute relative XML path: %s", rel_err)
                             # Fallback: use the full path as-is
                             output_files["tif_xml"] = xml_path_result
                     else:
-                        print(f"[EXPORT] WARNING: XML metadata file was not created")
+                        logger.warning("[EXPORT] XML metadata file was not created")
         except Exception as e:
-            import traceback
             error_msg = f"GeoTIFF export failed: {str(e)}"
-            print(f"[EXPORT] ERROR: {error_msg}")
-            traceback.print_exc()
+            logger.exception("[EXPORT] %s", error_msg)
             errors["tif"] = error_msg
 
     # --------------------------------
     # EXPORT CSV (Histogram bins + stats)
     # --------------------------------
-    if "csv" in req.formats:
+    def _export_csv() -> None:
         try:
             csv_name = f"{base_filename}.csv"
             csv_path = out_dir / csv_name
             
-            with open(csv_path, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                
-                # Write report metadata as comment header
-                writer.writerow(["# VMRC Export Report"])
-                writer.writerow([f"# Export Date: {report_metadata['export_date']}"])
-                writer.writerow([f"# Export ID: {export_id}"])
-                writer.writerow([f"# Software: {report_metadata['software']}"])
-                writer.writerow([f"# Raster: {raster_name}"])
-                if raster_path:
-                    writer.writerow([f"# Raster Path: {raster_path}"])
-                
-                context = req.context or {}
-                if context:
-                    writer.writerow(["# Filter Selections:"])
-                    if context.get("mapType"):
-                        writer.writerow([f"#   Map Type: {expand_map_type(context.get('mapType'))}"])
-                    if context.get("species"):
-                        writer.writerow([f"#   Species: {context.get('species')}"])
-                    if context.get("condition"):
-                        writer.writerow([f"#   Condition: {expand_condition(context.get('condition'))}"])
-                    if context.get("month"):
-                        writer.writerow([f"#   Month: {context.get('month')}"])
-                    if context.get("coverPercent"):
-                        writer.writerow([f"#   Cover %: {context.get('coverPercent')}"])
-                    if context.get("stressLevel"):
-                        writer.writerow([f"#   Stress Level: {context.get('stressLevel')}"])
-                    if context.get("hslClass"):
-                        writer.writerow([f"#   HSL Class: {context.get('hslClass')}"])
-                
-                writer.writerow([])
-                
-                # Write stats summary
-                writer.writerow(["Statistics Summary"])
-                writer.writerow(["Metric", "Value"])
-                writer.writerow(["Count", stats.get("count", len(valid_pixels))])
-                writer.writerow(["Min", f"{stats.get('min', 0):.2f}"])
-                writer.writerow(["Max", f"{stats.get('max', 0):.2f}"])
-                writer.writerow(["Mean", f"{stats.get('mean', 0):.2f}"])
-                writer.writerow(["Std Dev", f"{stats.get('std', 0):.2f}"])
-                
-                # Calculate median if not in stats
-                if len(valid_pixels) > 0:
-                    median = float(np.median(valid_pixels))
-                    writer.writerow(["Median", f"{median:.2f}"])
-                else:
-                    writer.writerow(["Median", "N/A"])
-                writer.writerow([])
-                
-                # Write histogram bins
-                writer.writerow(["Histogram Bins"])
-                writer.writerow(["Range", "Count", "Percentage"])
-                
-                bin_counts = np.zeros(10, dtype=int)
-                if len(valid_pixels) > 0:
-                    for v in valid_pixels:
-                        clamped = max(0, min(100, v))
-                        idx = 9 if clamped == 100 else max(0, min(9, int(np.floor(clamped / 10))))
-                        bin_counts[idx] += 1
-                
-                total_count = bin_counts.sum() or 1
-                bin_ranges = get_histogram_bin_ranges()
-                
-                for i, (range_label, count) in enumerate(zip(bin_ranges, bin_counts)):
-                    percentage = (count / total_count) * 100 if total_count > 0 else 0
-                    writer.writerow([range_label, count, f"{percentage:.2f}%"])
+            # Build every row up front, then emit them with a single writerows call
+            # Report metadata as comment header
+            rows = [
+                ["# VMRC Export Report"],
+                [f"# Export Date: {report_metadata['export_date']}"],
+                [f"# Export ID: {export_id}"],
+                [f"# Software: {report_metadata['software']}"],
+                [f"# Raster: {raster_name}"],
+            ]
+            if raster_path:
+                rows.append([f"# Raster Path: {raster_path}"])
+            
+            context = req.context or {}
+            if context:
+                rows.append(["# Filter Selections:"])
+                if context.get("mapType"):
+                    rows.append([f"#   Map Type: {expand_map_type(context.get('mapType'))}"])
+                if context.get("species"):
+                    rows.append([f"#   Species: {context.get('species')}"])
+                if context.get("condition"):
+                    rows.append([f"#   Condition: {expand_condition(context.get('condition'))}"])
+                if context.get("month"):
+                    rows.append([f"#   Month: {context.get('month')}"])
+                if context.get("coverPercent"):
+                    rows.append([f"#   Cover %: {context.get('coverPercent')}"])
+                if context.get("stressLevel"):
+                    rows.append([f"#   Stress Level: {context.get('stressLevel')}"])
+                if context.get("hslClass"):
+                    rows.append([f"#   HSL Class: {context.get('hslClass')}"])
+            
+            # Stats summary
+            median = stats_extras["median"]
+            rows += [
+                [],
+                ["Statistics Summary"],
+                ["Metric", "Value"],
+                ["Count", stats.get("count", len(valid_pixels))],
+                ["Min", f"{stats.get('min', 0):.2f}"],
+                ["Max", f"{stats.get('max', 0):.2f}"],
+                ["Mean", f"{stats.get('mean', 0):.2f}"],
+                ["Std Dev", f"{stats.get('std', 0):.2f}"],
+                ["Median", f"{median:.2f}" if median is not None else "N/A"],
+                [],
+            ]
+            
+            # Histogram bins (counts shared with the report; percentages in one vectorized step)
+            total_count = valid_bin_counts.sum() or 1
+            bin_percentages = valid_bin_counts / total_count * 100
+            rows += [["Histogram Bins"], ["Range", "Count", "Percentage"]]
+            rows += [
+                [range_label, count, f"{percentage:.2f}%"]
+                for range_label, count, percentage in zip(get_histogram_bin_ranges(), valid_bin_counts, bin_percentages)
+            ]
+            
+            with open(csv_path, "w", newline="", encoding="utf-8", buffering=1 << 20) as f:
+                csv.writer(f).writerows(rows)
             
             output_files["csv"] = f"/static/exports/{export_id}/{csv_name}"
         except Exception as e:
-            import traceback
-            traceback.print_exc()
+            logger.exception("[EXPORT] CSV export failed")
             errors["csv"] = str(e)
 
     # --------------------------------
     # EXPORT GeoJSON (AOI geometry)
     # --------------------------------
-    if "geojson" in req.formats:
+    def _export_geojson() -> None:
         try:
             geojson_name = f"{base_filename}_aoi.geojson"
             geojson_path = out_dir / geojson_name
             
             # Normalize GeoJSON to single Feature for GeoJSON export
             try:
-                export_feature = normalize_for_export(req.user_clip_geojson)
-                geometry = export_feature.get("geometry")
-                if not geometry:
-                    raise ValueError("Normalized feature has no geometry")
-            except Exception as norm_err:
-                print(f"[EXPORT] GeoJSON: Failed to normalize GeoJSON: {norm_err}")
+                geometry = req.get_export_feature()["geometry"]
+            except ValueError as norm_err:
+                logger.debug("[EXPORT] GeoJSON: Failed to normalize GeoJSON: %s", norm_err)
                 # Fallback: try to extract geometry directly
                 if req.user_clip_geojson.get("type") == "Feature":
                     geometry = req.user_clip_geojson.get("geometry", req.user_clip_geojson)
@@ -2732,38 +2907,37 @@ def export_raster(req: ExportRequest):
                         "geometry": geometry,
                         "properties": {
                             "name": "User AOI",
-                            "export_date": datetime.now().isoformat(),
+                            "export_date": export_timestamp,
                             "vmrc_report": report_metadata,  # Full report embedded
                         }
                     }
                 ]
             }
             
-            with open(geojson_path, "w", encoding="utf-8") as f:
-                json.dump(feature_collection, f, indent=2)
+            geojson_path.write_bytes(dumps_report_json_bytes(feature_collection))
             
             output_files["geojson"] = f"/static/exports/{export_id}/{geojson_name}"
         except Exception as e:
-            import traceback
-            traceback.print_exc()
+            logger.exception("[EXPORT] GeoJSON export failed")
             errors["geojson"] = str(e)
 
     # --------------------------------
     # EXPORT JSON (metadata)
     # --------------------------------
-    if "json" in req.formats:
+    def _export_json() -> None:
         try:
             json_name = f"{base_filename}_metadata.json"
             json_path = out_dir / json_name
             
             # JSON export IS the report metadata (already built)
+            # Copy the nested sections we modify: report_metadata is shared with the other exporters
             metadata = report_metadata.copy()
-            metadata["raster"]["layer_id"] = req.raster_layer_id
+            metadata["raster"] = {**report_metadata["raster"], "layer_id": req.raster_layer_id}
+            metadata["aoi"] = dict(report_metadata["aoi"])
             # Parse geometry type from normalized feature
             try:
-                export_feature = normalize_for_export(req.user_clip_geojson)
-                geom_type = export_feature.get("geometry", {}).get("type", "Unknown")
-            except Exception:
+                geom_type = req.get_export_feature()["geometry"].get("type", "Unknown")
+            except ValueError:
                 # Fallback: try to get type from original
                 if "geometry" in req.user_clip_geojson:
                     geom_type = req.user_clip_geojson["geometry"].get("type", "Unknown")
@@ -2771,26 +2945,24 @@ def export_raster(req: ExportRequest):
                     geom_type = req.user_clip_geojson.get("type", "Unknown")
             metadata["aoi"]["geometry_type"] = geom_type
             
-            with open(json_path, "w", encoding="utf-8") as f:
-                json.dump(metadata, f, indent=2)
+            json_path.write_bytes(dumps_report_json_bytes(metadata))
             
             output_files["json"] = f"/static/exports/{export_id}/{json_name}"
         except Exception as e:
-            import traceback
-            traceback.print_exc()
+            logger.exception("[EXPORT] JSON export failed")
             errors["json"] = str(e)
 
     # --------------------------------
     # EXPORT PDF (Report)
     # --------------------------------
-    if "pdf" in req.formats:
+    def _export_pdf() -> None:
         if not HAS_REPORTLAB:
             error_msg = "reportlab not installed. Install with: pip install reportlab"
-            print(f"[EXPORT] PDF error: {error_msg}")
+            logger.debug("[EXPORT] PDF error: %s", error_msg)
             errors["pdf"] = error_msg
         else:
             try:
-                print(f"[EXPORT] Generating PDF report with raster preview...")
+                logger.debug("[EXPORT] Generating PDF report with raster preview...")
                 pdf_name = f"{base_filename}.pdf"
                 pdf_path = out_dir / pdf_name
                 
@@ -2806,47 +2978,33 @@ def export_raster(req: ExportRequest):
                     
                     if overlay_path.exists():
                         # Load PNG bytes from local file
-                        print(f"[EXPORT] Loading PNG overlay from: {overlay_path}")
+                        logger.debug("[EXPORT] Loading PNG overlay from: %s", overlay_path)
                         try:
                             with open(overlay_path, "rb") as f:
                                 png_bytes = f.read()
-                            print(f"[EXPORT] ✓ Loaded PNG overlay ({len(png_bytes)} bytes)")
+                            logger.debug("[EXPORT] ✓ Loaded PNG overlay (%s bytes)", len(png_bytes))
                         except Exception as load_err:
-                            print(f"[EXPORT] Warning: Failed to load PNG file: {load_err}")
+                            logger.warning("[EXPORT] Failed to load PNG file: %s", load_err)
                             png_bytes = None
                     else:
                         # Try fetching from URL
-                        print(f"[EXPORT] Local file not found, fetching from URL: {overlay_url}")
-                        if HAS_REQUESTS:
-                            try:
-                                base_url = "http://127.0.0.1:8000"
-                                if overlay_url.startswith("/"):
-                                    full_url = f"{base_url}{overlay_url}"
-                                else:
-                                    full_url = f"{base_url}/{overlay_url}"
-                                
-                                response = requests.get(full_url, timeout=10)
-                                response.raise_for_status()
-                                png_bytes = response.content
-                                print(f"[EXPORT] ✓ Fetched PNG overlay from URL ({len(png_bytes)} bytes)")
-                            except Exception as fetch_err:
-                                print(f"[EXPORT] Warning: Failed to fetch PNG from URL: {fetch_err}")
-                                png_bytes = None
+                        logger.debug("[EXPORT] Local file not found, fetching from URL: %s", overlay_url)
+                        png_bytes = fetch_image_bytes(overlay_url)
+                        if png_bytes:
+                            logger.debug("[EXPORT] ✓ Fetched PNG overlay from URL (%s bytes)", len(png_bytes))
                 
                 # If PNG still not available, generate it now
                 if not png_bytes:
-                    print(f"[EXPORT] PNG overlay not found, generating new preview...")
+                    logger.debug("[EXPORT] PNG overlay not found, generating new preview...")
                     try:
                         png_bytes = render_clipped_preview_png(
                             raster_layer_id=req.raster_layer_id,
                             user_clip_geojson=req.user_clip_geojson
                         )
-                        print(f"[EXPORT] ✓ Generated PNG preview ({len(png_bytes)} bytes)")
+                        logger.debug("[EXPORT] ✓ Generated PNG preview (%s bytes)", len(png_bytes))
                     except Exception as gen_err:
                         error_msg = f"Failed to generate PNG preview: {str(gen_err)}"
-                        print(f"[EXPORT] ERROR: {error_msg}")
-                        import traceback
-                        traceback.print_exc()
+                        logger.exception("[EXPORT] %s", error_msg)
                         # Continue without image - will show "Preview image unavailable" in PDF
                 
                 # ============================================================
@@ -2872,11 +3030,9 @@ def export_raster(req: ExportRequest):
                     if dataset_parts:
                         title_text = " · ".join(dataset_parts)
                 
-                # Calculate median if not in stats
-                median = None
-                if len(valid_pixels) > 0:
-                    median = float(np.median(valid_pixels))
-                elif stats.get("median") is not None:
+                # Median from the shared stats extras, falling back to clip stats
+                median = stats_extras["median"]
+                if median is None:
                     median = stats.get("median")
                 
                 # Prepare stats dict for PDF helper
@@ -2932,39 +3088,61 @@ def export_raster(req: ExportRequest):
                     f.write(pdf_bytes)
                 
                 if png_bytes:
-                    print(f"[EXPORT] ✓ PDF exported successfully with raster preview: {pdf_path}")
+                    logger.info("[EXPORT] ✓ PDF exported successfully with raster preview: %s", pdf_path)
                 else:
-                    print(f"[EXPORT] ✓ PDF exported successfully (text-only, image unavailable): {pdf_path}")
+                    logger.info("[EXPORT] ✓ PDF exported successfully (text-only, image unavailable): %s", pdf_path)
                 
                 output_files["pdf"] = f"/static/exports/{export_id}/{pdf_name}"
                 
             except Exception as e:
-                import traceback
                 error_msg = f"PDF export failed: {str(e)}"
-                print(f"[EXPORT] ERROR: {error_msg}")
-                traceback.print_exc()
+                logger.exception("[EXPORT] %s", error_msg)
                 errors["pdf"] = error_msg
 
+    # Formats are independent (separate output files and libraries), so build them
+    # concurrently: rasterio/GDAL compression, Pillow and zlib release the GIL.
+    # Each exporter records its own output/error; this is just a safety net.
+    exporters = {
+        "png": _export_png,
+        "tif": _export_tif,
+        "csv": _export_csv,
+        "geojson": _export_geojson,
+        "json": _export_json,
+        "pdf": _export_pdf,
+    }
+    wanted = {fmt: fn for fmt, fn in exporters.items() if fmt in req.formats}
+    if wanted:
+        with ThreadPoolExecutor(max_workers=len(wanted)) as executor:
+            futures = {fmt: executor.submit(fn) for fmt, fn in wanted.items()}
+        for fmt, future in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                logger.error("[EXPORT] %s export failed: %s", fmt, e)
+                errors[fmt] = str(e)
+
     # Create sidecar report files (JSON and PDF) for all exports
     # These provide metadata even if embedding fails
     try:
         # Sidecar JSON report
         sidecar_json_name = f"{base_filename}_report.json"
         sidecar_json_path = out_dir / sidecar_json_name
-        with open(sidecar_json_path, "w", encoding="utf-8") as f:
-            json.dump(report_metadata, f, indent=2)
+        # One bulk serialize (orjson when installed) + one write instead of json.dump's many small writes
+        sidecar_json_path.write_bytes(dumps_report_json_bytes(report_metadata))
         output_files["report_json"] = f"/static/exports/{export_id}/{sidecar_json_name}"
         
         # Sidecar PDF report (if reportlab available and PDF not already exported)
         if HAS_REPORTLAB and "pdf" not in req.formats:
             try:
+                _lazy_reportlab()
                 sidecar_pdf_name = f"{base_filename}_report.pdf"
                 sidecar_pdf_path = out_dir / sidecar_pdf_name
                 
                 # Generate PDF report (reuse same logic as main PDF export)
                 # This is a simplified version - full version already exists above
                 # For sidecar, we'll create a basic report
-                doc = SimpleDocTemplate(str(sidecar_pdf_path), pagesize=letter, topMargin=0.5*inch)
+                pdf_buffer = BytesIO()
+                doc = SimpleDocTemplate(pdf_buffer, pagesize=letter, topMargin=0.5*inch)
                 story = []
                 styles = getSampleStyleSheet()
                 
@@ -2984,17 +3162,18 @@ def export_raster(req: ExportRequest):
                 story.append(Paragraph("For full report details, see the JSON metadata file.", styles['Normal']))
                 
                 doc.build(story)
+                sidecar_pdf_path.write_bytes(pdf_buffer.getvalue())
                 output_files["report_pdf"] = f"/static/exports/{export_id}/{sidecar_pdf_name}"
             except Exception as pdf_err:
-                print(f"Warning: Could not create sidecar PDF: {pdf_err}")
+                logger.warning("Could not create sidecar PDF: %s", pdf_err)
     except Exception as sidecar_err:
-        print(f"Warning: Could not create sidecar report files: {sidecar_err}")
+        logger.warning("Could not create sidecar report files: %s", sidecar_err)
     
     # Return results
-    print(f"\n[EXPORT] Export complete. Generated {len(output_files)} files.")
-    print(f"[EXPORT] Output files: {list(output_files.keys())}")
+    logger.info("[EXPORT] Export complete. Generated %s files.", len(output_files))
+    logger.debug("[EXPORT] Output files: %s", list(output_files.keys()))
     if errors:
-        print(f"[EXPORT] Errors: {errors}")
+        logger.debug("[EXPORT] Errors: %s", errors)
     
     response = {
         "status": "success" if output_files and not errors else ("partial" if output_files else "failed"),
@@ -3029,10 +3208,10 @@ async def export_pdf_report(req: PDFExportRequest):
         )
     
     try:
-        print(f"\n[PDF EXPORT] Starting PDF generation...")
-        print(f"[PDF EXPORT] Raster layer ID: {req.raster_layer_id}")
-        print(f"[PDF EXPORT] AOI name: {req.aoi_name}")
-        print(f"[PDF EXPORT] Context: {req.context}")
+        logger.debug("[PDF EXPORT] Starting PDF generation...")
+        logger.debug("[PDF EXPORT] Raster layer ID: %s", req.raster_layer_id)
+        logger.debug("[PDF EXPORT] AOI name: %s", req.aoi_name)
+        logger.debug("[PDF EXPORT] Context: %s", req.context)
         
         # ============================================================
         # STEP 1: Get PNG overlay and stats (reuse existing logic)
@@ -3045,7 +3224,7 @@ async def export_pdf_report(req: PDFExportRequest):
         
         if req.overlay_url and req.stats:
             # Use provided overlay and stats (from frontend createdRasters)
-            print(f"[PDF EXPORT] Using provided overlay_url and stats")
+            logger.debug("[PDF EXPORT] Using provided overlay_url and stats")
             overlay_filename = Path(req.overlay_url).name
             overlay_path = Path("static/overlays") / overlay_filename
             
@@ -3053,15 +3232,14 @@ async def export_pdf_report(req: PDFExportRequest):
                 with open(overlay_path, "rb") as f:
                     png_bytes = f.read()
                 stats = req.stats
-                print(f"[PDF EXPORT] ✓ Loaded PNG overlay ({len(png_bytes)} bytes)")
-                print(f"[PDF EXPORT] ✓ Using provided stats: {stats}")
+                logger.debug("[PDF EXPORT] ✓ Loaded PNG overlay (%s bytes)", len(png_bytes))
+                logger.debug("[PDF EXPORT] ✓ Using provided stats: %s", stats)
             else:
-                print(f"[PDF EXPORT] Warning: Overlay file not found, will re-clip")
+                logger.warning("[PDF EXPORT] Overlay file not found, will re-clip")
         
         if not png_bytes or not stats:
             # Re-clip raster to get PNG overlay and stats
-            print(f"[PDF EXPORT] Clipping raster to generate PNG overlay and stats...")
-            from app.services.raster_service import clip_raster_for_layer
+            logger.debug("[PDF EXPORT] Clipping raster to generate PNG overlay and stats...")
             
             clip_result = clip_raster_for_layer(
                 raster_layer_id=req.raster_layer_id,
@@ -3077,12 +3255,12 @@ async def export_pdf_report(req: PDFExportRequest):
                 if overlay_path.exists():
                     with open(overlay_path, "rb") as f:
                         png_bytes = f.read()
-                    print(f"[PDF EXPORT] ✓ Generated PNG overlay ({len(png_bytes)} bytes)")
+                    logger.debug("[PDF EXPORT] ✓ Generated PNG overlay (%s bytes)", len(png_bytes))
             
             # Extract stats (exactly as computed for UI)
             stats = clip_result.get("stats", {})
             bounds = clip_result.get("bounds", {})
-            print(f"[PDF EXPORT] ✓ Extracted stats: {stats}")
+            logger.debug("[PDF EXPORT] ✓ Extracted stats: %s", stats)
         
         if not png_bytes:
             raise HTTPException(
@@ -3098,18 +3276,17 @@ async def export_pdf_report(req: PDFExportRequest):
         
         # Get raster info for footer
         try:
-            from app.services.raster_service import resolve_raster_path
-            from app.services.raster_index import RASTER_LOOKUP_LIST
+            from app.services.raster_index import RASTER_BY_ID
             
             raster_path = resolve_raster_path(req.raster_layer_id)
-            raster_item = next((r for r in RASTER_LOOKUP_LIST if r["id"] == req.raster_layer_id), None)
+            raster_item = RASTER_BY_ID.get(req.raster_layer_id)
             raster_name = raster_item.get("name", "Unknown") if raster_item else "Unknown"
             
             # Get CRS from raster file
             with rasterio.open(raster_path) as src:
                 raster_crs = src.crs
         except Exception as e:
-            print(f"[PDF EXPORT] Warning: Could not get raster info: {e}")
+            logger.warning("[PDF EXPORT] Could not get raster info: %s", e)
             raster_crs = None
             raster_name = "Unknown"
         
@@ -3124,7 +3301,7 @@ async def export_pdf_report(req: PDFExportRequest):
             # Use filter-based filename (with HSL/WH rules)
             pdf_filename = build_export_filename(req.context, ".pdf")
         
-        print(f"[PDF EXPORT] PDF filename: {pdf_filename}")
+        logger.debug("[PDF EXPORT] PDF filename: %s", pdf_filename)
         
         # ============================================================
         # STEP 3: Build title from context
@@ -3170,8 +3347,8 @@ async def export_pdf_report(req: PDFExportRequest):
         # ============================================================
         # STEP 5: Generate PDF with landscape orientation
         # ============================================================
-        print("[PDF EXPORT] 🔵 PDF export: START")
-        print("[PDF EXPORT] 🔵 About to call build_pdf_report_landscape")
+        logger.debug("[PDF EXPORT] 🔵 PDF export: START")
+        logger.debug("[PDF EXPORT] 🔵 About to call build_pdf_report_landscape")
         
         legend_bins = [
             {"range": "0–10", "color": "#006400", "label": "0–10"},
@@ -3197,12 +3374,11 @@ async def export_pdf_report(req: PDFExportRequest):
             context=context
         )
         
-        print(f"[PDF EXPORT] 🔵 PDF export: COMPLETE - Generated PDF ({len(pdf_bytes)} bytes)")
+        logger.debug("[PDF EXPORT] 🔵 PDF export: COMPLETE - Generated PDF (%s bytes)", len(pdf_bytes))
         
         # ============================================================
         # STEP 6: Return PDF as streaming response
         # ============================================================
-        from fastapi.responses import Response
         
         return Response(
             content=pdf_bytes,
@@ -3215,8 +3391,6 @@ async def export_pdf_report(req: PDFExportRequest):
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
         error_msg = f"PDF export failed: {str(e)}"
-        print(f"[PDF EXPORT] ERROR: {error_msg}")
-        traceback.print_exc()
+        logger.exception("[PDF EXPORT] %s", error_msg)
         raise HTTPException(status_code=500, detail=error_msg)
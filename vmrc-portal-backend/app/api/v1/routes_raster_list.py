@@ -1,10 +1,14 @@
 # app/api/v1/routes_raster_list.py
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from app.core.static_json import serialize_static_json, static_json_response
 from app.services.raster_index import RASTER_LOOKUP_LIST
 
 router = APIRouter(tags=["rasters"])
 
+# The raster index is built once at import, so serialize it once too
+_LIST_JSON, _LIST_ETAG = serialize_static_json({"items": RASTER_LOOKUP_LIST})
+
 @router.get("/list")
-def list_rasters():
-    return {"items": RASTER_LOOKUP_LIST}
+def list_rasters(request: Request):
+    return static_json_response(request, _LIST_JSON, _LIST_ETAG)
@@ -1,6 +1,8 @@
+from typing import List, Tuple
+
 from fastapi import APIRouter
 from pydantic import BaseModel
-from app.services.raster_service import sample_raster_value
+from app.services.raster_service import sample_raster_value, sample_raster_values
 
 router = APIRouter(tags=["rasters"])
 
@@ -23,3 +25,20 @@ def sample_value(req: SampleRequest):
         "lat": req.lat,
         "crs": res["crs"]
     }
+
+
+class BatchSampleRequest(BaseModel):
+    rasterLayerId: int
+    points: List[Tuple[float, float]]  # [(lon, lat), ...]
+
+@router.post("/sample_batch")
+def sample_values(req: BatchSampleRequest):
+    res = sample_raster_values(
+        raster_layer_id=req.rasterLayerId,
+        points=req.points
+    )
+    return {
+        "values": res["values"],
+        "is_nodata": res["is_nodata"],
+        "crs": res["crs"]
+    }
@@ -0,0 +1,69 @@
+# File: app/core/frontend_cache.py
+
+"""
+In-memory copy of the frontend build (Vite ``dist/``).
+
+The build doesn't change while the backend runs, so it is read once at
+startup. The SPA routes then serve bytes straight from a dict instead of
+doing stat() + open() for every request.
+"""
+
+import mimetypes
+import os
+from typing import Dict, FrozenSet, NamedTuple
+
+from fastapi import Request, Response
+
+from app.core.static_json import etag_matches
+
+
+# Larger files are left on disk and served with FileResponse
+MAX_CACHED_ASSET_BYTES = 2 * 1024 * 1024
+
+
+class CachedAsset(NamedTuple):
+    body: bytes
+    etag: str
+    content_type: str
+
+
+def list_dist_files(dist_dir: str) -> FrozenSet[str]:
+    """
+    Relative ("/"-separated) paths of every file under ``dist_dir``.
+    """
+    return frozenset(
+        os.path.relpath(os.path.join(root, name), dist_dir).replace(os.sep, "/")
+        for root, _dirs, files in os.walk(dist_dir)
+        for name in files
+    )
+
+
+def load_frontend_assets(dist_dir: str) -> Dict[str, CachedAsset]:
+    """
+    Read every file under ``dist_dir`` smaller than MAX_CACHED_ASSET_BYTES.
+    Keys are paths relative to ``dist_dir`` using "/" separators, i.e. the
+    same form as the ``full_path`` route parameter.
+    """
+    assets: Dict[str, CachedAsset] = {}
+    for root, _dirs, files in os.walk(dist_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            st = os.stat(path)
+            if st.st_size >= MAX_CACHED_ASSET_BYTES:
+                continue
+            with open(path, "rb") as f:
+                body = f.read()
+            rel = os.path.relpath(path, dist_dir).replace(os.sep, "/")
+            content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            assets[rel] = CachedAsset(body, f'W/"{st.st_mtime_ns}-{st.st_size}"', content_type)
+    return assets
+
+
+def cached_asset_response(request: Request, asset: CachedAsset) -> Response:
+    """
+    Return the cached bytes, or an empty 304 if the client's ETag matches.
+    """
+    headers = {"ETag": asset.etag}
+    if etag_matches(request, asset.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=asset.body, media_type=asset.content_type, headers=headers)
@@ -0,0 +1,41 @@
+# File: app/core/responses.py
+
+"""
+Default JSON response class for the API.
+
+Renders with orjson when it is installed, including NumPy arrays and scalars,
+so handlers can return ndarrays directly. Without orjson it falls back to the
+stdlib json module.
+"""
+
+import json
+from typing import Any
+
+import numpy as np
+from fastapi.responses import JSONResponse
+
+# Fast JSON serialization (optional)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if HAS_ORJSON:
+            return orjson.dumps(
+                content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            )
+        return json.dumps(
+            content, default=_json_default, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
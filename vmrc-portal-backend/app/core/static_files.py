@@ -0,0 +1,70 @@
+# File: app/core/static_files.py
+
+"""
+StaticFiles that lets the ASGI server send the file with sendfile(2).
+
+Starlette's FileResponse already uses the ``http.response.pathsend`` extension
+when the server supports it. Servers that only advertise the older
+``http.response.zerocopysend`` extension get the open file instead, so the
+body never passes through Python. Otherwise (e.g. plain uvicorn) this falls
+back to the normal chunked read.
+"""
+
+import os
+
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.datastructures import Headers
+from starlette.types import Receive, Scope, Send
+
+
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+
+
+class ZeroCopyFileResponse(FileResponse):
+    """
+    FileResponse that hands the file to the server via ``zerocopysend``.
+    Range and HEAD requests keep Starlette's own handling.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or ZEROCOPY_EXTENSION not in scope.get("extensions", {})
+            or self.stat_result is None
+            or self.status_code != 200
+            or scope["method"].upper() == "HEAD"
+            or "range" in Headers(scope=scope)
+        ):
+            await super().__call__(scope, receive, send)
+            return
+
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        with open(self.path, "rb") as file:
+            await send({
+                "type": ZEROCOPY_EXTENSION,
+                "file": file,
+                "count": self.stat_result.st_size,
+                "more_body": False,
+            })
+
+        if self.background is not None:
+            await self.background()
+
+
+class SendfileStaticFiles(StaticFiles):
+    """
+    Drop-in StaticFiles whose responses use ZeroCopyFileResponse.
+    """
+
+    def file_response(
+        self,
+        full_path: "os.PathLike[str] | str",
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        response = ZeroCopyFileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
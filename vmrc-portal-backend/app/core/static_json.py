@@ -0,0 +1,59 @@
+# File: app/core/static_json.py
+
+"""
+Helpers for endpoints that serve payloads which never change while the
+process runs (raster index, global AOI).
+
+The payload is serialized once; each request just returns the cached bytes
+with an ETag, and answers 304 when the browser already has them.
+"""
+
+import hashlib
+import json
+from typing import Any, Tuple
+
+from fastapi import Request, Response
+
+# Fast JSON serialization (optional)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+STATIC_JSON_MAX_AGE = 300  # seconds
+
+
+def serialize_static_json(obj: Any) -> Tuple[bytes, str]:
+    """
+    Serialize ``obj`` once. Returns (body bytes, quoted ETag).
+    """
+    if HAS_ORJSON:
+        body = orjson.dumps(obj)
+    else:
+        body = json.dumps(obj, separators=(",", ":")).encode("utf-8")
+    etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    return body, etag
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    True when the request's If-None-Match lists ``etag`` (weak or strong).
+    """
+    if_none_match = request.headers.get("if-none-match", "")
+    bare = etag.removeprefix("W/")
+    return bare in [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+
+
+def static_json_response(request: Request, body: bytes, etag: str) -> Response:
+    """
+    Return pre-serialized JSON, or an empty 304 if the client's ETag matches.
+    """
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={STATIC_JSON_MAX_AGE}",
+    }
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -5,7 +5,7 @@ We only wire up the metadata here. Models will be imported so their
 tables get registered on Base.metadata.
 """
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import engine
 from app.models.base import Base
@@ -14,14 +14,15 @@ from app.models.base import Base
 from app.models import raster_layer  # noqa: F401
 
 
-def init_db() -> None:
+async def init_db() -> None:
     """
     Create all tables based on SQLAlchemy models.
     """
-    Base.metadata.create_all(bind=engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
 
 
-def seed_initial_data(db: Session) -> None:
+async def seed_initial_data(db: AsyncSession) -> None:
     """
     Placeholder for seeding initial data (e.g., default users, demo projects).
     """
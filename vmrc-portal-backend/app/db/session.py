@@ -1,23 +1,31 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+from collections.abc import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from app.core.config import settings
 
 SQLALCHEMY_DATABASE_URL = settings.database_url
 
-engine = create_engine(
+# psycopg 3 ("postgresql+psycopg://") drives both sync and asyncio engines, so the
+# configured URL works as-is. Pool sized for many concurrent light reads.
+_is_sqlite = "sqlite" in SQLALCHEMY_DATABASE_URL
+
+engine = create_async_engine(
     SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in SQLALCHEMY_DATABASE_URL else {}
+    connect_args={"check_same_thread": False} if _is_sqlite else {},
+    **({} if _is_sqlite else {
+        "pool_size": 20,
+        "max_overflow": 40,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+    }),
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
 
 
 # ----------------------------------------------------
 # DB Session Dependency (THIS IS WHAT WAS MISSING)
 # ----------------------------------------------------
-def get_db():
-    db: Session = SessionLocal()
-    try:
+async def get_db() -> AsyncIterator[AsyncSession]:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -0,0 +1,163 @@
+# ============================================================
+# File: app/gis/_stats_kernel.py
+# VMRC Portal – Masked band statistics (Numba kernel + NumPy fallback)
+# ============================================================
+
+import math
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# Numba (optional): one parallel pass instead of four NumPy reductions
+try:
+    from numba import get_num_threads, njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+# ============================================================
+# Numba kernel
+# ============================================================
+
+if HAS_NUMBA:
+
+    # No fastmath: it lets LLVM assume there are no NaNs, which would break the NaN test
+    @njit(parallel=True, cache=True)
+    def _stats_masked(flat, nodata, nchunks):
+        """
+        Single pass over ``flat`` skipping NaN/inf and ``nodata``, split into
+        ``nchunks`` contiguous chunks (one per thread). Each thread keeps a
+        Welford (count, mean, M2, min, max) partial; the partials are merged
+        with Chan's formula so std stays numerically stable.
+        Returns (count, min, max, mean, M2).
+        """
+        n = flat.size
+        chunk = (n + nchunks - 1) // nchunks
+
+        cnt = np.zeros(nchunks, np.int64)
+        mean = np.zeros(nchunks, np.float64)
+        m2 = np.zeros(nchunks, np.float64)
+        mn = np.full(nchunks, np.inf)
+        mx = np.full(nchunks, -np.inf)
+
+        for t in prange(nchunks):
+            start = t * chunk
+            stop = min(start + chunk, n)
+            c = 0
+            mu = 0.0
+            acc = 0.0
+            lo = np.inf
+            hi = -np.inf
+            for i in range(start, stop):
+                x = np.float64(flat[i])
+                if not np.isfinite(x) or x == nodata:
+                    continue
+                c += 1
+                d = x - mu
+                mu += d / c
+                acc += d * (x - mu)
+                if x < lo:
+                    lo = x
+                if x > hi:
+                    hi = x
+            cnt[t] = c
+            mean[t] = mu
+            m2[t] = acc
+            mn[t] = lo
+            mx[t] = hi
+
+        total = 0
+        mu = 0.0
+        acc = 0.0
+        for t in range(nchunks):
+            c = cnt[t]
+            if c == 0:
+                continue
+            new_total = total + c
+            d = mean[t] - mu
+            mu += d * c / new_total
+            acc += m2[t] + d * d * total * c / new_total
+            total = new_total
+
+        return total, mn.min(), mx.max(), mu, acc
+
+    # Warm the (on-disk) JIT cache so the first export doesn't pay compilation
+    _stats_masked(np.zeros(1, np.float32), -9999.0, 1)
+
+
+# ============================================================
+# Public entry points
+# ============================================================
+
+# (count, mean, M2, min, max): Welford partial; std = sqrt(M2 / count)
+Moments = Tuple[int, float, float, float, float]
+
+EMPTY_MOMENTS: Moments = (0, 0.0, 0.0, math.inf, -math.inf)
+
+
+def band_moments(band: np.ndarray, nodata_value: Optional[float]) -> Moments:
+    """
+    Welford partial of ``band`` ignoring NaN, inf and ``nodata_value``
+    (None: no nodata). Partials of separate windows combine with merge_moments.
+    """
+    nodata = math.nan if nodata_value is None else float(nodata_value)
+
+    if HAS_NUMBA:
+        count, vmin, vmax, vmean, m2 = _stats_masked(band.ravel(), nodata, get_num_threads())
+        if count == 0:
+            return EMPTY_MOMENTS
+        return int(count), float(vmean), float(m2), float(vmin), float(vmax)
+
+    # NumPy fallback: where=-masked reductions in the native dtype (no upcast copy,
+    # no band[valid] gather); sums accumulate in float64.
+    if np.issubdtype(band.dtype, np.integer):
+        valid = band != nodata
+        lo, hi = np.iinfo(band.dtype).max, np.iinfo(band.dtype).min
+    else:
+        valid = np.isfinite(band)
+        valid &= band != nodata
+        lo, hi = np.inf, -np.inf
+
+    count = int(np.count_nonzero(valid))
+    if count == 0:
+        return EMPTY_MOMENTS
+    return (
+        count,
+        float(np.mean(band, where=valid, dtype=np.float64)),
+        float(np.var(band, where=valid, dtype=np.float64)) * count,
+        float(np.min(band, where=valid, initial=lo)),
+        float(np.max(band, where=valid, initial=hi)),
+    )
+
+
+def merge_moments(a: Moments, b: Moments) -> Moments:
+    """
+    Combine two Welford partials (Chan et al.).
+    """
+    na, mean_a, m2_a, min_a, max_a = a
+    nb, mean_b, m2_b, min_b, max_b = b
+    if nb == 0:
+        return a
+    if na == 0:
+        return b
+    n = na + nb
+    d = mean_b - mean_a
+    return (
+        n,
+        mean_a + d * nb / n,
+        m2_a + m2_b + d * d * na * nb / n,
+        min(min_a, min_b),
+        max(max_a, max_b),
+    )
+
+
+def masked_band_stats(band: np.ndarray, nodata_value: float) -> Dict[str, float]:
+    """
+    min / max / mean / std of ``band`` ignoring NaN, inf and ``nodata_value``.
+    Raises ValueError when no valid pixel is left.
+    """
+    count, vmean, m2, vmin, vmax = band_moments(band, nodata_value)
+    if count == 0:
+        raise ValueError("Clipped raster contains no valid pixels.")
+    return {"min": vmin, "max": vmax, "mean": vmean, "std": math.sqrt(m2 / count)}
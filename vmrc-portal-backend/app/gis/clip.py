@@ -3,19 +3,34 @@
 # VMRC Portal – Clipping Utilities (FINAL CLEAN VERSION)
 # ============================================================
 
+import logging
 from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import fiona
 import numpy as np
 import rasterio
-from rasterio.mask import mask
+from rasterio.crs import CRS
+from rasterio.features import geometry_mask
+from rasterio.windows import Window, from_bounds
 from rasterio.warp import transform_geom
 
+import shapely
 from shapely.geometry import shape, mapping
-from shapely.ops import unary_union
 from shapely.geometry.base import BaseGeometry
+from shapely.prepared import prep, PreparedGeometry
+
+from app.gis._stats_kernel import masked_band_stats
+
+# Bulk vector reads (optional)
+try:
+    import pyogrio.raw
+    HAS_PYOGRIO = True
+except ImportError:
+    HAS_PYOGRIO = False
+
+logger = logging.getLogger(__name__)
 
 
 # ============================================================
@@ -26,24 +41,60 @@ AOI_SHP_PATH = Path(r"D:\VMRC_Project\Data_Analysis!!\AOI_diss\AOI_diss.shp")
 
 
 # ============================================================
-# Load Full AOI as GeoJSON (optional for API GET /aoi)
+# Read AOI records (bulk via pyogrio when available)
 # ============================================================
 
-def get_global_aoi_geojson() -> dict:
+@lru_cache
+def _read_aoi_records() -> Tuple[Optional[str], List[BaseGeometry], List[dict]]:
     """
-    Return AOI as a FeatureCollection (for frontend display).
+    Read every AOI record as (CRS string, shapely geometries, properties).
+    Cached: the shapefile is read once per process, shared by every loader below.
+    pyogrio hands back all geometries as one WKB array decoded by a single
+    vectorized shapely call; fiona (per-feature Python loop) is the fallback.
     """
     if not AOI_SHP_PATH.exists():
-        raise FileNotFoundError(f"AOI shapefile not found at: {AOI_SHP_PATH}")
+        raise FileNotFoundError(f"AOI shapefile not found: {AOI_SHP_PATH}")
+
+    if HAS_PYOGRIO:
+        meta, _, wkb, field_data = pyogrio.raw.read(AOI_SHP_PATH)
+        fields = list(meta["fields"])
+        geoms = shapely.from_wkb(wkb)
+        props = [
+            {name: values[i].item() if hasattr(values[i], "item") else values[i]
+             for name, values in zip(fields, field_data)}
+            for i in range(len(geoms))
+        ]
+        keep = [i for i, g in enumerate(geoms) if g is not None]
+        return meta.get("crs"), [geoms[i] for i in keep], [props[i] for i in keep]
 
-    features = []
+    geoms = []
+    props = []
     with fiona.open(AOI_SHP_PATH, "r") as src:
+        crs = src.crs_wkt or None
         for feat in src:
-            features.append({
-                "type": "Feature",
-                "properties": feat.get("properties") or {},
-                "geometry": feat["geometry"]
-            })
+            if feat["geometry"] is None:
+                continue
+            geoms.append(shape(feat["geometry"]))
+            props.append(dict(feat.get("properties") or {}))
+    return crs, geoms, props
+
+
+# ============================================================
+# Load Full AOI as GeoJSON (optional for API GET /aoi)
+# ============================================================
+
+@lru_cache
+def get_global_aoi_geojson() -> dict:
+    """
+    Return AOI as a FeatureCollection (for frontend display).
+    Built once from the cached records; no shapefile I/O per call.
+    """
+    _, geoms, props = _read_aoi_records()
+
+    features = [
+        {"type": "Feature", "properties": p, "geometry": mapping(g)}
+        for g, p in zip(geoms, props)
+    ]
 
     if not features:
         raise RuntimeError("AOI shapefile contains no features.")
@@ -56,36 +107,33 @@ def get_global_aoi_geojson() -> dict:
 # ============================================================
 
 @lru_cache
-def _load_global_aoi_feature() -> dict:
+def _read_global_aoi() -> Tuple[dict, BaseGeometry, Optional[str]]:
     """
     Load AOI shapefile and dissolve all parts into ONE geometry.
+    Returns (first feature's properties, dissolved geometry, CRS string).
     """
-    if not AOI_SHP_PATH.exists():
-        raise FileNotFoundError(f"AOI shapefile not found: {AOI_SHP_PATH}")
-
-    geoms = []
-    props = {}
-
-    with fiona.open(AOI_SHP_PATH, "r") as src:
-        for feat in src:
-            g = shape(feat["geometry"])
-            geoms.append(g)
-
-            if not props:
-                props = feat.get("properties") or {}
+    crs, geoms, all_props = _read_aoi_records()
 
     if not geoms:
         raise RuntimeError("AOI shapefile has no valid geometries.")
 
-    # Dissolve union
-    if len(geoms) == 1:
-        union_geom = geoms[0]
-    else:
-        union_geom = unary_union(geoms)
+    props = all_props[0]
+
+    # Dissolve union (single GEOS call; cheap for a single part too)
+    union_geom = shapely.union_all(geoms)
 
     if union_geom.is_empty:
         raise RuntimeError("AOI became empty after union().")
 
+    return props, union_geom, crs
+
+
+@lru_cache
+def _load_global_aoi_feature() -> dict:
+    """
+    Dissolved AOI as a GeoJSON Feature.
+    """
+    props, union_geom, _ = _read_global_aoi()
     return {
         "type": "Feature",
         "properties": props,
@@ -93,6 +141,57 @@ def _load_global_aoi_feature() -> dict:
     }
 
 
+@lru_cache
+def _load_global_aoi_geometry() -> Tuple[BaseGeometry, Optional[str], PreparedGeometry]:
+    """
+    Dissolved AOI geometry, its CRS string and a prepared copy, in the shapefile CRS.
+    """
+    _, union_geom, aoi_crs = _read_global_aoi()
+    return union_geom, aoi_crs, prep(union_geom)
+
+
+@lru_cache(maxsize=16)
+def _global_aoi_in_crs(raster_crs_wkt: str) -> Tuple[BaseGeometry, PreparedGeometry]:
+    """
+    Dissolved AOI reprojected to a raster CRS (cached per CRS), with a prepared copy.
+    """
+    global_geom, aoi_crs, prepared = _load_global_aoi_geometry()
+
+    if aoi_crs and CRS.from_user_input(aoi_crs) != CRS.from_wkt(raster_crs_wkt):
+        global_geom = shape(transform_geom(
+            aoi_crs,
+            raster_crs_wkt,
+            mapping(global_geom),
+            precision=6
+        ))
+        prepared = prep(global_geom)
+        logger.debug("[CLIP] Global AOI reprojected to raster CRS")
+    else:
+        logger.debug("[CLIP] Global AOI already in raster CRS")
+
+    return global_geom, prepared
+
+
+@lru_cache(maxsize=64)
+def _aoi_in_raster_crs(raster_path: str) -> Tuple[CRS, str, BaseGeometry, PreparedGeometry]:
+    """
+    Raster CRS (header read once per raster) and its string form, with the
+    dissolved AOI in that CRS.
+    """
+    with rasterio.open(raster_path) as src:
+        raster_crs = src.crs
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("========== DEBUG CLIP INFO ==========")
+            logger.debug("Raster path: %s", raster_path)
+            logger.debug("Raster bounds: %s", src.bounds)
+            logger.debug("Raster CRS: %s", raster_crs)
+            logger.debug("NODATA: %s", src.nodata)
+            logger.debug("=====================================")
+
+    global_geom, prepared = _global_aoi_in_crs(raster_crs.to_wkt())
+    return raster_crs, raster_crs.to_string(), global_geom, prepared
+
+
 def get_global_aoi_feature() -> dict:
     """
     Public accessor — always returns the cached dissolved AOI.
@@ -100,13 +199,20 @@ def get_global_aoi_feature() -> dict:
     return _load_global_aoi_feature()
 
 
+def get_global_aoi_geometry() -> BaseGeometry:
+    """
+    Public accessor — cached dissolved AOI as a shapely geometry (shapefile CRS).
+    """
+    return _read_global_aoi()[1]
+
+
 # ============================================================
 # Convert GeoJSON → Shapely Geometry
 # ============================================================
 
-def _geojson_to_geom(obj: dict) -> BaseGeometry:
+def _geojson_geometry(obj: dict) -> dict:
     """
-    Accepts Feature or Geometry.
+    Accepts Feature or Geometry; returns the geometry dict.
     """
     if not isinstance(obj, dict):
         raise ValueError("GeoJSON object must be a dictionary.")
@@ -118,7 +224,58 @@ def _geojson_to_geom(obj: dict) -> BaseGeometry:
     else:
         geom = obj
 
-    return shape(geom)
+    return geom
+
+
+def _geojson_to_geom(obj: dict) -> BaseGeometry:
+    """
+    Accepts Feature or Geometry.
+    """
+    return shape(_geojson_geometry(obj))
+
+
+# ============================================================
+# Axis-aligned rectangle detection (box-drawn clips)
+# ============================================================
+
+def _is_axis_aligned_rect(geom: BaseGeometry) -> bool:
+    """
+    True for a hole-free Polygon whose ring is 4 distinct corners joined by
+    horizontal/vertical edges (a box in the geometry's CRS).
+    """
+    if geom.geom_type != "Polygon" or geom.interiors:
+        return False
+
+    coords = list(geom.exterior.coords)
+    if len(coords) != 5 or len(set(coords[:4])) != 4:
+        return False
+
+    xs = {x for x, _ in coords}
+    ys = {y for _, y in coords}
+    if len(xs) != 2 or len(ys) != 2:
+        return False
+
+    return all(
+        x0 == x1 or y0 == y1
+        for (x0, y0), (x1, y1) in zip(coords[:-1], coords[1:])
+    )
+
+
+# ============================================================
+# Reproject user clip (memoized on geometry WKB + target CRS)
+# ============================================================
+
+_USER_GEOM_CACHE_MAX_WKB = 1 << 16  # bytes
+
+
+@lru_cache(maxsize=256)
+def _reproject_user_geom(wkb: bytes, target_crs: str) -> bytes:
+    """
+    Reproject an EPSG:4326 geometry (as 2D WKB) to ``target_crs``; returns WKB.
+    """
+    geom = shapely.from_wkb(wkb)
+    reprojected = transform_geom("EPSG:4326", target_crs, mapping(geom), precision=6)
+    return shapely.to_wkb(shape(reprojected), output_dimension=2)
 
 
 # ============================================================
@@ -140,58 +297,34 @@ def clip_raster_with_global_aoi_and_user_clip(
         bounds    : geographic bounds of clipped region
     """
 
-    # --- 1) Open raster to get CRS ---
-    with rasterio.open(raster_path) as src:
-        raster_crs = src.crs
-        print("\n========== DEBUG CLIP INFO ==========")
-        print("Raster path:", raster_path)
-        print("Raster bounds:", src.bounds)
-        print("Raster CRS:", raster_crs)
-        print("NODATA:", src.nodata)
-        print("=====================================\n")
-
-    # --- 2) Convert inputs and reproject to raster CRS ---
-    global_aoi_feature = get_global_aoi_feature()
-    global_geom = _geojson_to_geom(global_aoi_feature)
-    user_geom = _geojson_to_geom(user_clip_geojson)
-    
-    # Reproject geometries to raster CRS using rasterio.warp.transform_geom (more precise)
-    # Global AOI: reproject from its source CRS (from shapefile) to raster CRS
-    # User clip: reproject from EPSG:4326 (GeoJSON) to raster CRS
-    print(f"[CLIP] Reprojecting geometries to raster CRS: {raster_crs}")
-    
-    # Get global AOI CRS from shapefile
-    with fiona.open(AOI_SHP_PATH, "r") as shp:
-        global_aoi_crs = shp.crs
-        print(f"[CLIP] Global AOI CRS: {global_aoi_crs}")
-    
-    # Reproject global AOI to raster CRS
-    global_geom_dict = mapping(global_geom)
-    if global_aoi_crs and str(global_aoi_crs) != str(raster_crs):
-        global_geom_raster_crs = transform_geom(
-            global_aoi_crs.to_string() if hasattr(global_aoi_crs, 'to_string') else str(global_aoi_crs),
-            raster_crs.to_string() if hasattr(raster_crs, 'to_string') else str(raster_crs),
-            global_geom_dict,
-            precision=6
-        )
-        global_geom = shape(global_geom_raster_crs)
-        print(f"[CLIP] Global AOI reprojected to raster CRS")
-    else:
-        print(f"[CLIP] Global AOI already in raster CRS")
+    # --- 1) Raster CRS + global AOI in that CRS (cached per raster path) ---
+    raster_crs, raster_crs_str, global_geom, global_prepared = _aoi_in_raster_crs(str(raster_path))
+
+    # --- 2) Reproject user clip to raster CRS ---
+    # Reproject user clip to raster CRS using rasterio.warp.transform_geom (more precise).
+    # Re-submitted polygons (same AOI, different parameters) hit the WKB-keyed cache.
+    logger.debug("[CLIP] Reprojecting geometries to raster CRS: %s", raster_crs)
     
     # Reproject user clip to raster CRS (assumed EPSG:4326 input)
-    user_geom_dict = mapping(user_geom)
-    user_geom_raster_crs = transform_geom(
-        "EPSG:4326",
-        raster_crs.to_string() if hasattr(raster_crs, 'to_string') else str(raster_crs),
-        user_geom_dict,
-        precision=6
-    )
-    user_geom = shape(user_geom_raster_crs)
-    print(f"[CLIP] User clip reprojected to raster CRS")
+    user_geom = _geojson_to_geom(user_clip_geojson)
+    user_wkb = shapely.to_wkb(user_geom, output_dimension=2)
+    if len(user_wkb) > _USER_GEOM_CACHE_MAX_WKB:
+        # Very large polygons: don't pin them in the cache
+        user_geom = shape(transform_geom("EPSG:4326", raster_crs_str, mapping(user_geom), precision=6))
+    else:
+        user_geom = shapely.from_wkb(_reproject_user_geom(user_wkb, raster_crs_str))
+    logger.debug("[CLIP] User clip reprojected to raster CRS")
 
     # --- 3) Intersection in raster CRS ---
-    intersection = global_geom.intersection(user_geom)
+    # Prepared-geometry predicates first: a user clip fully inside the AOI (the common
+    # case) is its own intersection, and a disjoint one fails fast. Only partial
+    # overlaps pay for the GEOS overlay.
+    if global_prepared.contains(user_geom):
+        intersection = user_geom
+    elif not global_prepared.intersects(user_geom):
+        raise ValueError("No overlap between AOI and user clip polygon.")
+    else:
+        intersection = global_geom.intersection(user_geom)
 
     if intersection.is_empty:
         raise ValueError("No overlap between AOI and user clip polygon.")
@@ -205,12 +338,13 @@ def clip_raster_with_global_aoi_and_user_clip(
         "east": float(east),
     }
 
-    # Convert intersection to GeoJSON dict for mask()
-    geom_mapping = mapping(intersection)
+    # A user box fully inside the AOI needs no polygon rasterization: every pixel of
+    # the (whole-pixel) bbox window is touched by it
+    rect_clip = intersection is user_geom and _is_axis_aligned_rect(user_geom)
 
     # --- 4) Clip raster ---
     with rasterio.open(raster_path) as src:
-        print(f"[CLIP] AOI ∩ User bounds (raster CRS): {intersection.bounds}")
+        logger.debug("[CLIP] AOI ∩ User bounds (raster CRS): %s", intersection.bounds)
 
         # Determine nodata value: use source nodata if available, otherwise choose based on dtype
         nodata_value = src.nodata
@@ -227,7 +361,7 @@ def clip_raster_with_global_aoi_and_user_clip(
             else:
                 # For float types
                 nodata_value = -9999  # Use a sentinel value
-            print(f"[CLIP] Source has no nodata, using {nodata_value} as nodata value")
+            logger.debug("[CLIP] Source has no nodata, using %s as nodata value", nodata_value)
         
         # ============================================================
         # MASK RASTER: Use all_touched=True to include any touched pixel
@@ -235,20 +369,36 @@ def clip_raster_with_global_aoi_and_user_clip(
         # all_touched=True ensures every pixel that is even slightly touched
         # by the AOI boundary is included. This guarantees no edge pixels are lost.
         #
-        # Why this works:
-        # - By default, mask() only includes pixels whose center falls inside the polygon
-        # - all_touched=True includes ANY pixel touched or intersected by the boundary
-        # - Combined with proper CRS reprojection, this ensures complete pixel coverage
+        # Only the window covering the intersection bounds is read (COG tiles
+        # outside it never leave disk). The window is widened to whole pixels
+        # (floor start, ceil end) so partially covered edge pixels stay in, then
+        # clamped to the raster extent.
         # ============================================================
-        shapes = [geom_mapping]  # GeoJSON dict in raster CRS
-        out_image, out_transform = mask(
-            src,
-            shapes,
-            crop=True,  # Crop to geometry bounds (no pre-windowing needed)
-            all_touched=True,  # CRITICAL: Include any pixel touched by boundary
-            filled=True,  # Fill masked areas with nodata
-            nodata=nodata_value  # Use source nodata or safe default
-        )
+        win = from_bounds(*intersection.bounds, transform=src.transform)
+        row_off = max(0, int(np.floor(win.row_off)))
+        col_off = max(0, int(np.floor(win.col_off)))
+        row_end = min(src.height, int(np.ceil(win.row_off + win.height)))
+        col_end = min(src.width, int(np.ceil(win.col_off + win.width)))
+        if row_end <= row_off or col_end <= col_off:
+            raise ValueError("Input shapes do not overlap raster.")
+        win = Window(col_off=col_off, row_off=row_off, width=col_end - col_off, height=row_end - row_off)
+
+        out_image = src.read(window=win)
+        out_transform = src.window_transform(win)
+
+        # North-up raster + axis-aligned box: the window read is the clip
+        if not (rect_clip and src.transform.b == 0 and src.transform.d == 0):
+            # True for pixels OUTSIDE the geometry; filled with nodata in place
+            outside = geometry_mask(
+                [mapping(intersection)],  # GeoJSON dict in raster CRS
+                out_shape=(win.height, win.width),
+                transform=out_transform,
+                all_touched=True,  # CRITICAL: Include any pixel touched by boundary
+                invert=False,
+            )
+            out_image[:, outside] = nodata_value
+        else:
+            logger.debug("[CLIP] Axis-aligned rectangle inside AOI: window read only, no mask")
 
         out_meta = src.meta.copy()
         out_meta.update({
@@ -257,27 +407,11 @@ def clip_raster_with_global_aoi_and_user_clip(
             "transform": out_transform,
         })
 
-        # Use the nodata value we set in mask() call
+        # Outside-AOI pixels were filled with this value above
         out_meta["nodata"] = nodata_value
 
     # --- 4) Stats ---
-    band = out_image[0].astype(float)
-    valid = np.isfinite(band)
-
     # Exclude nodata pixels (these are outside polygon or actual nodata)
-    if nodata_value is not None:
-        valid &= band != nodata_value
-
-    values = band[valid]
-
-    if values.size == 0:
-        raise ValueError("Clipped raster contains no valid pixels.")
-
-    stats = {
-        "min": float(values.min()),
-        "max": float(values.max()),
-        "mean": float(values.mean()),
-        "std": float(values.std()),
-    }
+    stats = masked_band_stats(out_image[0], nodata_value)
 
     return out_image, stats, out_meta, bounds_dict
@@ -1,35 +1,107 @@
 # app/main.py
 
+import asyncio
 import os
-from fastapi import FastAPI
+from contextlib import asynccontextmanager, suppress
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
+from starlette.routing import Route
 
 from app.core.config import settings
+from app.core.responses import FastJSONResponse
+from app.core.frontend_cache import (
+    cached_asset_response,
+    list_dist_files,
+    load_frontend_assets,
+)
+from app.core.static_files import SendfileStaticFiles
 from app.api.v1.api import api_router
+from app.services import geopdf_service, layer_metadata
+
+
+# ---------- CORS ORIGINS ----------
+# Parsed once at import. For Cloudflare tunnel support, set ALLOWED_ORIGINS env var
+# (comma-separated)
+def _parse_allowed_origins() -> frozenset:
+    allowed_origins_env = os.getenv("ALLOWED_ORIGINS", "")
+    if allowed_origins_env:
+        return frozenset(o.strip() for o in allowed_origins_env.split(",") if o.strip())
+    return frozenset({
+        "http://localhost:5173",
+        "http://127.0.0.1:5173",
+    })
+
+
+_ALLOWED_ORIGINS = _parse_allowed_origins()
+
+
+# =====================================================
+# Serve frontend (Vite build)
+# Repo layout:
+#   VMRC/
+#     vmrc-portal-backend/
+#       app/main.py   <-- this file
+#     vmrc-portal-frontend/
+#       dist/
+# =====================================================
+FRONTEND_DIST = os.path.abspath(
+    os.path.join(
+        os.path.dirname(__file__),
+        "..", "..", "..",          # app -> backend -> VMRC
+        "vmrc-portal-frontend",
+        "dist",
+    )
+)
+
+# The dist tree doesn't change while the server runs: resolve it and list its
+# files once, so the SPA fallback is a set lookup instead of a stat()
+_FRONTEND_DIST_EXISTS = os.path.isdir(FRONTEND_DIST)
+_DIST_FILES = list_dist_files(FRONTEND_DIST) if _FRONTEND_DIST_EXISTS else frozenset()
+
+
+# ---------- UPLOAD CLEANUP ----------
+# Expired GeoPDF uploads/exports and upload layers are removed by a background
+# task (on the threadpool, since it stats and rmtrees) instead of on import
+CLEANUP_INTERVAL_SECONDS = 3600
+
+
+async def _cleanup_loop() -> None:
+    while True:
+        for cleanup in (geopdf_service.cleanup_old_uploads, layer_metadata.cleanup_old_uploads):
+            try:
+                await asyncio.to_thread(cleanup)
+            except Exception as e:
+                print(f"[CLEANUP] Warning: {cleanup.__module__}.{cleanup.__name__} failed: {e}")
+        await asyncio.sleep(CLEANUP_INTERVAL_SECONDS)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    cleanup_task = asyncio.create_task(_cleanup_loop())
+    try:
+        yield
+    finally:
+        cleanup_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await cleanup_task
 
 
 def create_application() -> FastAPI:
     app = FastAPI(
         title=settings.PROJECT_NAME,
         version=settings.VERSION,
+        lifespan=lifespan,
+        default_response_class=FastJSONResponse,
     )
 
     # ---------- CORS ----------
-    # For Cloudflare tunnel support, set ALLOWED_ORIGINS env var (comma-separated)
-    allowed_origins_env = os.getenv("ALLOWED_ORIGINS", "")
-    if allowed_origins_env:
-        origins = [o.strip() for o in allowed_origins_env.split(",") if o.strip()]
-    else:
-        origins = [
-            "http://localhost:5173",
-            "http://127.0.0.1:5173",
-        ]
-
+    # Starlette's CORSMiddleware is already a pure ASGI middleware that pre-builds its
+    # header dicts at init; a frozenset makes the per-request origin check O(1)
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=origins,      # Explicit origins (not "*") - required for allow_credentials=True
+        allow_origins=_ALLOWED_ORIGINS,  # Explicit origins (not "*") - required for allow_credentials=True
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
@@ -37,48 +109,43 @@ def create_application() -> FastAPI:
 
     # ---------- STATIC FILES ----------
     # Serves PNG overlays located in /static/overlays/*
-    # Make sure "static" folder exists relative to backend working directory
-    app.mount("/static", StaticFiles(directory="static"), name="static")
+    # Make sure "static" folder exists relative to backend working directory.
+    # SendfileStaticFiles lets the server sendfile() the PNGs when it supports it
+    app.mount("/static", SendfileStaticFiles(directory="static"), name="static")
 
     # ---------- ROUTERS ----------
     app.include_router(api_router, prefix="/api/v1")
 
-    # =====================================================
-    # Serve frontend (Vite build)
-    # Repo layout:
-    #   VMRC/
-    #     vmrc-portal-backend/
-    #       app/main.py   <-- this file
-    #     vmrc-portal-frontend/
-    #       dist/
-    # =====================================================
-    FRONTEND_DIST = os.path.abspath(
-        os.path.join(
-            os.path.dirname(__file__),
-            "..", "..", "..",          # app -> backend -> VMRC
-            "vmrc-portal-frontend",
-            "dist",
-        )
-    )
-
-    if os.path.isdir(FRONTEND_DIST):
+    # ---------- FRONTEND (Vite build) ----------
+    if _FRONTEND_DIST_EXISTS:
         assets_dir = os.path.join(FRONTEND_DIST, "assets")
         if os.path.isdir(assets_dir):
-            app.mount("/assets", StaticFiles(directory=assets_dir), name="assets")
+            app.mount("/assets", SendfileStaticFiles(directory=assets_dir), name="assets")
 
-        @app.get("/", include_in_schema=False)
-        def serve_frontend_root():
-            return FileResponse(os.path.join(FRONTEND_DIST, "index.html"))
+        # Read the (immutable) build into memory once; files over the size cap
+        # stay on disk and go through FileResponse
+        frontend_assets = load_frontend_assets(FRONTEND_DIST)
+        index_asset = frontend_assets.get("index.html")
 
-        # Optional SPA fallback: any unknown path should return index.html
-        # (helps React Router if you use it)
-        @app.get("/{full_path:path}", include_in_schema=False)
-        def serve_frontend_spa(full_path: str):
-            candidate = os.path.join(FRONTEND_DIST, full_path)
-            if os.path.isfile(candidate):
-                return FileResponse(candidate)
+        # Plain Starlette route (no FastAPI dependency solving / response
+        # serialization): "/" and any unknown path fall back to index.html
+        # (helps React Router if you use it). Registered last, after the API
+        # router and the static mounts.
+        async def serve_frontend(request: Request):
+            full_path = request.path_params["full_path"]
+            asset = frontend_assets.get(full_path or "index.html")
+            if asset is not None:
+                return cached_asset_response(request, asset)
+            if full_path in _DIST_FILES:
+                return FileResponse(os.path.join(FRONTEND_DIST, full_path))
+            if index_asset is not None:
+                return cached_asset_response(request, index_asset)
             return FileResponse(os.path.join(FRONTEND_DIST, "index.html"))
 
+        app.router.routes.append(
+            Route("/{full_path:path}", serve_frontend, methods=["GET"], include_in_schema=False)
+        )
+
     return app
 
 
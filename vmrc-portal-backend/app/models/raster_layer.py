@@ -10,7 +10,7 @@ You can always extend this later with condition, species, month, etc.
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, Integer, String, Text, func
+from sqlalchemy import DateTime, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base
@@ -20,7 +20,7 @@ class RasterLayer(Base):
     __tablename__ = "raster_layers"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     # Full path or URL to the raster file that rasterio can open
@@ -32,3 +32,9 @@ class RasterLayer(Base):
         server_default=func.now(),
         nullable=False,
     )
+
+    # Newest-first listing: lets ORDER BY created_at DESC LIMIT n read the index
+    # instead of sorting the table
+    __table_args__ = (
+        Index("ix_raster_layers_created_at_desc", created_at.desc()),
+    )
@@ -1,13 +1,11 @@
 # File: app/schemas/project.py
 
-from typing import Optional
-
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class ProjectBase(BaseModel):
     name: str
-    description: Optional[str] = None
+    description: str | None = None
 
 
 class ProjectCreate(ProjectBase):
@@ -15,7 +13,6 @@ class ProjectCreate(ProjectBase):
 
 
 class ProjectRead(ProjectBase):
-    id: int
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
-    class Config:
-        from_attributes = True
+    id: int
@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import datetime
 
 from typing import Dict, List
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 # -----------------------------
@@ -19,13 +19,12 @@ class RasterLayerBase(BaseModel):
 
 
 class RasterLayerRead(RasterLayerBase):
+    # Pydantic v2 equivalent of orm_mode=True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
     id: int
     created_at: datetime
 
-    class Config:
-        # Pydantic v2 equivalent of orm_mode=True
-        from_attributes = True
-
 
 class RasterLayerListResponse(BaseModel):
     items: List[RasterLayerRead]
@@ -1,8 +1,6 @@
 # File: app/schemas/user.py
 
-from typing import Optional
-
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 
 
 class UserBase(BaseModel):
@@ -14,7 +12,6 @@ class UserCreate(UserBase):
 
 
 class UserRead(UserBase):
-    id: int
+    model_config = ConfigDict(from_attributes=True, frozen=True)  # Pydantic v2: replaces orm_mode
 
-    class Config:
-        from_attributes = True  # Pydantic v2: replaces orm_mode
+    id: int
@@ -3,17 +3,19 @@
 GeoPDF service: Export raster to GeoPDF and import GeoPDF to PNG overlay.
 """
 
-import subprocess
 import tempfile
+import time
 import shutil
 from pathlib import Path
 from typing import Dict, Optional, Tuple, List
 import uuid
 import json
-from datetime import datetime, timedelta
+from datetime import datetime
+from functools import lru_cache
 
 import rasterio
 from rasterio.warp import transform_bounds
+from rasterio.windows import Window
 from pyproj import Transformer
 import numpy as np
 from PIL import Image
@@ -29,48 +31,38 @@ MAX_UPLOAD_SIZE = 200 * 1024 * 1024
 UPLOAD_TTL_DAYS = 7
 
 
-def check_gdal_available() -> bool:
-    """Check if GDAL command-line tools are available on the system."""
-    try:
-        result = subprocess.run(
-            ["gdalwarp", "--version"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        return result.returncode == 0
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        return False
+# osgeo.gdal, imported on first use (it loads a large shared library)
+_GDAL = None
+
+
+def _gdal():
+    """Return the osgeo.gdal module, importing it once. Raises ImportError."""
+    global _GDAL
+    if _GDAL is None:
+        from osgeo import gdal
+        gdal.UseExceptions()
+        _GDAL = gdal
+    return _GDAL
 
 
+@lru_cache(maxsize=None)
 def check_gdal_python() -> bool:
-    """Check if GDAL Python bindings are available."""
+    """
+    Check if GDAL Python bindings are available. This is all GeoPDF
+    export/import needs; the result is cached after the first call.
+    """
     try:
-        from osgeo import gdal
+        _gdal()
         return True
     except ImportError:
+        print("ERROR: GDAL Python bindings are not available. GeoPDF export/import requires GDAL.")
+        print("ERROR: Install Python bindings:")
+        print("ERROR:   - OSGeo4W: Install 'gdal-python' package in OSGeo4W setup")
+        print("ERROR:   - Conda: conda install -c conda-forge gdal")
+        print("ERROR:   - Pip: pip install gdal (may need to match system GDAL version)")
         return False
 
 
-HAS_GDAL_CLI = check_gdal_available()
-HAS_GDAL_PYTHON = check_gdal_python()
-HAS_GDAL = HAS_GDAL_CLI and HAS_GDAL_PYTHON
-
-if not HAS_GDAL_CLI:
-    print("ERROR: GDAL command-line tools are not available. GeoPDF export/import requires GDAL.")
-    print("ERROR: Install GDAL: https://gdal.org/download.html")
-    print("ERROR: On Windows: Use OSGeo4W or conda install -c conda-forge gdal")
-    print("ERROR: On Linux: sudo apt-get install gdal-bin")
-    print("ERROR: On macOS: brew install gdal")
-elif not HAS_GDAL_PYTHON:
-    print("ERROR: GDAL Python bindings are not available.")
-    print("ERROR: GDAL CLI is installed, but Python cannot import GDAL.")
-    print("ERROR: Install Python bindings:")
-    print("ERROR:   - OSGeo4W: Install 'gdal-python' package in OSGeo4W setup")
-    print("ERROR:   - Conda: conda install -c conda-forge gdal")
-    print("ERROR:   - Pip: pip install gdal (may need to match system GDAL version)")
-
-
 def export_geopdf(
     raster_path: str,
     aoi_geojson: dict,
@@ -94,7 +86,7 @@ def export_geopdf(
     Raises:
         RuntimeError: If GDAL operations fail
     """
-    if not HAS_GDAL:
+    if not check_gdal_python():
         raise RuntimeError(
             "GDAL is not available. GeoPDF export requires GDAL to be installed. "
             "See installation instructions: https://gdal.org/download.html"
@@ -119,68 +111,51 @@ def export_geopdf(
         
         print(f"[GEOPDF] AOI GeoJSON written to: {aoi_geojson_path}")
         
-        # Step 2: Clip raster to AOI using gdalwarp
-        clipped_tif_path = temp_path / "clipped.tif"
+        gdal = _gdal()
+
+        # Step 2: Clip raster to AOI (in memory; no intermediate GeoTIFF)
         print(f"[GEOPDF] Clipping raster to AOI...")
-        
-        gdalwarp_cmd = [
-            "gdalwarp",
-            "-cutline", str(aoi_geojson_path),
-            "-crop_to_cutline",
-            "-dstalpha",  # Add alpha band for transparency
-            "-of", "GTiff",
-            str(raster_path),
-            str(clipped_tif_path)
-        ]
-        
-        result = subprocess.run(
-            gdalwarp_cmd,
-            capture_output=True,
-            text=True,
-            timeout=300
-        )
-        
-        if result.returncode != 0:
-            error_msg = result.stderr[:500] if result.stderr else str(result)
-            raise RuntimeError(f"gdalwarp failed: {error_msg}")
-        
-        if not clipped_tif_path.exists():
-            raise RuntimeError("Clipped GeoTIFF was not created")
-        
-        print(f"[GEOPDF] Clipped raster saved: {clipped_tif_path}")
-        
-        # Step 3: Convert clipped GeoTIFF to GeoPDF using gdal_translate
+        try:
+            warp_ds = gdal.Warp(
+                "",
+                str(raster_path),
+                format="MEM",
+                cutlineDSName=str(aoi_geojson_path),
+                cropToCutline=True,
+                dstAlpha=True,  # Add alpha band for transparency
+                multithread=True,
+                warpOptions=["NUM_THREADS=ALL_CPUS"],
+            )
+        except RuntimeError as e:
+            raise RuntimeError(f"gdalwarp failed: {str(e)[:500]}")
+
+        # Step 3: Convert clipped raster to GeoPDF
         print(f"[GEOPDF] Converting to GeoPDF...")
-        
-        gdal_translate_cmd = [
-            "gdal_translate",
-            "-of", "PDF",
-            "-co", "GEOREF=YES",  # Enable georeferencing
-            "-co", "DPI=200",
+
+        creation_options = [
+            "GEOREF=YES",  # Enable georeferencing
+            "DPI=200",
         ]
-        
+
         # Add title/author if provided
         if title:
-            gdal_translate_cmd.extend(["-co", f"TITLE={title}"])
+            creation_options.append(f"TITLE={title}")
         if author:
-            gdal_translate_cmd.extend(["-co", f"AUTHOR={author}"])
-        
-        gdal_translate_cmd.extend([
-            str(clipped_tif_path),
-            str(out_pdf_path)
-        ])
-        
-        result = subprocess.run(
-            gdal_translate_cmd,
-            capture_output=True,
-            text=True,
-            timeout=300
-        )
-        
-        if result.returncode != 0:
-            error_msg = result.stderr[:500] if result.stderr else str(result)
-            raise RuntimeError(f"gdal_translate failed: {error_msg}")
-        
+            creation_options.append(f"AUTHOR={author}")
+
+        try:
+            pdf_ds = gdal.Translate(
+                str(out_pdf_path),
+                warp_ds,
+                format="PDF",
+                creationOptions=creation_options,
+            )
+            del pdf_ds  # Close to flush the PDF to disk
+        except RuntimeError as e:
+            raise RuntimeError(f"gdal_translate failed: {str(e)[:500]}")
+        finally:
+            warp_ds = None
+
         if not out_pdf_path.exists():
             raise RuntimeError("GeoPDF was not created")
         
@@ -188,6 +163,88 @@ def export_geopdf(
         return out_pdf_path
 
 
+# Rows per read in _overlay_rgba are sized to roughly this many bytes of float32
+OVERLAY_CHUNK_BYTES = 16 * 1024 * 1024
+
+
+def _overlay_windows(src) -> List[Window]:
+    """
+    Full-width row windows aligned to the raster's block height, each holding
+    about OVERLAY_CHUNK_BYTES of float32 RGB.
+    """
+    block_rows = src.block_shapes[0][0]
+    rows = max(1, OVERLAY_CHUNK_BYTES // (src.width * 3 * 4))
+    rows = max(block_rows, rows // block_rows * block_rows)
+    return [
+        Window(0, row, src.width, min(rows, src.height - row))
+        for row in range(0, src.height, rows)
+    ]
+
+
+def _overlay_rgba(src) -> np.ndarray:
+    """
+    Render an open raster as a (height, width, 4) uint8 RGBA array.
+
+    RGB comes from the first 3 bands (a single band is used as grayscale),
+    each stretched to 0-255 between its min and max over valid pixels (finite
+    and not nodata). Alpha is band 4 if present, else 255, and 0 where band 1
+    is nodata. Two passes over row windows (min/max, then rescale), so only
+    one window of float32 data is in memory at a time.
+    """
+    nodata = src.nodata
+    rgb_indexes = [1, 2, 3] if src.count >= 3 else [1]
+    windows = _overlay_windows(src)
+
+    def read_window(window):
+        block = src.read(rgb_indexes, window=window).astype(np.float32, copy=False)
+        valid = np.isfinite(block)
+        if nodata is not None:
+            valid &= block != nodata
+        return block, valid
+
+    # Pass 1: per-band min / max over valid pixels
+    mins = np.full(len(rgb_indexes), np.inf, dtype=np.float32)
+    maxs = np.full(len(rgb_indexes), -np.inf, dtype=np.float32)
+    for window in windows:
+        block, valid = read_window(window)
+        np.minimum(mins, np.min(block, axis=(1, 2), where=valid, initial=np.inf), out=mins)
+        np.maximum(maxs, np.max(block, axis=(1, 2), where=valid, initial=-np.inf), out=maxs)
+
+    has_valid = mins <= maxs
+    span = maxs - mins
+    stretch = has_valid & (span > 0)
+    constant = np.flatnonzero(has_valid & (span == 0))
+    offset = np.where(stretch, mins, 0.0).astype(np.float32)[:, None, None]
+    scale = np.where(stretch, 255.0 / np.where(stretch, span, 1.0), 1.0).astype(np.float32)[:, None, None]
+
+    # Pass 2: rescale each window straight into the output buffer
+    rgba = np.empty((src.height, src.width, 4), dtype=np.uint8)
+    for window in windows:
+        block, valid = read_window(window)
+        block -= offset
+        block *= scale
+        for i in constant:
+            block[i][valid[i]] = 128  # Gray for constant values
+        np.clip(block, 0, 255, out=block)
+
+        out = rgba[window.toslices()]
+        with np.errstate(invalid="ignore"):
+            if len(rgb_indexes) == 3:
+                out[..., :3] = block.transpose(1, 2, 0)
+            else:
+                out[..., :3] = block[0][..., None]
+        if src.count >= 4:
+            out[..., 3] = src.read(4, window=window)
+        else:
+            out[..., 3] = 255
+        if nodata is not None:
+            # Zero alpha where band 1 is nodata/non-finite, reusing its validity mask
+            alpha = out[..., 3]
+            np.multiply(alpha, valid[0], out=alpha, casting="unsafe")
+
+    return rgba
+
+
 def import_geopdf_to_overlay(
     uploaded_pdf_path: Path,
     out_dir: Path,
@@ -210,7 +267,7 @@ def import_geopdf_to_overlay(
     Raises:
         RuntimeError: If conversion fails
     """
-    if not HAS_GDAL:
+    if not check_gdal_python():
         raise RuntimeError(
             "GDAL is not available. GeoPDF import requires GDAL to be installed. "
             "See installation instructions: https://gdal.org/download.html"
@@ -227,23 +284,13 @@ def import_geopdf_to_overlay(
         extracted_tif_path = temp_path / "extracted.tif"
         print(f"[GEOPDF] Converting GeoPDF to GeoTIFF...")
         
-        gdal_translate_cmd = [
-            "gdal_translate",
-            "-of", "GTiff",
-            str(uploaded_pdf_path),
-            str(extracted_tif_path)
-        ]
-        
-        result = subprocess.run(
-            gdal_translate_cmd,
-            capture_output=True,
-            text=True,
-            timeout=300
-        )
-        
-        if result.returncode != 0:
-            error_msg = result.stderr[:500] if result.stderr else str(result)
-            raise RuntimeError(f"gdal_translate failed: {error_msg}")
+        gdal = _gdal()
+
+        try:
+            tif_ds = gdal.Translate(str(extracted_tif_path), str(uploaded_pdf_path), format="GTiff")
+            del tif_ds  # Close so rasterio sees the complete file
+        except RuntimeError as e:
+            raise RuntimeError(f"gdal_translate failed: {str(e)[:500]}")
         
         if not extracted_tif_path.exists():
             raise RuntimeError("Extracted GeoTIFF was not created")
@@ -258,67 +305,12 @@ def import_geopdf_to_overlay(
             bounds_src = src.bounds
             src_crs = src.crs
             
-            # Read raster data
-            data = src.read()
-            
-            # Handle single band or RGB
-            if len(data.shape) == 3:
-                # Multi-band: use first 3 bands as RGB, or first band if grayscale
-                if data.shape[0] >= 3:
-                    # RGB
-                    band_r = data[0]
-                    band_g = data[1]
-                    band_b = data[2]
-                    # Handle alpha if present
-                    if data.shape[0] >= 4:
-                        alpha = data[3]
-                    else:
-                        alpha = np.ones_like(band_r, dtype=np.uint8) * 255
-                else:
-                    # Grayscale
-                    band_r = data[0]
-                    band_g = data[0]
-                    band_b = data[0]
-                    alpha = np.ones_like(band_r, dtype=np.uint8) * 255
-            else:
-                # Single band
-                band_r = data
-                band_g = data
-                band_b = data
-                alpha = np.ones_like(data, dtype=np.uint8) * 255
-            
-            # Handle nodata
-            nodata = src.nodata
-            if nodata is not None:
-                nodata_mask = (band_r == nodata) | ~np.isfinite(band_r)
-                alpha[nodata_mask] = 0
-            
-            # Normalize to 0-255
-            def normalize_band(band):
-                band = band.astype(np.float32)
-                valid = np.isfinite(band) & (band != nodata if nodata is not None else True)
-                if valid.any():
-                    min_val = np.nanmin(band[valid])
-                    max_val = np.nanmax(band[valid])
-                    if max_val > min_val:
-                        band = (band - min_val) / (max_val - min_val) * 255
-                    else:
-                        band[valid] = 128  # Gray for constant values
-                band = np.clip(band, 0, 255).astype(np.uint8)
-                return band
-            
-            band_r = normalize_band(band_r)
-            band_g = normalize_band(band_g)
-            band_b = normalize_band(band_b)
-            
-            # Stack into RGBA
-            rgba = np.stack([band_r, band_g, band_b, alpha], axis=0)
-            rgba = np.transpose(rgba, (1, 2, 0))  # (height, width, 4)
-            
-            # Save PNG
+            rgba = _overlay_rgba(src)
+
+            # Save PNG. Interactive preview overlay: fast zlib level over file size
             overlay_png_path = out_dir / f"{layer_id}_overlay.png"
             img = Image.fromarray(rgba, mode="RGBA")
-            img.save(overlay_png_path, "PNG")
+            img.save(overlay_png_path, "PNG", compress_level=1, optimize=False)
             
             print(f"[GEOPDF] PNG overlay saved: {overlay_png_path}")
             
@@ -366,7 +358,7 @@ def cleanup_old_uploads() -> int:
     if not GEOPDF_STORAGE_DIR.exists():
         return 0
     
-    cutoff_time = datetime.now() - timedelta(days=UPLOAD_TTL_DAYS)
+    cutoff_time = time.time() - UPLOAD_TTL_DAYS * 86400
     deleted_count = 0
     
     # Clean up layer directories
@@ -375,8 +367,7 @@ def cleanup_old_uploads() -> int:
         for layer_dir in layers_dir.iterdir():
             if layer_dir.is_dir():
                 # Check modification time
-                mtime = datetime.fromtimestamp(layer_dir.stat().st_mtime)
-                if mtime < cutoff_time:
+                if layer_dir.stat().st_mtime < cutoff_time:
                     try:
                         shutil.rmtree(layer_dir)
                         deleted_count += 1
@@ -386,8 +377,7 @@ def cleanup_old_uploads() -> int:
     
     # Clean up old export PDFs
     for pdf_file in GEOPDF_STORAGE_DIR.glob("export_*.pdf"):
-        mtime = datetime.fromtimestamp(pdf_file.stat().st_mtime)
-        if mtime < cutoff_time:
+        if pdf_file.stat().st_mtime < cutoff_time:
             try:
                 pdf_file.unlink()
                 deleted_count += 1
@@ -3,15 +3,48 @@
 """
 Histogram service.
 
-Will:
-  - Open rasters (via rasterio / rio-tiler)
-  - Compute histograms for AOI or full extent
-  - Return bin counts and ranges
+  - Opens a raster with rasterio
+  - Computes a histogram for an AOI (EPSG:4326 GeoJSON) or the full extent
+  - Returns bin counts and the value range
 
-Currently just stubbed out.
+The raster is streamed in row windows (two passes: range, then counts), so
+memory stays at one window regardless of raster size.
 """
 
-from typing import Any, Sequence
+from typing import Any, Iterator
+
+import numpy as np
+import rasterio
+from rasterio.errors import WindowError
+from rasterio.features import geometry_mask, geometry_window
+from rasterio.warp import transform_geom
+from rasterio.windows import Window
+from rasterio.windows import transform as window_transform
+
+# Rows per read are sized to roughly this many bytes of float64
+HIST_CHUNK_BYTES = 16 * 1024 * 1024
+
+
+def _row_windows(src, window: Window) -> Iterator[Window]:
+    """
+    Full-width row stripes of ``window``, sized to about HIST_CHUNK_BYTES and
+    rounded to the raster's block height.
+    """
+    block_rows = src.block_shapes[0][0]
+    width, height = int(window.width), int(window.height)
+    rows = max(1, HIST_CHUNK_BYTES // (max(width, 1) * 8))
+    rows = max(block_rows, rows // block_rows * block_rows)
+    for row in range(0, height, rows):
+        yield Window(window.col_off, window.row_off + row, width, min(rows, height - row))
+
+
+def _empty_histogram(bins: int, aoi_applied: bool) -> dict[str, Any]:
+    return {
+        "bins": bins,
+        "counts": [0] * bins,
+        "range": (0.0, 1.0),
+        "aoi_applied": aoi_applied,
+    }
 
 
 def compute_histogram(
@@ -21,13 +54,67 @@ def compute_histogram(
     aoi_geojson: dict | None = None,
 ) -> dict[str, Any]:
     """
-    Placeholder histogram computation.
-
-    We'll implement this with rasterio / numpy once you give the go-ahead.
+    Histogram of band 1 over valid pixels (finite and not nodata), optionally
+    restricted to ``aoi_geojson`` (Feature or Geometry, EPSG:4326). ``bins``
+    equal-width bins span the valid [min, max]; counts are empty (all zero)
+    with range (0.0, 1.0) when no pixel is valid.
     """
+    with rasterio.open(raster_path) as src:
+        nodata = src.nodata
+        window = Window(0, 0, src.width, src.height)
+        inside = None
+
+        if aoi_geojson is not None:
+            geom = aoi_geojson["geometry"] if aoi_geojson.get("type") == "Feature" else aoi_geojson
+            geom = transform_geom("EPSG:4326", src.crs, geom)
+            # Read only the AOI's bounding window; rasterize the AOI once for it
+            try:
+                window = geometry_window(src, [geom])
+            except WindowError:
+                # AOI doesn't overlap the raster: no valid pixels
+                return _empty_histogram(bins, True)
+            inside = ~geometry_mask(
+                [geom],
+                out_shape=(int(window.height), int(window.width)),
+                transform=window_transform(window, src.transform),
+            )
+
+        windows = list(_row_windows(src, window))
+
+        def read_valid(win: Window) -> np.ndarray:
+            block = src.read(1, window=win).astype(np.float64, copy=False)
+            valid = np.isfinite(block)
+            if nodata is not None:
+                valid &= block != nodata
+            if inside is not None:
+                row = int(win.row_off - window.row_off)
+                valid &= inside[row:row + int(win.height)]
+            return block[valid]
+
+        # Pass 1: value range
+        lo, hi = np.inf, -np.inf
+        for win in windows:
+            values = read_valid(win)
+            if values.size:
+                lo = min(lo, float(values.min()))
+                hi = max(hi, float(values.max()))
+
+        if lo > hi:
+            return _empty_histogram(bins, aoi_geojson is not None)
+
+        # Pass 2: fold per-window bin counts
+        counts = np.zeros(bins, dtype=np.int64)
+        scale = bins / (hi - lo) if hi > lo else 0.0
+        for win in windows:
+            values = read_valid(win)
+            if values.size:
+                idx = ((values - lo) * scale).astype(np.int64)
+                np.clip(idx, 0, bins - 1, out=idx)
+                counts += np.bincount(idx, minlength=bins)
+
     return {
         "bins": bins,
-        "counts": [0] * bins,
-        "range": (0.0, 1.0),
+        "counts": counts.tolist(),
+        "range": (lo, hi),
         "aoi_applied": aoi_geojson is not None,
     }
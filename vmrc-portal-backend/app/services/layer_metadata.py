@@ -5,14 +5,35 @@ for raster layers and imported GeoPDF layers.
 """
 
 import json
+import math
+import os
+import sys
+import threading
 import numpy as np
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 import rasterio
-from rasterio.warp import transform_bounds, array_bounds
+from rasterio.windows import Window, subdivide
+from rasterio.enums import Resampling
+from rasterio.warp import array_bounds
 from pyproj import Transformer
 import shutil
+import time
+
+from app.gis import _stats_kernel
+from app.gis._stats_kernel import EMPTY_MOMENTS, band_moments, merge_moments
+
+# Fast JSON serialization (optional)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 # Storage base directory
 STORAGE_BASE = Path("storage")
@@ -35,6 +56,216 @@ def ensure_layer_dir(layer_id: str) -> Path:
     return layer_dir
 
 
+# Threads reading windows concurrently in compute_raster_stats
+STATS_READ_WORKERS = min(8, os.cpu_count() or 1)
+
+
+def _read_windows_parallel(raster_path: Path, windows: List[Window]) -> Iterator[np.ndarray]:
+    """
+    Yield band 1 for each window, in order, while a thread pool reads ahead.
+
+    rasterio dataset handles aren't thread-safe, so each worker opens its own.
+    At most 2 * STATS_READ_WORKERS windows are in flight, which bounds memory.
+    The caller consumes results on its own thread (the Numba kernel is not
+    called concurrently).
+    """
+    local = threading.local()
+    handles = []
+    handles_lock = threading.Lock()
+
+    def read(window: Window) -> np.ndarray:
+        src = getattr(local, "src", None)
+        if src is None:
+            src = local.src = rasterio.open(raster_path)
+            with handles_lock:
+                handles.append(src)
+        return src.read(1, window=window)
+
+    try:
+        with ThreadPoolExecutor(max_workers=STATS_READ_WORKERS) as pool:
+            remaining = iter(windows)
+            pending = deque(pool.submit(read, w) for w in islice(remaining, 2 * STATS_READ_WORKERS))
+            while pending:
+                data = pending.popleft().result()
+                nxt = next(remaining, None)
+                if nxt is not None:
+                    pending.append(pool.submit(read, nxt))
+                yield data
+    finally:
+        for src in handles:
+            src.close()
+
+
+# Upper bound on bytes per stripe when the file isn't tiled
+STATS_STRIPE_BYTES = 64_000_000
+
+
+def _stats_windows(src) -> List[Window]:
+    """
+    Read windows matching the file layout: the native tiles of a tiled
+    GeoTIFF (each tile is decompressed exactly once), otherwise full-width
+    stripes of whole blocks capped at STATS_STRIPE_BYTES.
+    """
+    if src.profile.get("tiled"):
+        return [window for _, window in src.block_windows(1)]
+
+    block_rows = src.block_shapes[0][0]
+    itemsize = np.dtype(src.dtypes[0]).itemsize
+    rows = max(1, STATS_STRIPE_BYTES // src.width // itemsize)
+    rows = min(src.height, max(block_rows, rows // block_rows * block_rows))
+    return list(subdivide(Window(0, 0, src.width, src.height), rows, src.width))
+
+
+def _mmap_band(src) -> Optional[np.ndarray]:
+    """
+    Band 1 memory-mapped straight from the file, or None when the layout
+    doesn't allow it. Only uncompressed, stripped GeoTIFFs qualify, with
+    band 1's strips stored back to back in native byte order; everything
+    else goes through GDAL reads.
+    """
+    if src.driver != "GTiff" or not os.path.isfile(src.name):
+        return None
+    if src.profile.get("compress") or src.profile.get("tiled"):
+        return None
+    if src.count > 1 and src.tags(ns="IMAGE_STRUCTURE").get("INTERLEAVE") != "BAND":
+        return None
+    if "NBITS" in src.tags(1, ns="IMAGE_STRUCTURE"):
+        return None
+
+    height, width = src.height, src.width
+    block_rows = src.block_shapes[0][0]
+    row_bytes = width * np.dtype(src.dtypes[0]).itemsize
+    first = src.get_tag_item("BLOCK_OFFSET_0_0", "TIFF", bidx=1)
+    if not first:
+        return None
+    first = int(first)
+    # GDAL may write strips out of order; every strip must follow the previous one
+    for i in range(1, math.ceil(height / block_rows)):
+        offset = src.get_tag_item(f"BLOCK_OFFSET_0_{i}", "TIFF", bidx=1)
+        if not offset or int(offset) != first + i * block_rows * row_bytes:
+            return None
+    if first + height * row_bytes > os.path.getsize(src.name):
+        return None
+
+    with open(src.name, "rb") as f:
+        if f.read(2) != (b"II" if sys.byteorder == "little" else b"MM"):
+            return None
+
+    mm = np.memmap(src.name, dtype=src.dtypes[0], mode="r", offset=first, shape=(height, width))
+    return mm.view(np.ndarray)
+
+
+# Rasters above this many pixels are read in windows (or an overview) for stats
+STATS_WINDOWED_MIN_PIXELS = 10_000_000
+
+# Overview stats: use the finest overview with at most this many pixels
+STATS_OVERVIEW_MAX_PIXELS = 2_000_000
+
+
+def _stats_overview_factor(src) -> Optional[int]:
+    """
+    Decimation factor of the overview to sample stats from, or None to read
+    the full-resolution data (small raster, or no overviews).
+    """
+    if src.height * src.width <= STATS_WINDOWED_MIN_PIXELS:
+        return None
+    factors = sorted(src.overviews(1))
+    if not factors:
+        return None
+    for factor in factors:
+        if (src.height // factor) * (src.width // factor) <= STATS_OVERVIEW_MAX_PIXELS:
+            return factor
+    return factors[-1]
+
+
+def _stats_error(nodata: Optional[float]) -> Dict[str, Any]:
+    return {
+        "min": None,
+        "max": None,
+        "mean": None,
+        "std": None,
+        "nodata": nodata,
+        "count": 0
+    }
+
+
+def _raster_stats(src, nodata: Optional[float] = None) -> Dict[str, Any]:
+    """
+    compute_raster_stats() for an open dataset.
+    """
+    try:
+        # Get nodata from raster if not provided
+        if nodata is None:
+            nodata = src.nodata
+        
+        # Get raster dimensions
+        height, width = src.height, src.width
+        
+        # Single-pass Welford moments per read; windows are merged without
+        # ever collecting the valid pixels themselves
+        moments = EMPTY_MOMENTS
+        exact = True
+        overview_factor = _stats_overview_factor(src)
+        if overview_factor is not None:
+            # One decimated read served from the file's overview
+            out_shape = (
+                math.ceil(height / overview_factor),
+                math.ceil(width / overview_factor),
+            )
+            sample = np.empty(out_shape, dtype=src.dtypes[0])
+            src.read(1, out=sample, resampling=Resampling.nearest)
+            moments = band_moments(sample, nodata)
+            exact = False
+        elif height * width > STATS_WINDOWED_MIN_PIXELS:
+            mapped = _mmap_band(src)
+            if mapped is not None:
+                if _stats_kernel.HAS_NUMBA:
+                    # Uncompressed and contiguous: the Numba kernel walks the
+                    # page-cache pages directly, with no GDAL copy
+                    moments = band_moments(mapped, nodata)
+                else:
+                    # The NumPy fallback builds full-size masks/temporaries,
+                    # so feed it one stripe of the mapping at a time
+                    for window in _stats_windows(src):
+                        stripe = mapped[window.toslices()]
+                        moments = merge_moments(moments, band_moments(stripe, nodata))
+                del mapped
+            else:
+                # Windowed reading; GDAL reads/decompression run on a thread pool
+                windows = _stats_windows(src)
+                for window_data in _read_windows_parallel(src.name, windows):
+                    moments = merge_moments(moments, band_moments(window_data, nodata))
+        else:
+            # Read entire array for small rasters
+            moments = band_moments(src.read(1), nodata)
+        
+        count, mean, m2, vmin, vmax = moments
+        if count == 0:
+            return {
+                "min": None,
+                "max": None,
+                "mean": None,
+                "std": None,
+                "nodata": nodata,
+                "count": 0,
+                "exact": exact
+            }
+        
+        return {
+            "min": vmin,
+            "max": vmax,
+            "mean": mean,
+            "std": math.sqrt(m2 / count),
+            "nodata": nodata,
+            "count": count,
+            "exact": exact
+        }
+    
+    except Exception as e:
+        print(f"[METADATA] Error computing raster stats: {e}")
+        return _stats_error(nodata)
+
+
 def compute_raster_stats(
     raster_path: Path,
     window_size: int = 1024,
@@ -45,108 +276,60 @@ def compute_raster_stats(
     
     Args:
         raster_path: Path to raster file
-        window_size: Size of windows for sampling (default 1024x1024)
+        window_size: Unused; windows follow the file's block layout (kept for callers)
         nodata: NODATA value to exclude (if None, read from raster)
     
     Returns:
-        Dict with min, max, mean, std, nodata, count
+        Dict with min, max, mean, std, nodata, count, exact. For rasters over
+        10M pixels that have overviews, stats come from one overview read
+        (<= STATS_OVERVIEW_MAX_PIXELS samples) and ``exact`` is False;
+        ``count`` is then the number of sampled pixels.
     """
     try:
         with rasterio.open(raster_path) as src:
-            # Get nodata from raster if not provided
-            if nodata is None:
-                nodata = src.nodata
-            
-            # Get raster dimensions
-            height, width = src.height, src.width
-            
-            # For large rasters, sample with windows
-            # For small rasters, read entire array
-            if height * width > 10_000_000:  # > 10M pixels
-                # Windowed reading
-                values = []
-                for i in range(0, height, window_size):
-                    for j in range(0, width, window_size):
-                        window = rasterio.windows.Window(
-                            j, i,
-                            min(window_size, width - j),
-                            min(window_size, height - i)
-                        )
-                        window_data = src.read(1, window=window)
-                        
-                        # Apply mask if nodata exists
-                        if nodata is not None:
-                            valid = (window_data != nodata) & np.isfinite(window_data)
-                        else:
-                            valid = np.isfinite(window_data)
-                        
-                        if valid.any():
-                            values.append(window_data[valid].astype(np.float64))
-                
-                if not values:
-                    return {
-                        "min": None,
-                        "max": None,
-                        "mean": None,
-                        "std": None,
-                        "nodata": nodata,
-                        "count": 0
-                    }
-                
-                # Combine all values
-                all_values = np.concatenate(values)
-            else:
-                # Read entire array for small rasters
-                data = src.read(1).astype(np.float64)
-                
-                # Apply mask
-                if nodata is not None:
-                    valid = (data != nodata) & np.isfinite(data)
-                else:
-                    valid = np.isfinite(data)
-                
-                if not valid.any():
-                    return {
-                        "min": None,
-                        "max": None,
-                        "mean": None,
-                        "std": None,
-                        "nodata": nodata,
-                        "count": 0
-                    }
-                
-                all_values = data[valid]
-            
-            # Compute stats
-            if all_values.size == 0:
-                return {
-                    "min": None,
-                    "max": None,
-                    "mean": None,
-                    "std": None,
-                    "nodata": nodata,
-                    "count": 0
-                }
-            
-            return {
-                "min": float(np.min(all_values)),
-                "max": float(np.max(all_values)),
-                "mean": float(np.mean(all_values)),
-                "std": float(np.std(all_values)),
-                "nodata": nodata,
-                "count": int(all_values.size)
-            }
+            return _raster_stats(src, nodata)
     
     except Exception as e:
         print(f"[METADATA] Error computing raster stats: {e}")
+        return _stats_error(nodata)
+
+
+@lru_cache(maxsize=256)
+def _transformer_to_4326(crs_wkt: str) -> Transformer:
+    """
+    Cached raster CRS -> EPSG:4326 (lon/lat order) transformer.
+    """
+    return Transformer.from_crs(crs_wkt, "EPSG:4326", always_xy=True)
+
+
+def _bounds_4326(src) -> Optional[Dict[str, float]]:
+    """
+    compute_raster_bounds_4326() for an open dataset.
+    """
+    try:
+        raster_crs = src.crs
+        bounds = src.bounds  # (left, bottom, right, top) in raster CRS
+        
+        # Transform to EPSG:4326 (same densified edges as
+        # rasterio.warp.transform_bounds, with a cached PROJ pipeline)
+        bounds_4326 = _transformer_to_4326(raster_crs.to_wkt()).transform_bounds(
+            bounds.left,
+            bounds.bottom,
+            bounds.right,
+            bounds.top,
+            densify_pts=21
+        )
+        
         return {
-            "min": None,
-            "max": None,
-            "mean": None,
-            "std": None,
-            "nodata": nodata,
-            "count": 0
+            "west": float(bounds_4326[0]),
+            "south": float(bounds_4326[1]),
+            "east": float(bounds_4326[2]),
+            "north": float(bounds_4326[3])
         }
+    
+    except Exception as e:
+        print(f"[METADATA] Error computing bounds: {e}")
+        return None
 
 
 def compute_raster_bounds_4326(raster_path: Path) -> Optional[Dict[str, float]]:
@@ -158,32 +341,37 @@ def compute_raster_bounds_4326(raster_path: Path) -> Optional[Dict[str, float]]:
     """
     try:
         with rasterio.open(raster_path) as src:
-            raster_crs = src.crs
-            bounds = src.bounds  # (left, bottom, right, top) in raster CRS
-            
-            # Transform to EPSG:4326
-            bounds_4326 = transform_bounds(
-                raster_crs,
-                "EPSG:4326",
-                bounds.left,
-                bounds.bottom,
-                bounds.right,
-                bounds.top,
-                densify_pts=21
-            )
-            
-            return {
-                "west": float(bounds_4326[0]),
-                "south": float(bounds_4326[1]),
-                "east": float(bounds_4326[2]),
-                "north": float(bounds_4326[3])
-            }
+            return _bounds_4326(src)
     
     except Exception as e:
         print(f"[METADATA] Error computing bounds: {e}")
         return None
 
 
+def _pixel_size(src) -> Tuple[float, float]:
+    """
+    Pixel size in meters of an open dataset (see compute_pixel_size).
+    """
+    transform = src.transform
+    crs = src.crs
+    
+    # Get pixel size in CRS units
+    x_res = abs(transform[0])
+    y_res = abs(transform[4])
+    
+    # If CRS is geographic (lat/lon), convert to meters
+    if crs and crs.is_geographic:
+        # Approximate conversion at center of raster
+        center_lat = (src.bounds.top + src.bounds.bottom) / 2
+        # 1 degree lat ≈ 111,320 m
+        # 1 degree lon ≈ 111,320 * cos(lat) m
+        lat_m = 111320.0
+        lon_m = 111320.0 * math.cos(math.radians(center_lat))
+        return (float(x_res * lon_m), float(y_res * lat_m))
+    # Assume already in meters (or CRS units)
+    return (float(x_res), float(y_res))
+
+
 def compute_pixel_size(raster_path: Path) -> Optional[Tuple[float, float]]:
     """
     Compute pixel size in meters.
@@ -193,27 +381,7 @@ def compute_pixel_size(raster_path: Path) -> Optional[Tuple[float, float]]:
     """
     try:
         with rasterio.open(raster_path) as src:
-            transform = src.transform
-            crs = src.crs
-            
-            # Get pixel size in CRS units
-            x_res = abs(transform[0])
-            y_res = abs(transform[4])
-            
-            # If CRS is geographic (lat/lon), convert to meters
-            if crs and crs.is_geographic:
-                # Approximate conversion at center of raster
-                center_lat = (src.bounds.top + src.bounds.bottom) / 2
-                # 1 degree lat ≈ 111,320 m
-                # 1 degree lon ≈ 111,320 * cos(lat) m
-                lat_m = 111320.0
-                lon_m = 111320.0 * np.cos(np.radians(center_lat))
-                x_res_m = x_res * lon_m
-                y_res_m = y_res * lat_m
-                return (float(x_res_m), float(y_res_m))
-            else:
-                # Assume already in meters (or CRS units)
-                return (float(x_res), float(y_res))
+            return _pixel_size(src)
     
     except Exception as e:
         print(f"[METADATA] Error computing pixel size: {e}")
@@ -245,12 +413,53 @@ def create_raster_metadata(
     
     Returns:
         Metadata dict
+    
+    If the layer's saved metadata was computed from this same file and the
+    file's mtime is unchanged, its stats, bounds, pixel size and CRS are
+    reused instead of scanning the raster again.
     """
-    # Compute stats
-    stats = compute_raster_stats(raster_path)
+    source_path = str(Path(raster_path).absolute())
+    try:
+        source_mtime = os.stat(raster_path).st_mtime
+    except OSError:
+        source_mtime = None
+    
+    existing = load_metadata(layer_id) if source_mtime is not None else None
+    if (
+        existing
+        and existing.get("source_path") == source_path
+        and existing.get("source_mtime") == source_mtime
+    ):
+        print(f"[METADATA] Reusing computed metadata for {layer_id} (source unchanged)")
+        return {
+            **existing,
+            "layer_id": layer_id,
+            "title": title,
+            "summary": summary,
+            "tags": tags or [],
+            "credits": credits,
+            "units": units,
+            "source_type": source_type,
+        }
+    
+    # Stats, bounds, pixel size and CRS all come from a single open
+    stats = None
+    bounds_dict = None
+    pixel_size = None
+    try:
+        with rasterio.open(raster_path) as src:
+            stats = _raster_stats(src)
+            bounds_dict = _bounds_4326(src)
+            try:
+                pixel_size = _pixel_size(src)
+            except Exception as e:
+                print(f"[METADATA] Error computing pixel size: {e}")
+            crs_str = str(src.crs) if src.crs else "EPSG:4326"
+    except Exception as e:
+        print(f"[METADATA] Error opening raster {raster_path}: {e}")
+        stats = _stats_error(None)
+        crs_str = "EPSG:4326"
     
-    # Compute bounds
-    bounds_dict = compute_raster_bounds_4326(raster_path)
     bounds_array = None
     if bounds_dict:
         bounds_array = [
@@ -258,16 +467,6 @@ def create_raster_metadata(
             [bounds_dict["north"], bounds_dict["east"]]
         ]
     
-    # Compute pixel size
-    pixel_size = compute_pixel_size(raster_path)
-    
-    # Get CRS
-    try:
-        with rasterio.open(raster_path) as src:
-            crs_str = str(src.crs) if src.crs else "EPSG:4326"
-    except:
-        crs_str = "EPSG:4326"
-    
     metadata = {
         "layer_id": layer_id,
         "title": title,
@@ -280,20 +479,47 @@ def create_raster_metadata(
         "pixel_size": list(pixel_size) if pixel_size else None,
         "stats": stats,
         "created_at": datetime.utcnow().isoformat() + "Z",
-        "source_type": source_type
+        "source_type": source_type,
+        "source_path": source_path,
+        "source_mtime": source_mtime
     }
     
     return metadata
 
 
+def _dumps_metadata(metadata: Dict[str, Any]) -> bytes:
+    """UTF-8 JSON, 2-space indented (orjson when available; NumPy values allowed)."""
+    if HAS_ORJSON:
+        return orjson.dumps(metadata, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(metadata, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _loads_metadata(data: bytes) -> Dict[str, Any]:
+    return orjson.loads(data) if HAS_ORJSON else json.loads(data)
+
+
 def save_metadata(layer_id: str, metadata: Dict[str, Any]) -> bool:
     """Save metadata to layer directory."""
     try:
         layer_dir = ensure_layer_dir(layer_id)
         metadata_path = layer_dir / "metadata.json"
         
-        with open(metadata_path, "w", encoding="utf-8") as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        # Write a temp file and rename it over the old one, so a crash
+        # mid-write never leaves a truncated metadata.json behind
+        tmp_path = layer_dir / "metadata.json.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_dumps_metadata(metadata))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, metadata_path)
+        
+        # Persist the rename itself (directories can't be opened on Windows)
+        if hasattr(os, "O_DIRECTORY"):
+            dir_fd = os.open(layer_dir, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
         
         print(f"[METADATA] Saved metadata for layer {layer_id}")
         return True
@@ -309,14 +535,11 @@ def load_metadata(layer_id: str) -> Optional[Dict[str, Any]]:
         layer_dir = get_layer_dir(layer_id)
         metadata_path = layer_dir / "metadata.json"
         
-        if not metadata_path.exists():
-            return None
-        
-        with open(metadata_path, "r", encoding="utf-8") as f:
-            metadata = json.load(f)
-        
-        return metadata
+        # One open + read; a missing file is the common "no metadata" case
+        return _loads_metadata(metadata_path.read_bytes())
     
+    except FileNotFoundError:
+        return None
     except Exception as e:
         print(f"[METADATA] Error loading metadata: {e}")
         return None
@@ -327,47 +550,50 @@ def cleanup_old_uploads():
     if not LAYERS_DIR.exists():
         return
     
-    now = datetime.utcnow().timestamp()
+    now = time.time()
     deleted_count = 0
     
-    for layer_dir in LAYERS_DIR.iterdir():
-        if not layer_dir.is_dir():
-            continue
-        
-        # Only clean up upload layers
-        if not layer_dir.name.startswith("upload_"):
-            continue
-        
-        metadata_path = layer_dir / "metadata.json"
-        if not metadata_path.exists():
-            # Check directory modification time
-            dir_mtime = layer_dir.stat().st_mtime
-            age_seconds = now - dir_mtime
-            if age_seconds > UPLOAD_TTL_SECONDS:
-                try:
-                    shutil.rmtree(layer_dir)
-                    deleted_count += 1
-                    print(f"[METADATA] Cleaned up old layer: {layer_dir.name}")
-                except Exception as e:
-                    print(f"[METADATA] Error cleaning up {layer_dir.name}: {e}")
-            continue
-        
-        try:
-            with open(metadata_path, "r") as f:
-                metadata = json.load(f)
+    with os.scandir(LAYERS_DIR) as it:
+        for entry in it:
+            # Only clean up upload layers
+            if not entry.name.startswith("upload_") or not entry.is_dir(follow_symlinks=False):
+                continue
             
-            created_at_str = metadata.get("created_at", "")
-            if created_at_str:
-                created_at = datetime.fromisoformat(created_at_str.replace("Z", "+00:00"))
-                age_seconds = now - created_at.timestamp()
-                
+            # Prefilter on directory mtime (from the scandir entry, no open):
+            # a layer written to within the last TTL - 1 day is kept without
+            # reading its JSON
+            age_seconds = now - entry.stat(follow_symlinks=False).st_mtime
+            if age_seconds < UPLOAD_TTL_SECONDS - 86400:
+                continue
+            
+            layer_dir = Path(entry.path)
+            metadata_path = layer_dir / "metadata.json"
+            if not metadata_path.exists():
+                # Directory modification time is all we have
                 if age_seconds > UPLOAD_TTL_SECONDS:
-                    shutil.rmtree(layer_dir)
-                    deleted_count += 1
-                    print(f"[METADATA] Cleaned up old layer: {layer_dir.name}")
-        
-        except Exception as e:
-            print(f"[METADATA] Error checking {layer_dir.name}: {e}")
+                    try:
+                        shutil.rmtree(layer_dir)
+                        deleted_count += 1
+                        print(f"[METADATA] Cleaned up old layer: {entry.name}")
+                    except Exception as e:
+                        print(f"[METADATA] Error cleaning up {entry.name}: {e}")
+                continue
+            
+            # Borderline: metadata created_at is authoritative
+            try:
+                metadata = _loads_metadata(metadata_path.read_bytes())
+                
+                created_at_str = metadata.get("created_at", "")
+                if created_at_str:
+                    created_at = datetime.fromisoformat(created_at_str.replace("Z", "+00:00"))
+                    
+                    if now - created_at.timestamp() > UPLOAD_TTL_SECONDS:
+                        shutil.rmtree(layer_dir)
+                        deleted_count += 1
+                        print(f"[METADATA] Cleaned up old layer: {entry.name}")
+            
+            except Exception as e:
+                print(f"[METADATA] Error checking {entry.name}: {e}")
     
     if deleted_count > 0:
         print(f"[METADATA] Cleaned up {deleted_count} old layer directories")
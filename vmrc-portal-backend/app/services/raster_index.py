@@ -1,25 +1,81 @@
 # app/services/raster_index.py
+import logging
+import os
+import pickle
 from pathlib import Path
 import hashlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
 
 # NEW ROOT FOLDER
 RASTER_ROOT = Path(r"D:\VMRC_Project\Data_Analysis!!\Nov20")
 
+# On-disk copy of the discovered index (see load_raster_index)
+RASTER_INDEX_CACHE = Path("storage/raster_index.pkl")
+# Bump when the item format or id scheme changes
+RASTER_INDEX_CACHE_VERSION = 2
+
 RASTER_LOOKUP_LIST = []
 
+# Filename patterns, matched like the former Path.rglob() patterns: through
+# os.path.normcase, i.e. case-insensitively on Windows and exactly elsewhere
+_TIF_SUFFIX = os.path.normcase(".tif")
+_MORTALITY_PREFIX = os.path.normcase("M2.5_")
+_MORTALITY_DF_PREFIX = os.path.normcase("M2.5_DF_")
+_HSL_DF_PREFIX = os.path.normcase("HSL2.5_DF_")
+_HSL_WH_PREFIX = os.path.normcase("HSL_")
+
 
 def generate_stable_id(file_path: Path) -> int:
     """
     Generate a stable integer ID from file path using hash.
     Uses first 8 bytes of SHA256 hash converted to unsigned int.
     """
-    path_str = str(file_path.absolute()).lower()
+    return _stable_id_for_abs_path(str(file_path.absolute()))
+
+
+def _stable_id_for_abs_path(abs_path: str) -> int:
+    """
+    generate_stable_id() for a path string that is already absolute.
+    """
+    path_str = abs_path.lower()
     hash_bytes = hashlib.sha256(path_str.encode()).digest()[:8]
     # Convert to unsigned int (0 to 2^64-1), then take modulo to keep reasonable size
     return int.from_bytes(hash_bytes, byteorder='big') % (2**31 - 1)
 
 
-def discover_rasters():
+def _walk_tif_dirs(base: Path, dir_mtimes: Dict[str, int]) -> Iterator[Tuple[str, List[str]]]:
+    """
+    Yield (dirpath, .tif filenames) for each directory under ``base`` that
+    holds .tif files, reading each directory once, so per-directory checks
+    run once rather than per file. Each directory's mtime_ns is recorded in
+    ``dir_mtimes`` before it is listed, so a change made during the scan
+    invalidates the on-disk index cache instead of being baked into it.
+    """
+    stack = [str(base)]
+    while stack:
+        dirpath = stack.pop()
+        try:
+            dir_mtimes[dirpath] = os.stat(dirpath).st_mtime_ns
+            with os.scandir(dirpath) as entries:
+                subdirs = []
+                filenames = []
+                for entry in entries:
+                    if entry.is_dir():
+                        subdirs.append(entry.path)
+                    elif os.path.normcase(entry.name).endswith(_TIF_SUFFIX):
+                        filenames.append(entry.name)
+        except OSError as e:
+            print(f"[WARNING] Could not scan {dirpath}: {e}")
+            continue
+        if filenames:
+            yield dirpath, filenames
+        # Depth-first, in listing order
+        stack.extend(reversed(subdirs))
+
+
+def discover_rasters(dir_mtimes: Optional[Dict[str, int]] = None):
     r"""
     Discover all raster files in the new directory structure.
     
@@ -46,11 +102,17 @@ def discover_rasters():
         - cover in {0,25,50,75,100}
         - COND is DRY/WET/NORMAL (full words)
     
+    Each dataset folder is walked once (see _walk_tif_dirs) and files are
+    matched by filename prefix. If ``dir_mtimes`` is given, it is filled with
+    the mtime of every directory read (used as the on-disk cache key).
+    
     Returns list of raster items with {id, name, path, dataset_type}
     - name: filename without extension (e.g., "M2.5_DF_D04_h", "M2.5_D04", "HSL2.5_DF_25_D_h", "HSL_0_DRY")
     - dataset_type: "mortality" for A1 and A2, "hsl" for B1 and B2
     """
     raster_list = []
+    if dir_mtimes is None:
+        dir_mtimes = {}
     mortality_count = 0
     hsl_count = 0
     
@@ -59,57 +121,69 @@ def discover_rasters():
         print(f"[WARNING] Please verify the path is correct")
         return raster_list
     
+    # Catches dataset folders being created or removed under the root
+    dir_mtimes[str(RASTER_ROOT)] = RASTER_ROOT.stat().st_mtime_ns
+    
     print(f"\n[INFO] Starting raster discovery...")
     print(f"[INFO] Root directory: {RASTER_ROOT}")
     
+    # Made absolute once; everything under it is then absolute too
+    raster_root = RASTER_ROOT.absolute()
+    
     # Dataset A: Monthly Mortality rasters
     # A1) DF Mortality: {ROOT}/Mortality-DEC30/Douglas_Fir/{Cover}/{StressClass}/M2.5_DF_*.tif
-    mortality_df_base = RASTER_ROOT / "Mortality-DEC30"
+    mortality_df_base = raster_root / "Mortality-DEC30"
     # A2) WH Mortality: {ROOT}/Mortality2.5-Dec26/Western_Hemlock/{Cover}/M2.5_{COND_INIT}{MM}.tif
-    mortality_wh_base = RASTER_ROOT / "Mortality2.5-Dec26"
+    mortality_wh_base = raster_root / "Mortality2.5-Dec26"
+    
+    def add_raster(dirpath: str, filename: str, dataset_type: str) -> None:
+        # dirpath is absolute (the walk starts from raster_root), so the
+        # joined path is used as-is for both the id and the "path" field
+        abs_path = os.path.join(dirpath, filename)
+        raster_list.append({
+            "id": _stable_id_for_abs_path(abs_path),
+            "name": os.path.splitext(filename)[0],  # filename without extension (e.g., M2.5_DF_D04_h)
+            "path": abs_path,
+            "dataset_type": dataset_type
+        })
     
     print(f"[INFO] Scanning Monthly Mortality rasters...")
     
     # A1) DF Mortality rasters (M2.5_DF_*.tif in nested structure)
     if mortality_df_base.exists():
         print(f"[INFO] Scanning DF Mortality rasters in: {mortality_df_base}")
-        for tif_file in mortality_df_base.rglob("M2.5_DF_*.tif"):
+        for dirpath, filenames in _walk_tif_dirs(mortality_df_base, dir_mtimes):
             # Skip if this is in HighStressMortality folder (those are HSL rasters)
-            if "HighStressMortality" in str(tif_file):
+            if "HighStressMortality" in dirpath:
                 continue
-            raster_id = generate_stable_id(tif_file)
-            raster_list.append({
-                "id": raster_id,
-                "name": tif_file.stem,  # filename without extension (e.g., M2.5_DF_D04_h)
-                "path": str(tif_file.absolute()),
-                "dataset_type": "mortality"
-            })
-            mortality_count += 1
+            for filename in filenames:
+                if os.path.normcase(filename).startswith(_MORTALITY_DF_PREFIX):
+                    add_raster(dirpath, filename, "mortality")
+                    mortality_count += 1
     else:
         print(f"[WARNING] DF Mortality base directory not found: {mortality_df_base}")
     
     # A2) WH Mortality rasters (M2.5_{COND_INIT}{MM}.tif in Western_Hemlock/{Cover}/ folders)
     # Path: {ROOT}/Mortality2.5-Dec26/Western_Hemlock/{Cover}/M2.5_{COND_INIT}{MM}.tif
     wh_mortality_base = mortality_wh_base / "Western_Hemlock" if mortality_wh_base.exists() else None
+    if wh_mortality_base:
+        # Only Western_Hemlock/ is walked; watch its parent for it appearing
+        dir_mtimes[str(mortality_wh_base)] = mortality_wh_base.stat().st_mtime_ns
     wh_mortality_count = 0
     if wh_mortality_base and wh_mortality_base.exists():
         print(f"[INFO] Scanning Western Hemlock Mortality rasters in: {wh_mortality_base}")
         # Search for M2.5_*.tif files in Western_Hemlock/{Cover}/ subdirectories
-        for tif_file in wh_mortality_base.rglob("M2.5_*.tif"):
-            # Only match files that are M2.5_{COND}{MM}.tif (not M2.5_DF_*)
-            if "M2.5_DF_" in tif_file.name:
-                continue
-            raster_id = generate_stable_id(tif_file)
-            raster_name = tif_file.stem  # filename without extension (e.g., M2.5_D04)
-            raster_list.append({
-                "id": raster_id,
-                "name": raster_name,
-                "path": str(tif_file.absolute()),
-                "dataset_type": "mortality"
-            })
-            mortality_count += 1
-            wh_mortality_count += 1
-            print(f"[DEBUG] Found WH Mortality raster: {raster_name} at {tif_file}")
+        for dirpath, filenames in _walk_tif_dirs(wh_mortality_base, dir_mtimes):
+            for filename in filenames:
+                # Only match files that are M2.5_{COND}{MM}.tif (not M2.5_DF_*)
+                name = os.path.normcase(filename)
+                if not name.startswith(_MORTALITY_PREFIX) or name.startswith(_MORTALITY_DF_PREFIX):
+                    continue
+                add_raster(dirpath, filename, "mortality")
+                mortality_count += 1
+                wh_mortality_count += 1
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Found WH Mortality raster: %s at %s", raster_list[-1]["name"], raster_list[-1]["path"])
         
         if wh_mortality_count > 0:
             print(f"[INFO] ✓ Found {wh_mortality_count} Western Hemlock Mortality rasters")
@@ -133,45 +207,40 @@ def discover_rasters():
     #     Pattern: HSL2.5_DF_{Cover}_{Condition}_{Class}
     # B2) WH HSL: {ROOT}/HighStressMortality/Western_Hemlock/{Cover}/HSL_{cover}_{COND}.tif
     #     Pattern: HSL_{cover}_{COND} where COND is DRY/WET/NORMAL (full words)
-    hsl_base = RASTER_ROOT / "HighStressMortality"
+    hsl_base = raster_root / "HighStressMortality"
     hsl_df_count = 0
     hsl_wh_count = 0
     if hsl_base.exists():
         print(f"[INFO] Scanning High Stress Mortality rasters in: {hsl_base}")
         
-        # B1) DF HSL rasters: HSL2.5_DF_*.tif (with cover, condition, class)
-        for tif_file in hsl_base.rglob("HSL2.5_DF_*.tif"):
-            raster_id = generate_stable_id(tif_file)
-            raster_name = tif_file.stem  # filename without extension (e.g., HSL2.5_DF_25_D_h)
-            raster_list.append({
-                "id": raster_id,
-                "name": raster_name,
-                "path": str(tif_file.absolute()),
-                "dataset_type": "hsl"
-            })
-            hsl_count += 1
-            hsl_df_count += 1
+        # B2 files are only taken from under Western_Hemlock/
+        wh_hsl_base = str(hsl_base / "Western_Hemlock")
+        wh_hsl_rasters = []
         
-        # B2) WH HSL rasters: HSL_{cover}_{COND}.tif (with cover, condition as full word)
-        # Pattern: HSL_{cover}_{COND} where cover is 0,25,50,75,100 and COND is DRY/WET/NORMAL
-        wh_hsl_base = hsl_base / "Western_Hemlock"
-        if wh_hsl_base.exists():
+        # One walk for both DF and WH HSL rasters, dispatched on the filename prefix
+        for dirpath, filenames in _walk_tif_dirs(hsl_base, dir_mtimes):
+            # Decided once per directory, not per file
+            in_wh_hsl = dirpath == wh_hsl_base or dirpath.startswith(wh_hsl_base + os.sep)
+            for filename in filenames:
+                name = os.path.normcase(filename)
+                if name.startswith(_HSL_DF_PREFIX):
+                    # B1) DF HSL rasters: HSL2.5_DF_*.tif (with cover, condition, class)
+                    add_raster(dirpath, filename, "hsl")
+                    hsl_count += 1
+                    hsl_df_count += 1
+                elif in_wh_hsl and name.startswith(_HSL_WH_PREFIX):
+                    # B2) WH HSL rasters: HSL_{cover}_{COND}.tif (with cover, condition as full word)
+                    wh_hsl_rasters.append((dirpath, filename))
+        
+        # WH HSL rasters are listed after all DF HSL rasters
+        if wh_hsl_rasters:
             print(f"[INFO] Scanning Western Hemlock HSL rasters in: {wh_hsl_base}")
-            for tif_file in wh_hsl_base.rglob("HSL_*.tif"):
-                # Only match HSL_{cover}_{COND}.tif pattern (not HSL2.5_DF_*)
-                if "HSL2.5_DF_" in tif_file.name:
-                    continue
-                raster_id = generate_stable_id(tif_file)
-                raster_name = tif_file.stem  # filename without extension (e.g., HSL_0_DRY, HSL_75_WET)
-                raster_list.append({
-                    "id": raster_id,
-                    "name": raster_name,
-                    "path": str(tif_file.absolute()),
-                    "dataset_type": "hsl"
-                })
-                hsl_count += 1
-                hsl_wh_count += 1
-                print(f"[DEBUG] Found WH HSL raster: {raster_name} at {tif_file}")
+        for dirpath, filename in wh_hsl_rasters:
+            add_raster(dirpath, filename, "hsl")
+            hsl_count += 1
+            hsl_wh_count += 1
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Found WH HSL raster: %s at %s", raster_list[-1]["name"], raster_list[-1]["path"])
         
         print(f"[INFO] ✓ Found {hsl_count} total High Stress Mortality rasters")
         if hsl_df_count > 0:
@@ -197,5 +266,55 @@ def discover_rasters():
     return raster_list
 
 
-# Discover rasters on module import
-RASTER_LOOKUP_LIST = discover_rasters()
+def _cached_index_is_fresh(dir_mtimes: Dict[str, int]) -> bool:
+    """One stat per recorded directory; no directory listing."""
+    try:
+        return all(os.stat(path).st_mtime_ns == mtime for path, mtime in dir_mtimes.items())
+    except OSError:
+        return False
+
+
+def load_raster_index() -> List[dict]:
+    """
+    discover_rasters(), reusing storage/raster_index.pkl when none of the
+    scanned directories changed since it was written.
+    """
+    if not RASTER_ROOT.exists():
+        return discover_rasters()
+
+    try:
+        with open(RASTER_INDEX_CACHE, "rb") as f:
+            header, raster_list = pickle.load(f)
+        if (
+            header.get("version") == RASTER_INDEX_CACHE_VERSION
+            and header.get("root") == str(RASTER_ROOT)
+            and _cached_index_is_fresh(header["dir_mtimes"])
+        ):
+            print(f"[INFO] Loaded {len(raster_list)} rasters from index cache: {RASTER_INDEX_CACHE}")
+            return raster_list
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"[WARNING] Ignoring unreadable raster index cache {RASTER_INDEX_CACHE}: {e}")
+
+    dir_mtimes: Dict[str, int] = {}
+    raster_list = discover_rasters(dir_mtimes)
+    header = {
+        "version": RASTER_INDEX_CACHE_VERSION,
+        "root": str(RASTER_ROOT),
+        "dir_mtimes": dir_mtimes,
+    }
+    try:
+        RASTER_INDEX_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        with open(RASTER_INDEX_CACHE, "wb") as f:
+            pickle.dump((header, raster_list), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError as e:
+        print(f"[WARNING] Could not write raster index cache {RASTER_INDEX_CACHE}: {e}")
+    return raster_list
+
+
+# Discover rasters on module import (cached on disk between restarts)
+RASTER_LOOKUP_LIST = load_raster_index()
+
+# id -> item (same dicts as RASTER_LOOKUP_LIST) for O(1) lookups
+RASTER_BY_ID: Dict[int, dict] = {r["id"]: r for r in RASTER_LOOKUP_LIST}
@@ -10,17 +10,18 @@ from rasterio.enums import Resampling
 from rasterio.transform import array_bounds, from_bounds
 from rasterio.warp import transform_bounds, transform_geom, reproject, calculate_default_transform
 from shapely.geometry import shape as shapely_shape, mapping, Polygon, MultiPolygon, box
-from shapely.ops import unary_union
 from shapely.validation import make_valid
 import numpy as np
-import fiona
 import imageio
-from typing import Optional
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
-from app.services.raster_index import RASTER_LOOKUP_LIST
+from pyproj import Transformer
 
-# AOI + output dir
-AOI_PATH = Path(r"D:\VMRC_Project\Data_Analysis!!\AOI_diss\AOI_diss.shp")
+from app.gis.clip import get_global_aoi_geometry
+from app.services.raster_index import RASTER_BY_ID, RASTER_LOOKUP_LIST
+
+# Output dir (AOI shapefile path lives in app.gis.clip)
 OVERLAY_DIR = Path("static/overlays")
 OVERLAY_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -29,9 +30,8 @@ OVERLAY_DIR.mkdir(parents=True, exist_ok=True)
 # GLOBAL AOI
 # -----------------------------
 def load_global_aoi_geom():
-    with fiona.open(str(AOI_PATH), "r") as src:
-        geoms = [shapely_shape(feat["geometry"]) for feat in src]
-    return unary_union(geoms)
+    # Shared cached loader: bulk read + single union_all (see app.gis.clip)
+    return get_global_aoi_geometry()
 
 
 GLOBAL_AOI = load_global_aoi_geom()
@@ -44,12 +44,8 @@ def resolve_raster_path(raster_layer_id: int) -> str:
     """
     print(f"\n[DEBUG] Resolving raster path for layer_id={raster_layer_id}")
     
-    # Find raster in lookup list
-    raster_item = None
-    for r in RASTER_LOOKUP_LIST:
-        if r["id"] == raster_layer_id:
-            raster_item = r
-            break
+    # Find raster in the index
+    raster_item = RASTER_BY_ID.get(raster_layer_id)
     
     if not raster_item:
         print(f"[ERROR] Raster id {raster_layer_id} not found in RASTER_LOOKUP_LIST")
@@ -157,6 +153,7 @@ def clip_raster_for_layer(raster_layer_id: int, user_clip_geojson: dict, zoom: O
     try:
         with rasterio.open(raster_path) as src:
             raster_crs = src.crs
+            raster_crs_str = raster_crs.to_string() if raster_crs else None  # encoded once, reused for reprojection
             raster_bounds = src.bounds  # (left, bottom, right, top) in raster CRS
             raster_transform = src.transform
             raster_width = src.width
@@ -335,7 +332,7 @@ def clip_raster_for_layer(raster_layer_id: int, user_clip_geojson: dict, zoom: O
         # Reproject using rasterio's transform_geom (more precise for raster operations)
         aoi_geom_raster_crs = transform_geom(
             "EPSG:4326",
-            raster_crs.to_string() if hasattr(raster_crs, 'to_string') else str(raster_crs),
+            raster_crs_str,
             aoi_geom_src,
             precision=6  # 6 decimal places for precision
         )
@@ -634,12 +631,17 @@ def clip_raster_for_layer(raster_layer_id: int, user_clip_geojson: dict, zoom: O
     # We need to identify which pixels are valid for overlay (buffered) and histogram (original)
     
     # Extract data array
-    if clipped.ndim == 3:
-        # Multi-band: average bands for display
-        band = np.mean(clipped, axis=0).astype(float)
+    # Float rasters are used as-is (no float64 copy of float32 data). 8/16-bit integer
+    # rasters are cast once to float32, which represents them exactly; wider integers
+    # go to float64, since float32 is only exact up to 2**24.
+    if clipped.ndim == 3 and clipped.shape[0] > 1:
+        # Multi-band: average bands for display (np.mean already returns a float array)
+        band = np.mean(clipped, axis=0)
     else:
-        # Single band
-        band = clipped.astype(float)
+        # Single band (mask() returns (1, rows, cols): take a view, not a copy)
+        band = clipped[0] if clipped.ndim == 3 else clipped
+        if band.dtype not in (np.float32, np.float64):
+            band = band.astype(np.float32 if band.dtype.itemsize <= 2 else np.float64)
     
     # ============================================================
     # CRITICAL: Build valid_mask RIGHT AFTER mask() and BEFORE any normalization
@@ -751,7 +753,7 @@ def clip_raster_for_layer(raster_layer_id: int, user_clip_geojson: dict, zoom: O
     # -----------------------------
     # Chart data (for histogram/heatmap) - use ORIGINAL geometry
     # -----------------------------
-    flat_valid = valid_pixels_histogram.astype(float)  # Use histogram pixels (original AOI)
+    flat_valid = valid_pixels_histogram  # Use histogram pixels (original AOI); already float
 
     # Sample to avoid sending millions of pixels
     MAX_PIXELS = 50000
@@ -759,7 +761,8 @@ def clip_raster_for_layer(raster_layer_id: int, user_clip_geojson: dict, zoom: O
         idx = np.random.choice(flat_valid.size, MAX_PIXELS, replace=False)
         flat_valid = flat_valid[idx]
 
-    pixel_list = flat_valid.tolist()
+    # Kept as an ndarray: the API's JSON response renders it directly
+    pixel_list = flat_valid
 
     # -----------------------------
     # Colorize for map overlay - use BUFFERED geometry
@@ -815,11 +818,11 @@ def clip_raster_for_layer(raster_layer_id: int, user_clip_geojson: dict, zoom: O
             try:
                 vmin = float(valid_values_histogram.min())
                 vmax = float(valid_values_histogram.max())
-                vmean = float(valid_values_histogram.mean())
+                vmean = float(valid_values_histogram.mean(dtype=np.float64))
                 vcount = valid_values_histogram.size
                 # Guard std computation - numpy.std can have issues with single values
                 if vcount > 1:
-                    vstd = float(valid_values_histogram.std())
+                    vstd = float(valid_values_histogram.std(dtype=np.float64))
                 elif vcount == 1:
                     vstd = 0.0
                 else:
@@ -1075,7 +1078,8 @@ def clip_raster_for_layer(raster_layer_id: int, user_clip_geojson: dict, zoom: O
     # Compute min/max/mean safely
     stats_min = float(valid_pixels_histogram.min())
     stats_max = float(valid_pixels_histogram.max())
-    stats_mean = float(valid_pixels_histogram.mean())
+    # Accumulate in float64 (matches masked_band_stats used by the exports)
+    stats_mean = float(valid_pixels_histogram.mean(dtype=np.float64))
     stats_count = int(valid_pixels_histogram.size)
     
     # Log min/max for debugging
@@ -1084,7 +1088,7 @@ def clip_raster_for_layer(raster_layer_id: int, user_clip_geojson: dict, zoom: O
     # Compute std safely: if all values are the same, std = 0 (not division by zero)
     # numpy.std() handles this correctly, but we add a guard for edge cases
     if valid_pixels_histogram.size > 1:
-        stats_std = float(valid_pixels_histogram.std())
+        stats_std = float(valid_pixels_histogram.std(dtype=np.float64))
     elif valid_pixels_histogram.size == 1:
         # Single pixel: std = 0
         stats_std = 0.0
@@ -1141,34 +1145,55 @@ def clip_raster_for_layer(raster_layer_id: int, user_clip_geojson: dict, zoom: O
 # -----------------------------------------
 # SAMPLE SINGLE VALUE AT LON / LAT
 # -----------------------------------------
-def sample_raster_value(raster_layer_id: int, lon: float, lat: float):
+@lru_cache(maxsize=32)
+def _lonlat_transformer(dst_crs: str) -> Transformer:
+    """pyproj Transformer from EPSG:4326 lon/lat to ``dst_crs`` (built once per CRS)."""
+    return Transformer.from_crs("EPSG:4326", dst_crs, always_xy=True)
+
+
+def sample_raster_values(raster_layer_id: int, points: List[Tuple[float, float]]):
     """
-    Get raster value at a given lon/lat.
+    Get raster values (band 1) at many lon/lat points with a single open.
 
-    NOTE: Assumes raster CRS is geographic (e.g. EPSG:4269).
-    If you later use projected rasters, you'll want to reproject
-    the (lon, lat) into the raster's CRS before sampling.
+    Geographic rasters (e.g. EPSG:4269) are sampled at lon/lat directly, as
+    before; projected rasters get all points reprojected in one vectorized
+    pyproj call. Returns {"values": [...], "is_nodata": [...], "crs": ...}
+    with None values where the pixel is nodata.
     """
     raster_path = resolve_raster_path(raster_layer_id)
 
     with rasterio.open(raster_path) as src:
-        # Use rasterio's sampling at a single point
-        # (x = lon, y = lat)
-        sample = list(src.sample([(lon, lat)]))[0]
+        crs = src.crs.to_string() if src.crs else None
 
-        # If multi-band, just take the first band (or mean if you prefer)
-        value = float(sample[0])
+        if points and src.crs and not src.crs.is_geographic:
+            lons, lats = np.asarray(points, dtype=np.float64).T
+            xs, ys = _lonlat_transformer(crs).transform(lons, lats)
+            xys = list(zip(xs.tolist(), ys.tolist()))
+        else:
+            xys = [(lon, lat) for lon, lat in points]
 
+        # One C-level loop over all points; nearby points share GDAL block reads
+        samples = np.array([s[0] for s in src.sample(xys, indexes=1)], dtype=np.float64)
         nodata = src.nodata
-        if nodata is not None and value == nodata:
-            return {
-                "value": None,
-                "is_nodata": True,
-                "crs": src.crs.to_string() if src.crs else None,
-            }
 
-        return {
-            "value": value,
-            "is_nodata": False,
-            "crs": src.crs.to_string() if src.crs else None,
-        }
+    is_nodata = (samples == nodata) if nodata is not None else np.zeros(samples.shape, dtype=bool)
+    values = [None if nd else v for v, nd in zip(samples.tolist(), is_nodata.tolist())]
+
+    return {
+        "values": values,
+        "is_nodata": is_nodata.tolist(),
+        "crs": crs,
+    }
+
+
+def sample_raster_value(raster_layer_id: int, lon: float, lat: float):
+    """
+    Get raster value at a given lon/lat (single-point wrapper around
+    sample_raster_values).
+    """
+    res = sample_raster_values(raster_layer_id, [(lon, lat)])
+    return {
+        "value": res["values"][0],
+        "is_nodata": res["is_nodata"][0],
+        "crs": res["crs"],
+    }
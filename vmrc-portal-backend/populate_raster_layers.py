@@ -9,9 +9,12 @@ It will scan the Mortality directory, find all .tif files,
 and insert a RasterLayer row for each one that is not already in the DB.
 """
 
+import asyncio
 import os
 from pathlib import Path
 
+from sqlalchemy import select
+
 from app.db.session import SessionLocal
 from app.models.raster_layer import RasterLayer
 
@@ -22,9 +25,8 @@ MORTALITY_ROOT = Path(
 
 
 
-def main() -> None:
-    db = SessionLocal()
-    try:
+async def main() -> None:
+    async with SessionLocal() as db:
         count_total = 0
         count_new = 0
 
@@ -32,6 +34,13 @@ def main() -> None:
             print(f"[ERROR] Mortality root does not exist: {MORTALITY_ROOT}")
             return
 
+        # Load every known storage_path once (plain strings, no ORM objects),
+        # instead of one lookup query per file
+        result = await db.stream_scalars(
+            select(RasterLayer.storage_path).execution_options(yield_per=500)
+        )
+        existing_paths = {path async for path in result}
+
         print(f"[INFO] Scanning {MORTALITY_ROOT} for .tif rasters...")
 
         for tif_path in MORTALITY_ROOT.rglob("*.tif"):
@@ -41,12 +50,7 @@ def main() -> None:
             full_path = str(tif_path)
 
             # Check if this path is already in the DB
-            existing = (
-                db.query(RasterLayer)
-                .filter(RasterLayer.storage_path == full_path)
-                .first()
-            )
-            if existing:
+            if full_path in existing_paths:
                 # Already there, skip
                 continue
 
@@ -65,15 +69,14 @@ def main() -> None:
             )
 
             db.add(layer)
+            existing_paths.add(full_path)
             count_new += 1
 
-        db.commit()
+        await db.commit()
         print(f"[INFO] Found {count_total} .tif files under {MORTALITY_ROOT}")
         print(f"[INFO] Inserted {count_new} new raster_layers rows")
         print("[INFO] Done.")
-    finally:
-        db.close()
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -0,0 +1,136 @@
+# File: tests/test_hist_service.py
+
+"""
+Tests for the windowed histogram in app.services.hist_service.
+
+Each test writes a small GeoTIFF into tmp_path. HIST_CHUNK_BYTES is shrunk
+so the raster is read in several row windows.
+"""
+
+import numpy as np
+import pytest
+import rasterio
+from rasterio.transform import from_origin
+
+from app.services import hist_service
+from app.services.hist_service import compute_histogram
+
+NODATA = -9999.0
+# EPSG:4326 grid: pixel (row, col) spans lon -123 + col*0.01 .. +0.01,
+# lat 45 - row*0.01 .. -0.01
+TRANSFORM = from_origin(-123.0, 45.0, 0.01, 0.01)
+
+
+@pytest.fixture(autouse=True)
+def small_windows(monkeypatch):
+    # A few rows per window, so the AOI mask row offsets are exercised
+    monkeypatch.setattr(hist_service, "HIST_CHUNK_BYTES", 7 * 40 * 8)
+
+
+def _write_raster(path, data):
+    height, width = data.shape
+    with rasterio.open(
+        path, "w", driver="GTiff", height=height, width=width, count=1,
+        dtype=data.dtype, crs="EPSG:4326", transform=TRANSFORM, nodata=NODATA,
+        blockysize=1,
+    ) as dst:
+        dst.write(data, 1)
+    return str(path)
+
+
+def _box(col0, row0, col1, row1):
+    """Pixel-aligned [col0, col1) x [row0, row1) rectangle as lon/lat ring."""
+    west, north = TRANSFORM * (col0, row0)
+    east, south = TRANSFORM * (col1, row1)
+    return [(west, south), (east, south), (east, north), (west, north), (west, south)]
+
+
+def _valid(values):
+    values = values[np.isfinite(values)]
+    return values[values != NODATA]
+
+
+def test_full_extent_matches_numpy(tmp_path):
+    # Integer values 0..64 (range 64 over 32 bins: exact bin edges)
+    data = (np.arange(50 * 40, dtype=np.float32) % 65).reshape(50, 40)
+    data[3, 5] = NODATA
+    data[17, 30] = np.nan
+    path = _write_raster(tmp_path / "full.tif", data)
+
+    result = compute_histogram(path, bins=32)
+
+    expected, _ = np.histogram(_valid(data), bins=32, range=(0.0, 64.0))
+    assert result["range"] == (0.0, 64.0)
+    assert result["counts"] == expected.tolist()
+    assert result["aoi_applied"] is False
+
+
+def test_aoi_masks_outside_pixels(tmp_path):
+    data = np.full((50, 40), 1000.0, dtype=np.float32)
+    # L-shaped AOI: rows 10..29 x cols 5..14, plus rows 20..29 x cols 15..34.
+    # Pixels in its bounding box but outside the L stay at 1000.
+    data[10:30, 5:15] = np.arange(200, dtype=np.float32).reshape(20, 10) % 65
+    data[20:30, 15:35] = np.arange(200, dtype=np.float32).reshape(10, 20) % 65
+    data[12, 7] = NODATA
+    path = _write_raster(tmp_path / "aoi.tif", data)
+
+    ring = [
+        TRANSFORM * (5, 30), TRANSFORM * (35, 30), TRANSFORM * (35, 20),
+        TRANSFORM * (15, 20), TRANSFORM * (15, 10), TRANSFORM * (5, 10),
+        TRANSFORM * (5, 30),
+    ]
+    aoi = {"type": "Feature", "properties": {}, "geometry": {"type": "Polygon", "coordinates": [ring]}}
+
+    result = compute_histogram(path, bins=32, aoi_geojson=aoi)
+
+    inside = np.concatenate([data[10:30, 5:15].ravel(), data[20:30, 15:35].ravel()])
+    expected, _ = np.histogram(_valid(inside), bins=32, range=(0.0, 64.0))
+    assert result["range"] == (0.0, 64.0)
+    assert result["counts"] == expected.tolist()
+    assert result["aoi_applied"] is True
+
+
+def test_all_nodata(tmp_path):
+    data = np.full((20, 40), NODATA, dtype=np.float32)
+    path = _write_raster(tmp_path / "nodata.tif", data)
+
+    result = compute_histogram(path, bins=8)
+
+    assert result["counts"] == [0] * 8
+    assert result["range"] == (0.0, 1.0)
+
+
+def test_all_nodata_inside_aoi(tmp_path):
+    data = np.full((20, 40), 5.0, dtype=np.float32)
+    data[5:10, 5:10] = NODATA
+    path = _write_raster(tmp_path / "nodata_aoi.tif", data)
+
+    aoi = {"type": "Polygon", "coordinates": [_box(5, 5, 10, 10)]}
+    result = compute_histogram(path, bins=8, aoi_geojson=aoi)
+
+    assert result["counts"] == [0] * 8
+    assert result["range"] == (0.0, 1.0)
+
+
+def test_aoi_outside_raster(tmp_path):
+    data = np.full((20, 20), 5.0, dtype=np.float32)
+    path = _write_raster(tmp_path / "outside.tif", data)
+
+    ring = [(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0), (0.0, 0.0)]
+    aoi = {"type": "Polygon", "coordinates": [ring]}
+    result = compute_histogram(path, bins=8, aoi_geojson=aoi)
+
+    assert result["counts"] == [0] * 8
+    assert result["range"] == (0.0, 1.0)
+    assert result["aoi_applied"] is True
+
+
+def test_constant_raster_single_bin(tmp_path):
+    data = np.full((20, 40), 7.0, dtype=np.float32)
+    data[0, 0] = NODATA
+    path = _write_raster(tmp_path / "constant.tif", data)
+
+    result = compute_histogram(path, bins=8)
+
+    assert result["range"] == (7.0, 7.0)
+    assert result["counts"] == [20 * 40 - 1] + [0] * 7
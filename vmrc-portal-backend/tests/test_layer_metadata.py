@@ -0,0 +1,130 @@
+# File: tests/test_layer_metadata.py
+
+"""
+Tests for the memory-mapped stats read in app.services.layer_metadata.
+
+_mmap_band must either return exactly src.read(1) or None; it must never
+hand back pixels from a layout it misread.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import rasterio
+from rasterio.transform import from_origin
+
+from app.gis import _stats_kernel
+from app.services import layer_metadata
+from app.services.layer_metadata import _mmap_band
+
+HEIGHT, WIDTH = 40, 30
+
+
+def _write(path, count=1, dtype="float32", **profile):
+    data = np.arange(count * HEIGHT * WIDTH).reshape(count, HEIGHT, WIDTH).astype(dtype)
+    with rasterio.open(
+        path, "w", driver="GTiff", height=HEIGHT, width=WIDTH, count=count, dtype=dtype,
+        crs="EPSG:4326", transform=from_origin(-123.0, 45.0, 0.01, 0.01), **profile,
+    ) as dst:
+        dst.write(data)
+    return str(path)
+
+
+@pytest.mark.parametrize("dtype", ["float32", "int16", "uint8", "float64"])
+def test_single_band_matches_read(tmp_path, dtype):
+    path = _write(tmp_path / "single.tif", dtype=dtype, blockysize=4)
+    with rasterio.open(path) as src:
+        mapped = _mmap_band(src)
+        assert mapped is not None
+        assert mapped.dtype == src.dtypes[0]
+        assert np.array_equal(mapped, src.read(1))
+
+
+def test_band_interleaved_matches_read(tmp_path):
+    path = _write(tmp_path / "band.tif", count=3, interleave="band", blockysize=4)
+    with rasterio.open(path) as src:
+        mapped = _mmap_band(src)
+        assert mapped is not None
+        assert np.array_equal(mapped, src.read(1))
+
+
+@pytest.mark.parametrize(
+    "profile",
+    [
+        {"count": 3, "interleave": "pixel"},
+        {"compress": "deflate"},
+        {"tiled": True, "blockxsize": 16, "blockysize": 16},
+        {"dtype": "uint8", "nbits": 4},
+        {"endianness": "big" if sys.byteorder == "little" else "little"},
+    ],
+    ids=["pixel-interleaved", "compressed", "tiled", "nbits", "foreign-byte-order"],
+)
+def test_unsupported_layouts_fall_back(tmp_path, profile):
+    path = _write(tmp_path / "other.tif", **profile)
+    with rasterio.open(path) as src:
+        assert _mmap_band(src) is None
+
+
+def test_out_of_order_strips(tmp_path):
+    # GDAL defers all-nodata strips and writes them after the others, so
+    # strips 4-5 land at the end of the file; mapping the file as one
+    # block would return the wrong rows
+    data = np.arange(HEIGHT * WIDTH, dtype=np.float32).reshape(HEIGHT, WIDTH)
+    data[16:24] = -9999.0
+    path = tmp_path / "deferred.tif"
+    with rasterio.open(
+        path, "w", driver="GTiff", height=HEIGHT, width=WIDTH, count=1, dtype="float32",
+        crs="EPSG:4326", transform=from_origin(-123.0, 45.0, 0.01, 0.01),
+        nodata=-9999.0, blockysize=4,
+    ) as dst:
+        dst.write(data, 1)
+
+    with rasterio.open(path) as src:
+        offsets = [
+            int(src.get_tag_item(f"BLOCK_OFFSET_0_{i}", "TIFF", bidx=1))
+            for i in range(HEIGHT // 4)
+        ]
+        mapped = _mmap_band(src)
+        if offsets == sorted(offsets):
+            # This GDAL wrote the strips in order; the mapping must match
+            assert np.array_equal(mapped, src.read(1))
+        else:
+            assert mapped is None
+
+
+def test_mmap_stats_without_numba_reads_stripes(tmp_path, monkeypatch):
+    # Without Numba the NumPy fallback must see one stripe of the mapping
+    # at a time, never the whole band
+    monkeypatch.setattr(_stats_kernel, "HAS_NUMBA", False)
+    monkeypatch.setattr(layer_metadata, "STATS_WINDOWED_MIN_PIXELS", 100)
+    monkeypatch.setattr(layer_metadata, "STATS_STRIPE_BYTES", 8 * WIDTH * 4)  # 8 float32 rows
+    path = _write(tmp_path / "stats.tif", blockysize=4)
+
+    mapped_calls = []
+    real_mmap_band = layer_metadata._mmap_band
+    monkeypatch.setattr(
+        layer_metadata, "_mmap_band",
+        lambda src: mapped_calls.append(real_mmap_band(src)) or mapped_calls[-1],
+    )
+    sizes = []
+    real_band_moments = layer_metadata.band_moments
+    monkeypatch.setattr(
+        layer_metadata, "band_moments",
+        lambda band, nodata: sizes.append(band.size) or real_band_moments(band, nodata),
+    )
+
+    stats = layer_metadata.compute_raster_stats(Path(path))
+
+    assert mapped_calls and mapped_calls[0] is not None
+    assert sizes == [8 * WIDTH] * (HEIGHT // 8)
+
+    with rasterio.open(path) as src:
+        data = src.read(1).astype(np.float64)
+    assert stats["exact"] is True
+    assert stats["count"] == data.size
+    assert stats["min"] == data.min()
+    assert stats["max"] == data.max()
+    assert stats["mean"] == pytest.approx(data.mean())
+    assert stats["std"] == pytest.approx(data.std())
@@ -0,0 +1,110 @@
+# File: tests/test_raster_sample.py
+
+"""
+Tests for /rasters/sample and /rasters/sample_batch.
+
+resolve_raster_path is monkeypatched to small GeoTIFFs written to tmp_path,
+so no raster index entry is needed.
+"""
+
+import numpy as np
+import pytest
+import rasterio
+from fastapi.testclient import TestClient
+from pyproj import Transformer
+from rasterio.transform import from_origin
+
+from app.main import app
+from app.services import raster_service
+
+client = TestClient(app)
+
+NODATA = -9999.0
+
+
+def _write_raster(path, crs, transform):
+    data = np.arange(20 * 30, dtype=np.float32).reshape(20, 30)
+    data[4, 7] = NODATA
+    with rasterio.open(
+        path, "w", driver="GTiff", height=20, width=30, count=1, dtype="float32",
+        crs=crs, transform=transform, nodata=NODATA,
+    ) as dst:
+        dst.write(data, 1)
+    return data
+
+
+def _use_raster(monkeypatch, path):
+    monkeypatch.setattr(raster_service, "resolve_raster_path", lambda raster_layer_id: str(path))
+
+
+@pytest.fixture
+def geographic_raster(tmp_path, monkeypatch):
+    transform = from_origin(-123.0, 45.0, 0.01, 0.01)
+    path = tmp_path / "geographic.tif"
+    data = _write_raster(path, "EPSG:4326", transform)
+    _use_raster(monkeypatch, path)
+    return data, transform
+
+
+def _center(transform, row, col):
+    return transform * (col + 0.5, row + 0.5)
+
+
+def test_sample_batch_values_and_nodata(geographic_raster):
+    data, transform = geographic_raster
+    pixels = [(0, 0), (4, 7), (19, 29), (10, 3)]
+    points = [_center(transform, row, col) for row, col in pixels]
+
+    resp = client.post("/api/v1/rasters/sample_batch", json={"rasterLayerId": 1, "points": points})
+    assert resp.status_code == 200
+    body = resp.json()
+
+    assert body["values"] == [float(data[0, 0]), None, float(data[19, 29]), float(data[10, 3])]
+    assert body["is_nodata"] == [False, True, False, False]
+    assert body["crs"] == "EPSG:4326"
+
+
+def test_sample_batch_empty_points(geographic_raster):
+    resp = client.post("/api/v1/rasters/sample_batch", json={"rasterLayerId": 1, "points": []})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["values"] == []
+    assert body["is_nodata"] == []
+    assert body["crs"] == "EPSG:4326"
+
+
+def test_sample_single_point(geographic_raster):
+    data, transform = geographic_raster
+
+    lon, lat = _center(transform, 2, 5)
+    resp = client.post("/api/v1/rasters/sample", json={"rasterLayerId": 1, "lon": lon, "lat": lat})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["value"] == float(data[2, 5])
+    assert body["is_nodata"] is False
+    assert (body["lon"], body["lat"]) == (lon, lat)
+
+    lon, lat = _center(transform, 4, 7)
+    body = client.post("/api/v1/rasters/sample", json={"rasterLayerId": 1, "lon": lon, "lat": lat}).json()
+    assert body["value"] is None
+    assert body["is_nodata"] is True
+
+
+def test_sample_batch_projected_crs(tmp_path, monkeypatch):
+    # UTM 10N: lon/lat points are reprojected with pyproj before sampling
+    transform = from_origin(500000.0, 5000000.0, 30.0, 30.0)
+    path = tmp_path / "projected.tif"
+    data = _write_raster(path, "EPSG:32610", transform)
+    _use_raster(monkeypatch, path)
+
+    to_lonlat = Transformer.from_crs("EPSG:32610", "EPSG:4326", always_xy=True)
+    pixels = [(1, 2), (4, 7), (15, 25)]
+    points = [to_lonlat.transform(*_center(transform, row, col)) for row, col in pixels]
+
+    resp = client.post("/api/v1/rasters/sample_batch", json={"rasterLayerId": 1, "points": points})
+    assert resp.status_code == 200
+    body = resp.json()
+
+    assert body["values"] == [float(data[1, 2]), None, float(data[15, 25])]
+    assert body["is_nodata"] == [False, True, False]
+    assert body["crs"] == "EPSG:32610"